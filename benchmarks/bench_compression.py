@@ -0,0 +1,69 @@
+"""Benchmark request body compression for BASE64 inputs.
+
+Sends the same BASE64 document to Forms.run_ocr with compression off,
+gzip and deflate, against the local fake API server, which counts the bytes
+received and can throttle uploads to simulate a constrained egress link.
+Reports the request body bytes on the wire and the mean end-to-end latency
+per request.
+
+Usage:
+    python benchmarks/bench_compression.py [--file PATH] [--requests N] [--bandwidth MBIT]
+"""
+
+import argparse
+import base64
+import os
+import sys
+import time
+
+from fake_server import FakeLazarusServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+SRC_DIR = os.path.join(ROOT, "src")
+DEFAULT_FILE = os.path.join(ROOT, "tests", "resources", "sample_form.pdf")
+
+
+def run(server, encoded: str, compression, requests: int) -> tuple:
+    """Returns (body bytes per request, mean seconds per request)."""
+    from lazarus_ai import LazarusAuth, Forms
+
+    forms = Forms(LazarusAuth("org_id", "auth_key", compression=compression))
+    forms.run_ocr("BASE64", encoded)  # Warm up the pooled connection
+
+    server.received = 0
+    start = time.perf_counter()
+    for _ in range(requests):
+        forms.run_ocr("BASE64", encoded)
+    elapsed = time.perf_counter() - start
+    return server.received / requests, elapsed / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--file", default=DEFAULT_FILE, help="Document sent as a BASE64 input")
+    parser.add_argument("--requests", type=int, default=20, help="Requests timed per mode")
+    parser.add_argument("--bandwidth", type=float, default=10.0,
+                        help="Simulated upload bandwidth in Mbit/s, 0 disables throttling")
+    args = parser.parse_args()
+
+    server = FakeLazarusServer(bandwidth=args.bandwidth).start()
+    os.environ["BASE_URL"] = server.url
+    os.environ["TEST_MODE"] = "True"
+    sys.path.insert(0, SRC_DIR)
+
+    with open(args.file, "rb") as f:
+        encoded = base64.b64encode(f.read()).decode()
+
+    print(f"{os.path.basename(args.file)}: {len(encoded)} base64 characters, "
+          f"{args.bandwidth or 'unlimited'} Mbit/s upload, {args.requests} requests per mode")
+    print(f"{'compression':<12}{'body bytes':>12}{'ratio':>8}{'latency ms':>12}")
+    baseline = None
+    for compression in (None, "gzip", "deflate"):
+        size, latency = run(server, encoded, compression, args.requests)
+        baseline = baseline or size
+        print(f"{compression or 'off':<12}{size:>12.0f}{size / baseline:>8.2f}{latency * 1000:>12.2f}")
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Benchmark the time taken to import the library.
+
+Imports lazarus_ai in fresh interpreters with `python -X importtime` and
+reports the fastest total import time along with the modules that took the
+longest to import themselves. tests/unit/test_import_time.py holds the
+budget enforced in CI.
+
+Usage:
+    python benchmarks/bench_import_time.py [--module NAME] [--runs N] [--top N]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+SRC_DIR = os.path.join(ROOT, "src")
+
+
+def import_times(module: str) -> list:
+    """Returns (name, self ms, cumulative ms) for every module imported."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            env=os.environ | {"PYTHONPATH": SRC_DIR}, capture_output=True, text=True, check=True)
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        times.append((name.strip(), int(own) / 1000, int(cumulative) / 1000))
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="lazarus_ai", help="Module imported")
+    parser.add_argument("--runs", type=int, default=10, help="Fresh interpreters started")
+    parser.add_argument("--top", type=int, default=15, help="Slowest modules listed")
+    args = parser.parse_args()
+
+    runs = [import_times(args.module) for _ in range(args.runs)]
+    totals = sorted(next(cumulative for name, _, cumulative in run if name == args.module) for run in runs)
+    print(f"import {args.module}: best {totals[0]:.1f} ms, median {totals[len(totals) // 2]:.1f} ms "
+          f"over {args.runs} runs")
+
+    fastest = min(runs, key=lambda run: next(c for name, _, c in run if name == args.module))
+    print(f"{'module':<40}{'self ms':>10}{'cumulative ms':>15}")
+    for name, own, cumulative in sorted(fastest, key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"{name:<40}{own:>10.2f}{cumulative:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Benchmark Forms and RikAI throughput against the local fake API server.
+
+Each scenario drives one endpoint at a fixed concurrency and payload size
+through a fresh worker process, so CPU time and peak memory belong to the
+client alone, while the fake server runs in a process of its own. Reports
+requests per second, p50 and p99 latency, client CPU time per request,
+peak resident memory and the number of failed requests.
+
+Usage:
+    python benchmarks/bench_throughput.py [--endpoints forms,rikai,summarize] [--concurrency 1,8,32]
+        [--payload-kb 16,1024] [--pages 1,20] [--requests N] [--latency MS] [--error-rate P]
+"""
+
+import argparse
+import base64
+import itertools
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from fake_server import FakeLazarusServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+SRC_DIR = os.path.join(ROOT, "src")
+
+QUESTIONS = ["What is the total amount due?", "When is the payment due?"]
+SUMMARY_FIELDS = {"document_type": "invoice", "summary_description": "Amounts and dates"}
+
+
+def serve(options: dict, conn):
+    """Runs the fake server in its own process, sending back its URL."""
+    server = FakeLazarusServer(**options)
+    conn.send(server.url)
+    server.serve_forever()
+
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_scenario(scenario: dict) -> dict:
+    """Runs one scenario in a fresh worker process and returns its measurements."""
+    os.environ["BASE_URL"] = scenario["url"]
+    os.environ["TEST_MODE"] = "False" if scenario["metrics"] else "True"
+    sys.path.insert(0, SRC_DIR)
+    from lazarus_ai import LazarusAuth, Forms, RikAI
+    from lazarus_ai.errors import APIError
+
+    concurrency = scenario["concurrency"]
+    auth = LazarusAuth("org_id", "auth_key", pool_connections=1, pool_maxsize=concurrency)
+    payload = base64.b64encode(os.urandom(scenario["payload_kb"] * 1024)).decode()
+    if scenario["endpoint"] == "forms":
+        forms = Forms(auth)
+        call = lambda: forms.run_ocr("BASE64", payload)
+    elif scenario["endpoint"] == "rikai":
+        rikai = RikAI(auth)
+        call = lambda: rikai.ask_question("BASE64", payload, QUESTIONS)
+    else:
+        rikai = RikAI(auth)
+        call = lambda: rikai.summarize("BASE64", payload, SUMMARY_FIELDS)
+
+    def attempt() -> bool:
+        try:
+            call()
+            return True
+        except APIError:
+            return False
+
+    latencies, errors = [], 0
+    remaining = itertools.count(scenario["requests"], -1)
+    lock = threading.Lock()
+
+    def worker():
+        nonlocal errors
+        while next(remaining) > 0:
+            start = time.perf_counter()
+            ok = attempt()
+            with lock:
+                latencies.append(time.perf_counter() - start)
+                errors += not ok
+
+    with ThreadPoolExecutor(concurrency) as executor:
+        # Warm up every pooled connection before timing
+        list(executor.map(lambda _: attempt(), range(concurrency)))
+        cpu, wall = time.process_time(), time.perf_counter()
+        for future in [executor.submit(worker) for _ in range(concurrency)]:
+            future.result()
+        cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+
+    # ru_maxrss is reported in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else 0
+    peak_mb = peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    return {"rps": len(latencies) / wall, "p50": percentile(latencies, 0.5) * 1000,
+            "p99": percentile(latencies, 0.99) * 1000, "cpu": cpu / len(latencies) * 1000,
+            "peak_mb": peak_mb, "errors": errors}
+
+
+def int_list(value: str) -> list:
+    return [int(item) for item in value.split(",")]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--endpoints", default="forms,rikai,summarize", help="Comma separated endpoints driven")
+    parser.add_argument("--concurrency", type=int_list, default=[1, 8, 32], help="Comma separated thread counts")
+    parser.add_argument("--payload-kb", type=int_list, default=[16, 1024], help="Comma separated document sizes")
+    parser.add_argument("--pages", type=int_list, default=[1, 20], help="Comma separated OCR pages per response")
+    parser.add_argument("--requests", type=int, default=500, help="Requests timed per scenario")
+    parser.add_argument("--latency", type=float, default=0.0, help="Server latency added per request in ms")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random server latency added in ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests the server fails")
+    parser.add_argument("--metrics", action="store_true", help="Report library metrics to the fake server")
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    print(f"{'endpoint':<11}{'conc':>5}{'payload KB':>11}{'pages':>6}{'req/s':>9}{'p50 ms':>9}"
+          f"{'p99 ms':>9}{'CPU ms/req':>11}{'peak MB':>9}{'errors':>7}")
+    for pages in args.pages:
+        options = {"latency": args.latency / 1000, "latency_jitter": args.jitter / 1000,
+                   "error_rate": args.error_rate, "pages": pages}
+        receiver, sender = context.Pipe(duplex=False)
+        server = context.Process(target=serve, args=(options, sender), daemon=True)
+        server.start()
+        url = receiver.recv()
+        try:
+            for endpoint, payload_kb, concurrency in itertools.product(
+                    args.endpoints.split(","), args.payload_kb, args.concurrency):
+                scenario = {"url": url, "endpoint": endpoint, "payload_kb": payload_kb, "concurrency": concurrency,
+                            "requests": args.requests, "metrics": args.metrics}
+                with ProcessPoolExecutor(1, mp_context=context) as executor:
+                    result = executor.submit(run_scenario, scenario).result()
+                print(f"{endpoint:<11}{concurrency:>5}{payload_kb:>11}{pages:>6}{result['rps']:>9.1f}"
+                      f"{result['p50']:>9.2f}{result['p99']:>9.2f}{result['cpu']:>11.3f}"
+                      f"{result['peak_mb']:>9.1f}{result['errors']:>7}", flush=True)
+        finally:
+            server.terminate()
+
+
+if __name__ == "__main__":
+    main()
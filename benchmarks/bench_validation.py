@@ -0,0 +1,82 @@
+"""Benchmark the per-call overhead of argument validation.
+
+Compares the precompiled per-endpoint validators with the original
+implementation, which scanned lists for every key and converted each key
+with stringcase on every call. The original is reproduced here, and runs
+only if stringcase is installed.
+
+Usage:
+    python benchmarks/bench_validation.py [--calls N]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+SRC_DIR = os.path.join(ROOT, "src")
+
+QUESTION_KEYS = ["file_id", "metadata", "webhook", "return_ocr", "language"]
+SUMMARIZE_VALID = ["secondary_description", "json_format"]
+SUMMARIZE_IGNORE = ["document_type", "summary_description"]
+
+CASES = {
+    "run_ocr": ({"file_id": "doc-1", "metadata": {"batch": 7}}, ["file_id", "metadata", "webhook"], []),
+    "ask_question": ({"file_id": "doc-1", "return_ocr": True, "language": "fr"}, QUESTION_KEYS, []),
+    "summarize": ({"document_type": "invoice", "summary_description": "Totals", "json_format": "{}"},
+                  SUMMARIZE_VALID, SUMMARIZE_IGNORE),
+}
+
+
+def legacy_validate_args(args, valid_keys, ignore_keys, stringcase):
+    """The validation done before validators were precompiled."""
+    invalid_keys = []
+    for key in args:
+        if key not in valid_keys and key not in ignore_keys:
+            invalid_keys.append(key)
+    if invalid_keys:
+        raise ValueError(invalid_keys)
+    d = {}
+    for key in args:
+        if key == "return_ocr":
+            d["returnOCR"] = args[key]
+            continue
+        d[stringcase.camelcase(key)] = args[key]
+    return d
+
+
+def per_call(func, calls: int) -> float:
+    """Returns the best mean time of a call over a few repeats, in microseconds."""
+    return min(timeit.repeat(func, number=calls, repeat=5)) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=100_000, help="Calls timed per repeat")
+    args = parser.parse_args()
+
+    sys.path.insert(0, SRC_DIR)
+    from lazarus_ai import _utils
+    try:
+        import stringcase
+    except ImportError:
+        stringcase = None
+
+    validators = {"run_ocr": _utils._OCR_ARGS, "ask_question": _utils._QUESTION_ARGS,
+                  "summarize": _utils._SUMMARIZE_FIELDS}
+
+    print(f"{'endpoint':<14}{'before us':>11}{'after us':>10}{'speedup':>9}")
+    for name, (kwargs, valid_keys, ignore_keys) in CASES.items():
+        validator = validators[name]
+        after = per_call(lambda: validator.validate(kwargs), args.calls)
+        if stringcase is None:
+            print(f"{name:<14}{'-':>11}{after:>10.2f}{'-':>9}")
+            continue
+        assert legacy_validate_args(kwargs, valid_keys, ignore_keys, stringcase) == validator.validate(kwargs)
+        before = per_call(lambda: legacy_validate_args(kwargs, valid_keys, ignore_keys, stringcase), args.calls)
+        print(f"{name:<14}{before:>11.2f}{after:>10.2f}{before / after:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""A local stand-in for the Lazarus API, for offline benchmarks.
+
+Serves the forms, rikai and library-metrics routes over real sockets with
+keep-alive connections, so requests go through the library's full
+transport. Latency, error rate, response size and upload bandwidth are
+configurable. Request bodies are read in full, decompressed and parsed
+like the real API would, but the responses are synthetic.
+
+Routes:
+    POST /api/forms/generic
+    POST /api/forms/custom/{model_id}
+    POST /api/rikai
+    POST /api/rikai/custom/{model_id}
+    POST /api/rikai/summarize
+    POST /api/library-metrics/{library}
+
+Usage:
+    python benchmarks/fake_server.py [--port N] [--latency MS] [--error-rate P] [--pages N]
+"""
+
+import argparse
+import gzip
+import json
+import random
+import re
+import threading
+import time
+import uuid
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROUTES = (
+    ("forms", re.compile(r"/api/forms/(generic|custom/[^/]+)")),
+    ("summarize", re.compile(r"/api/rikai/summarize")),
+    ("rikai", re.compile(r"/api/rikai(/custom/[^/]+)?")),
+    ("metrics", re.compile(r"/api/library-metrics/[^/]+")),
+)
+
+WORDS = ("invoice", "total", "amount", "due", "date", "account", "name", "address", "policy", "number")
+
+
+def _page(number: int, lines: int) -> dict:
+    """Returns a synthetic OCR page with the given number of lines."""
+    text = [" ".join(WORDS[(number + i + j) % len(WORDS)] for j in range(8)) for i in range(lines)]
+    return {
+        "page": number,
+        "width": 8.5,
+        "height": 11,
+        "lines": [{"text": line, "boundingBox": [1.0, 1.0 + i, 7.5, 1.0 + i, 7.5, 1.2 + i, 1.0, 1.2 + i]}
+                  for i, line in enumerate(text)],
+    }
+
+
+class FakeLazarusHandler(BaseHTTPRequestHandler):
+    """Answers each route with a synthetic response."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, avoid waiting on delayed ACKs
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        body = self._read_body()
+        server = self.server
+        route = next((name for name, pattern in ROUTES if pattern.fullmatch(self.path.split("?", 1)[0])), None)
+        server.record(route, len(body))
+        if route is None:
+            return self._reply(404, {"status": "FAILURE", "message": "Not found"})
+
+        if route != "metrics":
+            delay = server.latency + random.uniform(0, server.latency_jitter)
+            if server.bandwidth:
+                delay += len(body) * 8 / (server.bandwidth * 1_000_000)
+            if delay:
+                time.sleep(delay)
+            if server.error_rate and random.random() < server.error_rate:
+                server.record("errors", 0)
+                return self._reply(server.error_status, {"status": "FAILURE", "message": "Simulated error"})
+
+        try:
+            request = self._parse(body)
+        except ValueError:
+            return self._reply(400, {"status": "FAILURE", "message": "Malformed request body"})
+        self._reply(200, getattr(self, f"_{route}")(request))
+
+    def _read_body(self) -> bytes:
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().split(b";", 1)[0], 16)
+                chunk = self.rfile.read(size + 2)[:size]
+                if not size:
+                    break
+                chunks.append(chunk)
+            return b"".join(chunks)
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def _parse(self, body: bytes) -> dict:
+        """Decodes a JSON or multipart request body, as the API would."""
+        encoding = self.headers.get("Content-Encoding")
+        if encoding == "gzip":
+            body = gzip.decompress(body)
+        elif encoding == "deflate":
+            body = zlib.decompress(body)
+        if self.headers.get("Content-Type", "").startswith("multipart/form-data"):
+            # Fields other than the file hold strings or JSON, lists repeat the field
+            fields = {}
+            for name, value in re.findall(rb'name="([^"]+)"\r\n\r\n(.*?)\r\n--', body, re.S):
+                try:
+                    value = json.loads(value)
+                except ValueError:
+                    value = value.decode(errors="replace")
+                name = name.decode()
+                if name in fields:
+                    fields[name] = (fields[name] if isinstance(fields[name], list) else [fields[name]]) + [value]
+                else:
+                    fields[name] = value
+            return fields
+        return json.loads(body) if body else {}
+
+    def _forms(self, request: dict) -> dict:
+        pages = [_page(number, self.server.lines_per_page) for number in range(1, self.server.pages + 1)]
+        return {
+            "status": "SUCCESS",
+            "documentId": request.get("fileId") or uuid.uuid4().hex,
+            "metadata": request.get("metadata", {}),
+            "ocrResults": pages,
+            "keyValuePairs": [{"key": WORDS[i % len(WORDS)], "value": str(i), "confidence": 0.98}
+                              for i in range(self.server.pages * 4)],
+        }
+
+    def _rikai(self, request: dict) -> dict:
+        questions = request.get("question") or []
+        if not isinstance(questions, list):
+            questions = [questions]
+        response = {
+            "status": "SUCCESS",
+            "documentId": request.get("fileId") or uuid.uuid4().hex,
+            "data": [{"question": question, "answer": f"Answer to: {question}", "translated": None}
+                     for question in questions],
+        }
+        if request.get("returnOCR"):
+            response["ocrResults"] = [_page(number, self.server.lines_per_page)
+                                      for number in range(1, self.server.pages + 1)]
+        return response
+
+    def _summarize(self, request: dict) -> dict:
+        fields = request.get("fields") or {}
+        summary = " ".join(WORDS[i % len(WORDS)] for i in range(self.server.lines_per_page * 8))
+        data = {"summary": summary}
+        if fields.get("secondaryDescription"):
+            data["secondarySummary"] = summary
+        return {"status": "SUCCESS", "data": data}
+
+    def _metrics(self, request: dict) -> dict:
+        return {"status": "SUCCESS"}
+
+    def _reply(self, status: int, payload: dict):
+        reply = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(reply)))
+        self.end_headers()
+        self.wfile.write(reply)
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeLazarusServer(ThreadingHTTPServer):
+    """A threaded fake API server.
+
+    Attributes:
+        latency (float): Seconds added to every API request
+        latency_jitter (float): Up to this many seconds are added at random
+        error_rate (float): Fraction of API requests answered with an error
+        error_status (int): Status code of simulated errors
+        pages (int): OCR pages in each forms response
+        lines_per_page (int): Lines of text on each page
+        bandwidth (float): Simulated upload bandwidth in Mbit/s, 0 for none
+        received (int): Request body bytes read
+        counts (dict): Requests served per route, and simulated errors
+    """
+
+    daemon_threads = True
+    # Keep up with benchmarks opening many connections at once
+    request_queue_size = 1024
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0, latency_jitter: float = 0.0,
+                 error_rate: float = 0.0, error_status: int = 500, pages: int = 1, lines_per_page: int = 40,
+                 bandwidth: float = 0.0):
+        super().__init__((host, port), FakeLazarusHandler)
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.pages = pages
+        self.lines_per_page = lines_per_page
+        self.bandwidth = bandwidth
+        self.received = 0
+        self.counts = {}
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.server_address[0]}:{self.server_port}"
+
+    def record(self, route, size: int):
+        with self.lock:
+            self.received += size
+            self.counts[route] = self.counts.get(route, 0) + 1
+
+    def start(self):
+        """Serves requests on a daemon thread, returning the server."""
+        threading.Thread(target=self.serve_forever, name="fake-lazarus", daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on, 0 picks a free one")
+    parser.add_argument("--latency", type=float, default=0.0, help="Milliseconds added to every request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Up to this many milliseconds added at random")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with an error")
+    parser.add_argument("--error-status", type=int, default=500, help="Status code of simulated errors")
+    parser.add_argument("--pages", type=int, default=1, help="OCR pages in each forms response")
+    parser.add_argument("--lines", type=int, default=40, help="Lines of text per page")
+    parser.add_argument("--bandwidth", type=float, default=0.0, help="Upload bandwidth in Mbit/s, 0 for unlimited")
+    args = parser.parse_args()
+
+    server = FakeLazarusServer(args.host, args.port, args.latency / 1000, args.jitter / 1000, args.error_rate,
+                               args.error_status, args.pages, args.lines, args.bandwidth)
+    print(f"Fake Lazarus API listening on {server.url}, set BASE_URL to use it", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +0,0 @@
-from .lazarus_ai import LazarusAuth, Forms, RikAI
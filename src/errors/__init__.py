@@ -1,2 +0,0 @@
-from .api_errors import APIError, AuthError
-from .library_errors import ValidationError, InvalidAuthError
@@ -1,3 +1,15 @@
 from .forms import Forms
 from .lazarus_auth import LazarusAuth
 from .rikai import RikAI
+from .responses import FormsResult, RikAIResult
+from .result_cache import ResultCache
+from .retry_policy import RetryPolicy
+from .rate_limiter import RateLimiter
+from .webhook_listener import WebhookListener
+from .image_preprocessor import ImagePreprocessor
+from .request_hooks import RequestHooks
+from .client_stats import ClientStats
+from .job_journal import JobJournal
+from .async_lazarus_auth import AsyncLazarusAuth
+from .async_forms import AsyncForms
+from .async_rikai import AsyncRikAI
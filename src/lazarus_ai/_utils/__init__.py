@@ -0,0 +1,15 @@
+from .args_validation import _validate_args, _ArgsValidator, _OCR_ARGS, _QUESTION_ARGS, _CUSTOM_QUESTION_ARGS, _SUMMARIZE_FIELDS
+from .base64_stream import _Base64JSONStream
+from .batch import _run_batch, _call_safely
+from .coalesce import _QuestionCoalescer
+from .compression import _compress, _compress_json
+from .error_handling import _error_handling
+from .fingerprint import _fingerprint, _content_hash
+from .input_types import _get_typed_headers, _get_typed_body, _get_multipart_data, _get_form_fields
+from .json_codec import _loads, _decode_response
+from .json_stream import _PageStream
+from .metrics import _record_metrics, _flush_metrics
+from .multipart import _MultipartFileStream
+from .pdf_split import _read_pdf, _split_pdf, _merge_split_results
+from .single_flight import _SingleFlight
+from .transport import Transport
@@ -0,0 +1,93 @@
+"""Helper functions to validate user-provided args.
+
+Each endpoint's validator is compiled once on import, with its valid keys
+in a frozenset and the camelCase name of every key precomputed, so
+validating a request is a set check and a dict lookup per key.
+"""
+
+import re
+
+from ..errors import ValidationError
+
+# Keys the API spells differently from their camelCase conversion
+CASE_OVERRIDES = {"return_ocr": "returnOCR"}
+
+SEPARATOR = re.compile(r"[-_.\s]([a-z])")
+
+
+def _camel_case(key: str) -> str:
+    """Converts a snake_case key to camelCase."""
+    if not key:
+        return key
+    return key[0].lower() + SEPARATOR.sub(lambda match: match.group(1).upper(), key[1:])
+
+
+class _ArgsValidator:
+    """Validates and renames the arguments accepted by one endpoint.
+
+    Attributes:
+        valid_keys (frozenset): Optional arguments accepted
+        ignore_keys (frozenset): Arguments accepted without validation
+        change_case (bool): True to convert keys to camelCase
+    """
+
+    def __init__(self, valid_keys, ignore_keys=(), change_case: bool = True):
+        """Initialize an _ArgsValidator() object.
+
+        Args:
+            valid_keys (iterable): Valid optional arguments
+            ignore_keys (iterable, optional): Arguments that don't need to
+                be validated, defaults to ()
+            change_case (bool, optional): Convert keys to camelCase,
+                defaults to True
+        """
+        self.valid_keys = frozenset(valid_keys)
+        self.ignore_keys = frozenset(ignore_keys)
+        self.change_case = change_case
+        self._allowed = self.valid_keys | self.ignore_keys
+        self._camel = {key: CASE_OVERRIDES.get(key) or _camel_case(key) for key in self._allowed}
+
+
+    def validate(self, args: dict) -> dict:
+        """Validates arguments passed by the user.
+
+        Args:
+            args (dict): Arguments passed to library functions, in snake_case
+        Returns:
+            dict: The arguments, with camelCase keys if change_case is set
+        Raises:
+            ValidationError if args includes keys that are not accepted
+        """
+        if not self._allowed.issuperset(args):
+            invalid_keys = [key for key in args if key not in self._allowed]
+            raise ValidationError(f"These fields are not valid arguments: {', '.join(invalid_keys)}")
+        if not self.change_case:
+            return args
+        camel = self._camel
+        return {camel[key]: value for key, value in args.items()}
+
+
+def _validate_args(args: dict, valid_keys: list, ignore_keys: list = [], change_case: bool = True) -> dict:
+    """Validates arguments passed by the user.
+
+    Checks that args includes only valid or optional keys. Expecting keys in
+    snake_case. Converts arguments to camelCase by default as the API expects
+    keys in camelCase. Raises an error if args has undefined keys. Endpoints
+    called repeatedly use a precompiled _ArgsValidator instead.
+
+    Args:
+        args (dict): Arguments passed to library functions
+        valid_keys (list): List of valid optional arguments
+        ignore_keys (list, optional): List of arguments in args that don't
+            need to be validated, defaults to []
+        change_case (bool, optional): Boolean which is true if want to make
+            the args in dictionary camel case, defaults to True
+    """
+    return _ArgsValidator(valid_keys, ignore_keys, change_case).validate(args)
+
+
+# Validators for each endpoint
+_OCR_ARGS = _ArgsValidator(("file_id", "metadata", "webhook"))
+_QUESTION_ARGS = _ArgsValidator(("file_id", "metadata", "webhook", "return_ocr", "language"))
+_CUSTOM_QUESTION_ARGS = _ArgsValidator(("file_id", "metadata", "webhook", "return_ocr", "language", "settings"))
+_SUMMARIZE_FIELDS = _ArgsValidator(("secondary_description", "json_format"), ("document_type", "summary_description"))
@@ -0,0 +1,138 @@
+"""Streaming JSON body encoder for base64 document uploads."""
+
+import base64
+import json
+import os
+
+from .input_types import FILE_EXTENSIONS
+
+# A multiple of 3 so each chunk encodes to base64 without padding
+CHUNK_SIZE = 48 * 1024
+
+
+class _Base64JSONStream:
+    """A file-like JSON body holding a base64 encoded document.
+
+    Produces {"base64": "<document>", **fields} incrementally, reading and
+    encoding the document in fixed-size chunks as the request body is sent.
+    Peak memory is bounded by the chunk size rather than the document size.
+    The source must be seekable so the Content-Length can be computed up
+    front.
+
+    Attributes:
+        content_type (str): Content-Type header value for the request
+    """
+
+    content_type = "application/json"
+
+    def __init__(self, source, fields: dict = None, chunk_size: int = CHUNK_SIZE):
+        """Initialize a _Base64JSONStream() object.
+
+        Raises a ValueError if a path has an unsupported extension or a
+        file object is not seekable, or a FileNotFoundError if the path
+        supplied is invalid.
+
+        Args:
+            source (str or file): Path to a file, or a binary file object
+                positioned at the start of the document
+            fields (dict, optional): Additional top level JSON fields,
+                defaults to None
+            chunk_size (int, optional): Bytes read from the source at a
+                time, rounded down to a multiple of 3, defaults to 48 KiB
+        """
+        if isinstance(source, (str, os.PathLike)):
+            _, ext = os.path.splitext(os.fspath(source))
+            if ext not in FILE_EXTENSIONS:
+                raise ValueError(f"File must be one of: {FILE_EXTENSIONS.keys()}")
+            self._file = open(os.path.join(os.path.abspath(""), source), "rb")
+            self._owns_file = True
+        else:
+            if not source.seekable():
+                raise ValueError("File objects must be seekable.")
+            self._file = source
+            self._owns_file = False
+
+        self._start = self._file.tell()
+        size = self._file.seek(0, os.SEEK_END) - self._start
+        self._file.seek(self._start)
+
+        self.chunk_size = max(3, chunk_size - chunk_size % 3)
+        self._prefix = b'{"base64": "'
+        if fields:
+            self._suffix = b'", ' + json.dumps(fields).encode()[1:]
+        else:
+            self._suffix = b'"}'
+        self._length = len(self._prefix) + 4 * ((size + 2) // 3) + len(self._suffix)
+        self._iter = self._generate()
+        self._buffer = b""
+
+
+    def rewind(self):
+        """Resets the body to its start so it can be sent again."""
+        self._file.seek(self._start)
+        self._iter = self._generate()
+        self._buffer = b""
+
+
+    def _generate(self):
+        """Yields the encoded body, one encoded chunk at a time."""
+        yield self._prefix
+        remainder = b""
+        while True:
+            data = self._file.read(self.chunk_size)
+            if not data:
+                break
+            data = remainder + data
+            cut = len(data) - len(data) % 3
+            remainder = data[cut:]
+            if cut:
+                yield base64.b64encode(data[:cut])
+        if remainder:
+            yield base64.b64encode(remainder)
+        yield self._suffix
+
+
+    def __len__(self) -> int:
+        return self._length
+
+
+    def read(self, size: int = -1) -> bytes:
+        """Reads up to size bytes of the encoded body.
+
+        Args:
+            size (int, optional): Maximum bytes to return, -1 reads the next
+                encoded chunk, defaults to -1
+        Returns:
+            bytes: The next part of the body, empty once exhausted
+        """
+        while not self._buffer:
+            self._buffer = next(self._iter, None)
+            if self._buffer is None:
+                self._buffer = b""
+                return b""
+        if size is None or size < 0:
+            size = len(self._buffer)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+    def __iter__(self):
+        while True:
+            data = self.read()
+            if not data:
+                return
+            yield data
+
+
+    def close(self):
+        """Closes the source file if it was opened from a path."""
+        if self._owns_file:
+            self._file.close()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc_info):
+        self.close()
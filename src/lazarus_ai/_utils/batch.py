@@ -0,0 +1,80 @@
+"""Helper function to run many library calls on a thread pool."""
+
+import threading
+
+from ..errors import APIError, ValidationError
+
+
+def _run_batch(func, inputs, max_workers: int = 8, progress_callback=None) -> list:
+    """Runs func once per input on a managed thread pool.
+
+    Each input is a tuple of (input_type, input_str) or (input_type,
+    input_str, kwargs). Results are returned in input order. A failed item
+    does not abort the batch, instead its APIError or ValidationError is
+    returned in place of the result. Invalid inputs and connection failures
+    are converted to ValidationError and APIError respectively.
+
+    Args:
+        func (callable): Called as func(input_type, input_str, **kwargs)
+        inputs (iterable): Tuples describing each call
+        max_workers (int, optional): Number of worker threads, defaults to 8
+        progress_callback (callable, optional): Called as
+            progress_callback(completed, total) after each item finishes.
+            Runs on a worker thread, defaults to None
+    Returns:
+        list: A response dict or an error object for every input
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1.")
+
+    calls = [_unpack_input(item) for item in inputs]
+    total = len(calls)
+    results = [None] * total
+    completed = 0
+    lock = threading.Lock()
+
+    def run(index, input_type, input_str, kwargs):
+        nonlocal completed
+        results[index] = _call_safely(func, input_type, input_str, kwargs)
+        with lock:
+            completed += 1
+            if progress_callback is not None:
+                progress_callback(completed, total)
+
+    # Deferred, concurrent.futures pulls in logging on import
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, total or 1)) as executor:
+        futures = [executor.submit(run, i, *call) for i, call in enumerate(calls)]
+        for future in futures:
+            future.result()
+
+    return results
+
+
+def _unpack_input(item) -> tuple:
+    """Normalizes a batch input to (input_type, input_str, kwargs)."""
+    if not isinstance(item, (tuple, list)) or len(item) not in (2, 3):
+        raise ValidationError("Batch inputs must be (input_type, input_str) or (input_type, input_str, kwargs)")
+    if len(item) == 2:
+        return item[0], item[1], {}
+    return item[0], item[1], dict(item[2] or {})
+
+
+def _call_safely(func, input_type, input_str, kwargs):
+    """Calls func, returning expected failures instead of raising them."""
+    import requests
+
+    try:
+        return func(input_type, input_str, **kwargs)
+    except (APIError, ValidationError) as e:
+        return e
+    # RequestException subclasses OSError, so it must be handled first
+    except requests.RequestException as e:
+        error = APIError("FAILURE", str(e), None)
+        error.__cause__ = e
+        return error
+    except (ValueError, OSError) as e:
+        error = ValidationError(str(e))
+        error.__cause__ = e
+        return error
@@ -0,0 +1,107 @@
+"""Coalesces concurrent RikAI questions about the same document."""
+
+import threading
+
+
+class _Group:
+    """Questions gathered for one document during one window."""
+
+    def __init__(self):
+        self.questions = []
+        self.full = threading.Event()
+        self.done = threading.Event()
+        self.response = None
+        self.error = None
+
+
+class _QuestionCoalescer:
+    """Merges concurrent question requests into a single API request.
+
+    The first caller for a key opens a group and waits for the window to
+    pass. Callers arriving with the same key in the meantime append their
+    questions to the group and block. The first caller then sends every
+    question in one request, and each caller receives the response with
+    "data" narrowed to the answers for its own questions. If the request
+    fails, every caller in the group raises the same exception.
+
+    Attributes:
+        window (float): Seconds a group stays open for more questions
+        max_questions (int): Questions after which a group is sent early
+    """
+
+    def __init__(self, window: float, max_questions: int = None):
+        """Initialize a _QuestionCoalescer() object.
+
+        Args:
+            window (float): Seconds to wait for more questions
+            max_questions (int, optional): Largest merged question list,
+                defaults to None which is unlimited
+        """
+        if window < 0:
+            raise ValueError("window must not be negative.")
+        self.window = window
+        self.max_questions = max_questions
+        self._lock = threading.Lock()
+        self._groups = {}
+        self._stats = {"calls": 0, "requests": 0}
+
+
+    def ask(self, key, questions: list, send):
+        """Adds questions to the open group for key and returns their answers.
+
+        Args:
+            key (hashable): Identifies the document, model and arguments
+            questions (list): The caller's questions
+            send (callable): Called as send(questions) with the merged list,
+                returning the API response
+        Returns:
+            dict: The response with "data" holding only this caller's answers
+        """
+        with self._lock:
+            self._stats["calls"] += 1
+            group = self._groups.get(key)
+            leader = group is None
+            if leader:
+                group = self._groups[key] = _Group()
+                self._stats["requests"] += 1
+            offset = len(group.questions)
+            group.questions.extend(questions)
+            if self.max_questions is not None and len(group.questions) >= self.max_questions:
+                # Later callers start a new group rather than growing this one
+                del self._groups[key]
+                group.full.set()
+
+        if leader:
+            group.full.wait(self.window)
+            with self._lock:
+                if self._groups.get(key) is group:
+                    del self._groups[key]
+            try:
+                group.response = send(list(group.questions))
+            except BaseException as e:
+                group.error = e
+            group.done.set()
+        else:
+            group.done.wait()
+
+        if group.error is not None:
+            raise group.error
+        return _split_answers(group.response, offset, len(questions), len(group.questions))
+
+
+    def stats(self) -> dict:
+        """Returns the number of calls made and requests sent."""
+        with self._lock:
+            return dict(self._stats)
+
+
+def _split_answers(response, offset: int, count: int, total: int):
+    """Narrows a merged response to the answers at offset.
+
+    Responses whose "data" does not hold exactly one answer per question are
+    returned whole, since the answers cannot be matched to their callers.
+    """
+    data = response.get("data") if isinstance(response, dict) else None
+    if not isinstance(data, list) or len(data) != total:
+        return response
+    return response | {"data": data[offset:offset + count]}
@@ -0,0 +1,44 @@
+"""Request body compression for JSON payloads."""
+
+import json
+import zlib
+
+ENCODINGS = ("gzip", "deflate")
+
+# zlib window bits selecting the gzip or zlib container
+WBITS = {"gzip": 16 + zlib.MAX_WBITS, "deflate": zlib.MAX_WBITS}
+
+
+def _compress(data: bytes, encoding: str, level: int = 6) -> bytes:
+    """Compresses data with the gzip or deflate content coding.
+
+    Args:
+        data (bytes): Body to compress
+        encoding (str): "gzip" or "deflate"
+        level (int, optional): zlib compression level, defaults to 6
+    Returns:
+        bytes: The compressed body
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, WBITS[encoding])
+    return compressor.compress(data) + compressor.flush()
+
+
+def _compress_json(body, encoding: str, threshold: int, level: int = 6):
+    """Encodes a JSON body, compressing it if it is at least threshold bytes.
+
+    Args:
+        body: JSON serializable request body
+        encoding (str): "gzip" or "deflate"
+        threshold (int): Smallest encoded size, in bytes, worth compressing
+        level (int, optional): zlib compression level, defaults to 6
+    Returns:
+        tuple: (data, headers) to send in place of json=body
+    """
+    data = json.dumps(body, allow_nan=False).encode()
+    headers = {"Content-Type": "application/json"}
+    if len(data) >= threshold:
+        compressed = _compress(data, encoding, level)
+        if len(compressed) < len(data):
+            data = compressed
+            headers["Content-Encoding"] = encoding
+    return data, headers
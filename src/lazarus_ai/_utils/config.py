@@ -0,0 +1,8 @@
+"""Library configuration, resolved once from the environment on import."""
+
+import os
+
+DEFAULT_BASE_URL = "https://api.lazarusforms.com/"
+
+# Root of every API endpoint, overridden with the BASE_URL environment variable
+BASE_URL = os.environ.get("BASE_URL", DEFAULT_BASE_URL)
@@ -1,12 +1,15 @@
 """Helper function to convert responses from failed requests to errors."""
 
 import json
-from requests import Response
+from typing import TYPE_CHECKING
 
-from errors import APIError, AuthError
+from ..errors import APIError, AuthError
 
+if TYPE_CHECKING:
+    from requests import Response
 
-def _error_handling(response: Response):
+
+def _error_handling(response: "Response"):
     """Processes response with non-200 response code.
 
     If the response data is JSON serializable, use the data from the response
@@ -0,0 +1,57 @@
+"""Helper functions to fingerprint a request or document by its content."""
+
+import hashlib
+import json
+import os
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def _hash_document(digest, input_type: str, input_str: str):
+    """Feeds a document to a hash, streaming FILE_PATH inputs by their bytes."""
+    if input_type == "FILE_PATH":
+        with open(os.path.join(os.path.abspath(""), input_str), "rb") as f:
+            while chunk := f.read(CHUNK_SIZE):
+                digest.update(chunk)
+    else:
+        digest.update(input_str.encode())
+
+
+def _fingerprint(endpoint: str, model_id, input_type: str, input_str: str, params: dict = None) -> str:
+    """Computes a stable key identifying a request.
+
+    The key covers the endpoint, model_id, input type, the request params
+    and the document itself. FILE_PATH documents are hashed by their bytes,
+    so the same file at two paths produces the same key. URL and BASE64
+    documents are hashed by their string value.
+
+    Args:
+        endpoint (str): Endpoint name or URL
+        model_id (str): Custom model ID or None
+        input_type (str): Type of input expected [FILE_PATH, URL, BASE64]
+        input_str (str): A path to a file, url or a base64 encoded string
+        params (dict, optional): Remaining request params such as questions,
+            fields and kwargs, defaults to None
+    Returns:
+        str: Hex encoded SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    header = [endpoint, model_id, input_type, params or {}]
+    digest.update(json.dumps(header, sort_keys=True, default=str).encode())
+    digest.update(b"\0")
+    _hash_document(digest, input_type, input_str)
+    return digest.hexdigest()
+
+
+def _content_hash(input_type: str, input_str: str) -> str:
+    """Hashes a document alone, by its bytes for FILE_PATH inputs.
+
+    Args:
+        input_type (str): Type of input expected [FILE_PATH, URL, BASE64]
+        input_str (str): A path to a file, url or a base64 encoded string
+    Returns:
+        str: Hex encoded SHA-256 digest
+    """
+    digest = hashlib.sha256(input_type.encode() + b"\0")
+    _hash_document(digest, input_type, input_str)
+    return digest.hexdigest()
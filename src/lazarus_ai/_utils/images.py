@@ -0,0 +1,158 @@
+"""Image preprocessing run in worker processes before upload.
+
+The functions here are top-level so they can be pickled and run in a
+ProcessPoolExecutor. They import Pillow lazily, so it is only required when
+preprocessing is enabled.
+"""
+
+import base64
+import io
+import math
+import os
+import tempfile
+
+from .input_types import FILE_EXTENSIONS
+
+# Image file extensions preprocessing applies to
+IMAGE_EXTENSIONS = frozenset(ext for ext, mime in FILE_EXTENSIONS.items() if mime.startswith("image/"))
+
+# Pillow format names mapped to the extension written for them
+FORMAT_EXTENSIONS = {"PNG": ".png", "JPEG": ".jpg", "TIFF": ".tif", "WEBP": ".webp"}
+
+# Leading bytes of the image formats in FILE_EXTENSIONS
+IMAGE_SIGNATURES = (b"\x89PNG\r\n\x1a\n", b"\xff\xd8\xff", b"II*\x00", b"MM\x00*")
+
+
+def _is_base64_image(input_str: str) -> bool:
+    """Checks the magic bytes of a base64 document without decoding all of it."""
+    try:
+        # 16 characters decode to the first 12 bytes, enough for every signature
+        head = base64.b64decode(input_str[:16])
+    except ValueError:
+        return False
+    return head.startswith(IMAGE_SIGNATURES) or (head[:4] == b"RIFF" and head[8:12] == b"WEBP")
+
+
+def _import_pillow():
+    """Imports Pillow, raising a helpful error if it is not installed."""
+    try:
+        from PIL import Image, ImageSequence
+    except ImportError as e:
+        raise ImportError("Image preprocessing requires Pillow. Install it with `pip install lazarus-ai[images]`.") from e
+    return Image, ImageSequence
+
+
+def _scale(image, options: dict) -> float:
+    """Returns the downscale factor meeting the DPI and pixel budgets."""
+    scale = 1.0
+    dpi = image.info.get("dpi")
+    if options.get("max_dpi") and dpi and dpi[0]:
+        scale = min(scale, options["max_dpi"] / float(dpi[0]))
+    if options.get("max_pixels"):
+        scale = min(scale, math.sqrt(options["max_pixels"] / (image.width * image.height)))
+    return scale
+
+
+def _process_frame(frame, options: dict, Image):
+    """Returns a converted and downscaled copy of a frame, and its scale."""
+    image = frame
+    scale = _scale(image, options)
+    if options.get("grayscale") and image.mode not in ("1", "L"):
+        image = image.convert("L")
+    elif image.mode not in ("1", "L", "RGB"):
+        image = image.convert("RGB")
+    if scale < 1:
+        size = (max(1, int(image.width * scale)), max(1, int(image.height * scale)))
+        image = image.resize(size, Image.LANCZOS)
+    if image is frame:
+        # Frames of a multi-page image share one object as they are read
+        image = frame.copy()
+    return image, scale
+
+
+def _encode_image(data: bytes, options: dict):
+    """Downscales, converts and recompresses an encoded image.
+
+    Args:
+        data (bytes): Encoded image
+        options (dict): max_dpi, max_pixels, grayscale, format and quality
+    Returns:
+        tuple: (encoded image, Pillow format name)
+    """
+    Image, ImageSequence = _import_pillow()
+    with Image.open(io.BytesIO(data)) as source:
+        fmt = options.get("format") or source.format
+        dpi = source.info.get("dpi")
+        frames = []
+        for frame in ImageSequence.Iterator(source):
+            frame, scale = _process_frame(frame, options, Image)
+            frames.append(frame)
+        if fmt not in FORMAT_EXTENSIONS or (len(frames) > 1 and fmt != "TIFF"):
+            # Only TIFF output keeps every page of a multi-page image
+            fmt = "TIFF" if len(frames) > 1 else "PNG"
+
+    params = {}
+    if dpi and dpi[0]:
+        params["dpi"] = (dpi[0] * scale, dpi[1] * scale)
+    if fmt in ("JPEG", "WEBP"):
+        params["quality"] = options.get("quality", 85)
+        frames = [frame.convert("RGB") if frame.mode == "1" else frame for frame in frames]
+    elif fmt == "PNG":
+        params["optimize"] = True
+    elif fmt == "TIFF":
+        params["compression"] = "group4" if all(frame.mode == "1" for frame in frames) else "tiff_deflate"
+    if len(frames) > 1:
+        params.update(save_all=True, append_images=frames[1:])
+
+    out = io.BytesIO()
+    frames[0].save(out, format=fmt, **params)
+    return out.getvalue(), fmt
+
+
+def _preprocess_file(path: str, options: dict):
+    """Preprocesses an image file into a temporary file.
+
+    Args:
+        path (str): Image file path
+        options (dict): Preprocessing options
+    Returns:
+        tuple: (path of the processed file or None if it was not smaller,
+            bytes before, bytes after)
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    try:
+        encoded, fmt = _encode_image(data, options)
+    except OSError:
+        # Unreadable images are uploaded as they are for the API to report
+        return None, len(data), len(data)
+    if len(encoded) >= len(data):
+        return None, len(data), len(data)
+
+    # Keep the original file name, changing only the extension if the format changed
+    stem, _ = os.path.splitext(os.path.basename(path))
+    out_path = os.path.join(tempfile.mkdtemp(prefix="lazarus-image-"), stem + FORMAT_EXTENSIONS[fmt])
+    with open(out_path, "wb") as f:
+        f.write(encoded)
+    return out_path, len(data), len(encoded)
+
+
+def _preprocess_base64(input_str: str, options: dict):
+    """Preprocesses a base64 encoded image.
+
+    Args:
+        input_str (str): Base64 encoded image
+        options (dict): Preprocessing options
+    Returns:
+        tuple: (base64 string of the processed image or None if it was not
+            smaller, bytes before, bytes after)
+    """
+    data = base64.b64decode(input_str)
+    try:
+        encoded, _ = _encode_image(data, options)
+    except OSError:
+        # Documents that are not images, such as PDFs, are sent as they are
+        return None, len(data), len(data)
+    if len(encoded) >= len(data):
+        return None, len(data), len(data)
+    return base64.b64encode(encoded).decode(), len(data), len(encoded)
@@ -1,10 +1,7 @@
 """Helper functions used to map input types to requests and responses."""
 
+import json
 import os
-import sys
-
-parent_dir = os.path.dirname(os.path.realpath(__file__))
-sys.path.append(parent_dir)
 
 # Mapping file extensions to their MIME types
 FILE_EXTENSIONS = {
@@ -61,7 +58,9 @@ def _get_multipart_data(path: str) -> tuple:
     Extracts necessary info from the path, extends it to an absolute
     path, and creates a tuple holding file information that can be passed
     to a request in the data parameter. This function will raise a 
-    FileNotFoundError if the path supplied is invalid.
+    FileNotFoundError if the path supplied is invalid. The caller is
+    responsible for closing the returned file object. Prefer
+    _MultipartFileStream, which streams the file and closes it for you.
 
     Args:
         path (str): File path
@@ -76,3 +75,29 @@ def _get_multipart_data(path: str) -> tuple:
         raise ValueError(f"File must be one of: {FILE_EXTENSIONS.keys()}")
 
     return (filename, open(path, 'rb'), FILE_EXTENSIONS[ext])
+
+
+def _get_form_fields(fields: dict) -> dict:
+    """Serializes request fields for a multipart form body.
+
+    Lists are kept so that each item is sent as a repeated form field.
+    Dicts, and any nested containers inside lists, are JSON encoded since
+    multipart forms can only carry flat string values.
+
+    Args:
+        fields (dict): Request fields, already converted to camelCase
+    Returns:
+        dict: Form field key-value pairs
+    """
+    def encode(value):
+        if isinstance(value, (dict, list, tuple)):
+            return json.dumps(value)
+        return value
+
+    form = {}
+    for key, value in fields.items():
+        if isinstance(value, (list, tuple)):
+            form[key] = [encode(item) for item in value]
+        else:
+            form[key] = encode(value)
+    return form
@@ -0,0 +1,37 @@
+"""JSON decoding using orjson when it is installed.
+
+orjson decodes large responses several times faster than the standard
+library and builds the same plain dicts and lists, so it is used whenever
+it can be imported. Install it with the "fast" extra.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _loads(data):
+    """Decodes a JSON document from bytes or str.
+
+    Documents orjson rejects, such as ones containing NaN, are decoded again
+    with the standard library so results never depend on the decoder.
+
+    Args:
+        data (bytes | str): JSON document
+    Returns:
+        The decoded document
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def _decode_response(response):
+    """Decodes the JSON body of a requests or httpx response."""
+    return _loads(response.content)
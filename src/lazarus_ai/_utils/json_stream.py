@@ -0,0 +1,201 @@
+"""Incremental parsing of large JSON responses, one page at a time."""
+
+import codecs
+import json
+import re
+
+from .json_codec import _loads
+
+CHUNK_SIZE = 64 * 1024
+WHITESPACE = " \t\n\r"
+
+STRUCTURAL = re.compile(r'["{}\[\],\s]')
+STRING_SPECIAL = re.compile(r'["\\]')
+
+
+class _PageStream:
+    """Iterates over one array of a JSON response as the body arrives.
+
+    The body is read in chunks. Each element of the array under key is
+    decoded and yielded once its closing bracket arrives, then dropped, so
+    peak memory is bounded by one element rather than the whole document.
+    Every other top-level field is collected into result, which is complete
+    once iteration finishes. The response is closed when iteration ends or
+    on close().
+
+    Attributes:
+        key (str): Top-level field holding the streamed array
+        result (dict): Top-level fields other than key, None until the
+            body has been read
+    """
+
+    def __init__(self, response, key: str = "ocrResults", on_complete=None, chunk_size: int = CHUNK_SIZE):
+        """Initialize a _PageStream() object.
+
+        Args:
+            response (Response): A response sent with stream=True
+            key (str, optional): Top-level array to stream, defaults to
+                "ocrResults"
+            on_complete (callable, optional): Called with result once the
+                body has been read, defaults to None
+            chunk_size (int, optional): Bytes read at a time, defaults to 64 KiB
+        """
+        self.key = key
+        self.result = None
+        self._response = response
+        self._on_complete = on_complete
+        self._chunks = response.iter_content(chunk_size)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._iterator = None
+
+
+    def __iter__(self):
+        if self._iterator is None:
+            self._iterator = self._parse()
+        return self._iterator
+
+
+    def close(self):
+        """Closes the underlying response, discarding any unread body."""
+        self._response.close()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+    def _parse(self):
+        """Yields each element of the streamed array, then sets result."""
+        try:
+            result = {}
+            self._expect("{")
+            if self._peek() == "}":
+                self._pos += 1
+            else:
+                while True:
+                    name = json.loads(self._value_text())
+                    self._expect(":")
+                    if name == self.key and self._peek() == "[":
+                        self._pos += 1
+                        yield from self._array_items()
+                    else:
+                        result[name] = _loads(self._value_text())
+                    if self._expect(",", "}") == "}":
+                        break
+            self.result = result
+        finally:
+            self.close()
+        if self._on_complete is not None:
+            self._on_complete(result)
+
+
+    def _array_items(self):
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield _loads(self._value_text())
+            # Drop the consumed element before reading the next one
+            self._compact()
+            if self._expect(",", "]") == "]":
+                return
+
+
+    def _fill(self) -> bool:
+        """Appends the next chunk to the buffer, returning False at the end."""
+        if self._eof:
+            return False
+        for chunk in self._chunks:
+            text = self._decoder.decode(chunk)
+            if text:
+                self._buf += text
+                return True
+        self._buf += self._decoder.decode(b"", final=True)
+        self._eof = True
+        return False
+
+
+    def _compact(self):
+        self._buf = self._buf[self._pos:]
+        self._pos = 0
+
+
+    def _peek(self) -> str:
+        """Returns the next non-whitespace character without consuming it."""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            self._compact()
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON response")
+
+
+    def _expect(self, *chars) -> str:
+        """Consumes the next non-whitespace character, which must be in chars."""
+        char = self._peek()
+        if char not in chars:
+            raise ValueError(f"Expected one of {chars} in JSON response, found {char!r}")
+        self._pos += 1
+        return char
+
+
+    def _value_text(self) -> str:
+        """Consumes one complete JSON value and returns its text.
+
+        Objects, arrays and strings are scanned to their closing character,
+        tracking nesting and escapes, so each value is decoded exactly once.
+        The scan jumps between structural characters with regular
+        expressions rather than stepping through every character.
+        """
+        self._peek()
+        start = i = self._pos
+        depth = 0
+        in_string = escaped = False
+        while True:
+            buf = self._buf
+            if escaped and i < len(buf):
+                i += 1
+                escaped = False
+            match = None
+            if i < len(buf):
+                match = (STRING_SPECIAL if in_string else STRUCTURAL).search(buf, i)
+            if match is None:
+                i = len(buf)
+                if not self._fill():
+                    if depth or in_string:
+                        raise ValueError("Unexpected end of JSON response")
+                    break
+                continue
+
+            char = match.group()
+            i = match.end()
+            if in_string:
+                if char == "\\":
+                    escaped = True
+                else:
+                    in_string = False
+                    if not depth:
+                        break
+            elif char == '"':
+                in_string = True
+            elif char in "{[":
+                depth += 1
+            elif char in "}]" and depth:
+                depth -= 1
+                if not depth:
+                    break
+            elif not depth:
+                # A comma, whitespace or closing bracket ends a scalar value
+                i -= 1
+                break
+        self._pos = i
+        return self._buf[start:i]
@@ -0,0 +1,164 @@
+""" Record library metrics
+
+Metrics are reported off the request critical path. _record_metrics only
+places a small event on a bounded in-process queue, and a daemon thread
+drains the queue in batches over the pooled keep-alive session. When the
+queue is full the oldest events are dropped. Pending events are flushed at
+interpreter exit, or explicitly with _flush_metrics().
+"""
+import atexit
+import collections
+import os
+import threading
+import time
+
+from .config import BASE_URL
+
+# Response fields kept when reporting a successful request
+SUMMARY_FIELDS = ("status", "documentId")
+
+
+class _MetricsReporter:
+    """Background reporter draining a bounded queue of metrics events.
+
+    Attributes:
+        max_queue (int): Maximum number of pending events
+        batch_size (int): Maximum number of events sent per wake-up
+        dropped (int): Number of events discarded because the queue was full
+    """
+
+    def __init__(self, max_queue: int = 1000, batch_size: int = 50):
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.dropped = 0
+        self._queue = collections.deque(maxlen=max_queue)
+        self._cond = threading.Condition()
+        self._in_progress = 0
+        self._thread = None
+        self._pid = None
+        self._atexit_registered = False
+
+
+    def submit(self, event: tuple):
+        """Queues an event, dropping the oldest pending event if full."""
+        with self._cond:
+            self._ensure_worker()
+            if len(self._queue) == self.max_queue:
+                self.dropped += 1
+            self._queue.append(event)
+            self._cond.notify_all()
+
+
+    def flush(self, timeout=None) -> bool:
+        """Blocks until every queued event has been sent.
+
+        Args:
+            timeout (float, optional): Seconds to wait, defaults to None
+        Returns:
+            bool: True if the queue was fully drained
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            if self._pid != os.getpid():
+                return not self._queue
+            while self._queue or self._in_progress:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+
+    def _ensure_worker(self):
+        """Starts the worker thread, restarting it in a forked child."""
+        pid = os.getpid()
+        if self._thread is not None and self._pid == pid:
+            return
+        if self._pid is not None and self._pid != pid:
+            # Events queued before fork() are reported by the parent
+            self._queue.clear()
+            self._in_progress = 0
+        self._pid = pid
+        self._thread = threading.Thread(target=self._run, name="lazarus-metrics", daemon=True)
+        self._thread.start()
+        if not self._atexit_registered:
+            atexit.register(self.flush, 5)
+            self._atexit_registered = True
+
+
+    def _run(self):
+        """Worker loop, sends queued events in batches."""
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+                self._in_progress = len(batch)
+
+            for event in batch:
+                _send_event(*event)
+
+            with self._cond:
+                self._in_progress = 0
+                self._cond.notify_all()
+
+
+_reporter = _MetricsReporter()
+
+
+def _send_event(url: str, headers: dict, data: dict, transport=None):
+    """Posts a single metrics event, never raising on failure."""
+    try:
+        if transport is None:
+            import requests
+            requests.post(url, headers=headers, json=data)
+        else:
+            # Metrics bypass the rate limiter and retry policy so they never
+            # use up request quota or trip circuit breakers
+            transport.post(url, headers=headers, json=data, managed=False)
+    except Exception:
+        pass
+
+
+def _summarize_response(response):
+    """Trims an API response to the fields needed for metrics."""
+    if not isinstance(response, dict):
+        return None
+    return {key: response[key] for key in SUMMARY_FIELDS if key in response}
+
+
+def _record_metrics(endpoint: str, headers, model_id=None, response=None, transport=None):
+    """ Record metrics on successful and failed API requests using forms-python
+
+    Returns as soon as the event is queued. Only summary fields of the
+    response are reported.
+
+    Args:
+        endpoint (str): String indicating the endpoint in use
+                Should be either "rikai", "forms", or "rikai/summarizer"
+        headers: Authenticated header
+        model_id (optional): Custom model ID. Defaults to None.
+        response (optional): API response of successful requests. Defaults to None.
+        transport (Transport, optional): Pooled transport to post with. Defaults to None.
+    """
+    # Do not want to record metrics when running tests
+    if os.getenv('TEST_MODE') == 'True':
+        return
+
+    metrics_url = f"{BASE_URL}/api/library-metrics/forms-python"
+    if model_id:
+        metrics_url += f"/{model_id}"
+
+    data = {"endpoint": endpoint, "response": _summarize_response(response)}
+    _reporter.submit((metrics_url, dict(headers), data, transport))
+
+
+def _flush_metrics(timeout=None) -> bool:
+    """ Blocks until all queued metrics events have been sent
+
+    Args:
+        timeout (float, optional): Seconds to wait. Defaults to None.
+    Returns:
+        bool: True if every queued event was sent
+    """
+    return _reporter.flush(timeout)
@@ -0,0 +1,139 @@
+"""Streaming multipart/form-data encoder for FILE_PATH uploads."""
+
+import os
+import uuid
+
+from .input_types import FILE_EXTENSIONS, _get_form_fields
+
+CHUNK_SIZE = 64 * 1024
+
+
+class _MultipartFileStream:
+    """A file-like multipart/form-data body that reads a file from disk.
+
+    The form fields and part headers are built up front, but the file itself
+    is read in fixed-size chunks as the request body is sent, so memory use
+    does not grow with the file size. The file handle is opened on init and
+    closed by close(), or on leaving a with block.
+
+    Attributes:
+        boundary (str): Multipart boundary separating the body parts
+        content_type (str): Content-Type header value for the request
+    """
+
+    def __init__(self, path: str, fields: dict = None, field_name: str = "file", chunk_size: int = CHUNK_SIZE):
+        """Initialize a _MultipartFileStream() object.
+
+        Raises a ValueError if the file extension is not supported, or a
+        FileNotFoundError if the path supplied is invalid.
+
+        Args:
+            path (str): File path
+            fields (dict, optional): Form fields sent before the file,
+                defaults to None
+            field_name (str, optional): Form field holding the file,
+                defaults to "file"
+            chunk_size (int, optional): Bytes read from disk at a time,
+                defaults to 64 KiB
+        """
+        filename = os.path.basename(path)
+        _, ext = os.path.splitext(filename)
+        if ext not in FILE_EXTENSIONS:
+            raise ValueError(f"File must be one of: {FILE_EXTENSIONS.keys()}")
+
+        self.boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+        self.chunk_size = chunk_size
+
+        preamble = b"".join(self._encode_field(key, value) for key, value in _get_form_fields(fields or {}).items())
+        preamble += (
+            f"--{self.boundary}\r\n"
+            f"Content-Disposition: form-data; name=\"{field_name}\"; filename=\"{filename}\"\r\n"
+            f"Content-Type: {FILE_EXTENSIONS[ext]}\r\n\r\n"
+        ).encode()
+        epilogue = f"\r\n--{self.boundary}--\r\n".encode()
+
+        self._file = open(os.path.join(os.path.abspath(""), path), "rb")
+        self._file_size = os.fstat(self._file.fileno()).st_size
+        self._preamble = preamble
+        self._epilogue = epilogue
+        self._length = len(preamble) + self._file_size + len(epilogue)
+        self.rewind()
+
+
+    def rewind(self):
+        """Resets the body to its start so it can be sent again."""
+        self._file.seek(0)
+        self._segments = [self._preamble, self._file, self._epilogue]
+        self._segment = 0
+
+
+    def _encode_field(self, key: str, value) -> bytes:
+        """Encodes a form field, repeating the part for list values."""
+        values = value if isinstance(value, list) else [value]
+        parts = []
+        for item in values:
+            if isinstance(item, bytes):
+                data = item
+            else:
+                data = str(item).encode()
+            parts.append(
+                f"--{self.boundary}\r\nContent-Disposition: form-data; name=\"{key}\"\r\n\r\n".encode()
+                + data + b"\r\n"
+            )
+        return b"".join(parts)
+
+
+    def __len__(self) -> int:
+        return self._length
+
+
+    def read(self, size: int = -1) -> bytes:
+        """Reads up to size bytes of the encoded body.
+
+        Args:
+            size (int, optional): Maximum bytes to return, -1 reads up to one
+                chunk, defaults to -1
+        Returns:
+            bytes: The next part of the body, empty once exhausted
+        """
+        if size is None or size < 0:
+            size = self.chunk_size
+
+        while self._segment < len(self._segments):
+            segment = self._segments[self._segment]
+            if isinstance(segment, bytes):
+                data, rest = segment[:size], segment[size:]
+                self._segments[self._segment] = rest
+            else:
+                data = segment.read(min(size, self.chunk_size))
+            if data:
+                return data
+            self._segment += 1
+        return b""
+
+
+    def __iter__(self):
+        while True:
+            data = self.read(self.chunk_size)
+            if not data:
+                return
+            yield data
+
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+
+    def close(self):
+        """Closes the underlying file handle."""
+        self._file.close()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc_info):
+        self.close()
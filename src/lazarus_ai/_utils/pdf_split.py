@@ -0,0 +1,91 @@
+"""Helper functions to split PDFs into page chunks and merge their results.
+
+pypdf is imported lazily, so it is only required when splitting is used.
+"""
+
+import base64
+import io
+
+PDF_MAGIC = b"%PDF"
+
+# Fields of a page-level item holding its page number
+PAGE_FIELDS = ("page", "pageNumber")
+
+
+def _import_pypdf():
+    """Imports pypdf, raising a helpful error if it is not installed."""
+    try:
+        import pypdf
+    except ImportError as e:
+        raise ImportError("Splitting PDFs requires pypdf. Install it with `pip install lazarus-ai[pdf]`.") from e
+    return pypdf
+
+
+def _read_pdf(input_type: str, input_str: str):
+    """Returns the PDF bytes of a FILE_PATH or BASE64 input, or None if not a PDF."""
+    if input_type == "FILE_PATH":
+        with open(input_str, "rb") as f:
+            data = f.read()
+    elif input_type == "BASE64":
+        data = base64.b64decode(input_str)
+    else:
+        return None
+    return data if data.startswith(PDF_MAGIC) else None
+
+
+def _split_pdf(data: bytes, pages_per_chunk: int) -> list:
+    """Splits a PDF into chunks of consecutive pages.
+
+    Args:
+        data (bytes): PDF document
+        pages_per_chunk (int): Largest number of pages in a chunk
+    Returns:
+        list: Tuples of (first page, last page, base64 encoded chunk), with
+            1-based page numbers
+    """
+    pypdf = _import_pypdf()
+    reader = pypdf.PdfReader(io.BytesIO(data))
+    total = len(reader.pages)
+    chunks = []
+    for start in range(0, total, pages_per_chunk):
+        end = min(start + pages_per_chunk, total)
+        writer = pypdf.PdfWriter()
+        for index in range(start, end):
+            writer.add_page(reader.pages[index])
+        out = io.BytesIO()
+        writer.write(out)
+        chunks.append((start + 1, end, base64.b64encode(out.getvalue()).decode()))
+    return chunks
+
+
+def _renumber(item, offset: int):
+    """Returns a copy of a page-level item with its page number shifted."""
+    if not isinstance(item, dict) or not offset:
+        return item
+    item = dict(item)
+    for field in PAGE_FIELDS:
+        if isinstance(item.get(field), int):
+            item[field] += offset
+    return item
+
+
+def _merge_split_results(results: list) -> dict:
+    """Merges per-chunk responses into a single response.
+
+    Top-level fields are taken from the first chunk. List fields, such as
+    ocrResults and keyValuePairs, are concatenated in page order, with page
+    numbers shifted so they count from the start of the whole document.
+
+    Args:
+        results (list): Tuples of (first page, response), in page order
+    Returns:
+        dict: The merged response
+    """
+    merged = {}
+    for first_page, response in results:
+        for key, value in response.items():
+            if isinstance(value, list):
+                merged.setdefault(key, []).extend(_renumber(item, first_page - 1) for item in value)
+            else:
+                merged.setdefault(key, value)
+    return merged
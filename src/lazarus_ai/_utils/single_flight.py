@@ -0,0 +1,73 @@
+"""Shares one in-flight request between concurrent identical calls."""
+
+import copy
+import threading
+
+
+class _Call:
+    """A request in flight and its eventual outcome."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class _SingleFlight:
+    """De-duplicates concurrent calls with the same key.
+
+    The first caller for a key runs the function. Callers arriving with the
+    same key while it runs wait for it instead, then receive a copy of its
+    result or raise its exception. Nothing is kept once the call finishes,
+    so a later call with the same key runs again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._stats = {"calls": 0, "shared": 0}
+
+
+    def do(self, key, func):
+        """Runs func, or waits for the identical call already running.
+
+        Args:
+            key (hashable): Request fingerprint
+            func (callable): Called with no arguments to make the request
+        Returns:
+            The result of func
+        """
+        with self._lock:
+            self._stats["calls"] += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self._stats["shared"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            # Callers may modify their response, so each waiter gets its own
+            return copy.deepcopy(call.result)
+
+        try:
+            result = func()
+            # Snapshot before waiters wake, as the leader's caller may modify its result
+            call.result = copy.deepcopy(result)
+            return result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+    def stats(self) -> dict:
+        """Returns the number of calls made and calls served by another's request."""
+        with self._lock:
+            return dict(self._stats)
@@ -0,0 +1,118 @@
+"""Helpers timing the phases of a request for RequestHooks.
+
+This module imports urllib3, so the transport only imports it once hooks
+are set, when it creates its session.
+"""
+
+import io
+import threading
+import time
+
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+CHUNK_SIZE = 64 * 1024
+
+# Seconds spent opening connections, per thread since the last reset
+_local = threading.local()
+
+
+def _reset_connect_time():
+    _local.seconds = 0.0
+
+
+def _connect_time() -> float:
+    return getattr(_local, "seconds", 0.0)
+
+
+class _TimedConnectMixin:
+    """Adds the time taken by connect() to the calling thread's total."""
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            _local.seconds = _connect_time() + time.perf_counter() - start
+
+
+class _TimedHTTPConnection(_TimedConnectMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+def _time_connections(adapter):
+    """Makes an HTTPAdapter's pools record the time spent connecting.
+
+    Connections are opened on the thread sending the request, which can
+    read its total with _connect_time().
+    """
+    adapter.poolmanager.pool_classes_by_scheme = {"http": _TimedHTTPConnectionPool,
+                                                  "https": _TimedHTTPSConnectionPool}
+
+
+class _TimedBody:
+    """A request body reporting when it has been read in full.
+
+    Wraps bytes or a streamed body with a known length. The body is read
+    as it is written to the socket, so once the last chunk has been read
+    the upload has been handed to the operating system.
+
+    Attributes:
+        sent (int): Bytes read so far
+        on_complete (callable): Called once the last byte has been read
+    """
+
+    def __init__(self, body):
+        """Initialize a _TimedBody() object.
+
+        Args:
+            body (bytes | stream): bytes, or an object with read() and len()
+        """
+        self._body = io.BytesIO(body) if isinstance(body, bytes) else body
+        self._length = len(body)
+        self.on_complete = None
+        self.rewind()
+
+
+    def rewind(self):
+        """Resets the body to its start so it can be sent again."""
+        if hasattr(self._body, "rewind"):
+            self._body.rewind()
+        elif hasattr(self._body, "seek"):
+            self._body.seek(0)
+        self.sent = 0
+        self._completed = False
+
+
+    def __len__(self) -> int:
+        return self._length
+
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._body.read(CHUNK_SIZE if size is None or size < 0 else size)
+        self.sent += len(data)
+        if not self._completed and (not data or self.sent >= self._length):
+            self._completed = True
+            if self.on_complete is not None:
+                self.on_complete()
+        return data
+
+
+    def __iter__(self):
+        while True:
+            data = self.read(CHUNK_SIZE)
+            if not data:
+                return
+            yield data
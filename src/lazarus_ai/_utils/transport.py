@@ -0,0 +1,312 @@
+"""Pooled HTTP transport shared by LazarusAuth, Forms and RikAI.
+
+Every request made by the library goes through a single keep-alive
+requests.Session owned by the LazarusAuth instance, so repeated calls reuse
+open TCP+TLS connections instead of performing a new handshake each time.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
+
+from .compression import ENCODINGS, _compress_json
+from .single_flight import _SingleFlight
+
+if TYPE_CHECKING:
+    import requests
+
+# Response codings requests can decode without optional packages
+ACCEPT_ENCODING = "gzip, deflate"
+
+
+def _body_size(request) -> int:
+    """Returns the size of a sent request body, 0 if it is unknown."""
+    body = getattr(request, "body", None)
+    try:
+        return len(body) if body is not None else 0
+    except TypeError:
+        return 0
+
+
+def _content_size(response, stream: bool) -> int:
+    """Returns the size of a response body without reading streamed ones."""
+    if not stream:
+        return len(response.content)
+    try:
+        return int(response.headers.get("Content-Length", 0))
+    except ValueError:
+        return 0
+
+
+class Transport:
+    """A thread-safe, fork-aware wrapper around a pooled requests.Session.
+
+    Attributes:
+        pool_connections (int): Number of per-host connection pools to cache
+        pool_maxsize (int): Maximum number of connections kept open per host
+        retry_policy (RetryPolicy): Policy applied to failed requests, or None
+        rate_limiter (RateLimiter): Token bucket consulted before sending, or None
+        flights (_SingleFlight): De-duplicates identical concurrent requests, or None
+        compression (str): Content coding for JSON request bodies, or None
+        compression_threshold (int): Smallest JSON body compressed, in bytes
+        hooks (RequestHooks): Callbacks observing each attempt, or None
+        client_stats (ClientStats): Aggregates every managed request, or None
+    """
+
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 10, retry_policy=None,
+                 rate_limiter=None, rate_limit_key: str = "default", single_flight: bool = False,
+                 compression: str = None, compression_threshold: int = 1024, hooks=None, client_stats=None):
+        """Initialize a Transport() object.
+
+        The underlying session is created lazily on first use and recreated
+        in a child process after fork(), since sockets cannot safely be
+        shared between processes.
+
+        Args:
+            pool_connections (int, optional): Number of per-host connection
+                pools to cache, defaults to 10
+            pool_maxsize (int, optional): Maximum number of connections kept
+                open per host, defaults to 10
+            retry_policy (RetryPolicy, optional): Retries failed requests and
+                short-circuits failing endpoints, defaults to None
+            rate_limiter (RateLimiter, optional): Consulted before every
+                attempt is sent, defaults to None
+            rate_limit_key (str, optional): Rate limiter bucket key,
+                defaults to "default"
+            single_flight (bool, optional): Share one request between
+                concurrent calls with the same fingerprint, defaults to False
+            compression (str, optional): "gzip" or "deflate" to compress JSON
+                request bodies, defaults to None
+            compression_threshold (int, optional): Smallest JSON body, in
+                bytes, that is compressed, defaults to 1024
+            hooks (RequestHooks, optional): Called as each attempt starts,
+                finishes uploading, and gets a response or fails, defaults
+                to None
+            client_stats (ClientStats, optional): Records the count, latency,
+                errors and bytes of every managed request, defaults to None
+        """
+        if pool_connections < 1 or pool_maxsize < 1:
+            raise ValueError("Pool sizes must be at least 1.")
+        if compression is not None and compression not in ENCODINGS:
+            raise ValueError(f"compression must be one of: {', '.join(ENCODINGS)}")
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.retry_policy = retry_policy
+        self.rate_limiter = rate_limiter
+        self.rate_limit_key = rate_limit_key
+        self.flights = _SingleFlight() if single_flight else None
+        self.compression = compression
+        self.compression_threshold = compression_threshold
+        self.hooks = hooks
+        self.client_stats = client_stats
+        self._lock = threading.Lock()
+        self._session = None
+        self._pid = None
+
+
+    @property
+    def session(self) -> "requests.Session":
+        """Returns the pooled session, creating it if needed.
+
+        A session inherited across fork() is discarded without closing it,
+        as closing would shut down sockets still owned by the parent.
+        """
+        pid = os.getpid()
+        if self._session is not None and self._pid == pid:
+            return self._session
+
+        with self._lock:
+            if self._session is None or self._pid != pid:
+                self._session = self._make_session()
+                self._pid = pid
+            return self._session
+
+
+    def _make_session(self) -> "requests.Session":
+        """Builds a session with a sized connection pool mounted for http(s).
+
+        requests is imported here rather than on import of the package, as
+        it is the slowest dependency to load.
+        """
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+        adapter = HTTPAdapter(pool_connections=self.pool_connections,
+                              pool_maxsize=self.pool_maxsize,
+                              pool_block=False)
+        if self.hooks is not None:
+            from .timing import _time_connections
+            _time_connections(adapter)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+
+    def post(self, url: str, idempotent: bool = False, managed: bool = True, model_id: str = None,
+             **kwargs) -> "requests.Response":
+        """Posts a request over the pooled session.
+
+        Each attempt first takes a token from the rate limiter, if one is
+        set. If a retry policy is set, failed attempts are retried according
+        to it. Streamed bodies are rewound before each retry. With compression
+        set, JSON bodies above the threshold are compressed once, before the
+        first attempt. With client_stats set, the request is recorded once
+        it returns or raises, retries included.
+
+        Args:
+            url (str): Request URL
+            idempotent (bool, optional): True if the request carries a
+                file_id and may safely be retried after reaching the server,
+                defaults to False
+            managed (bool, optional): Set to False to bypass the rate limiter,
+                retry policy, hooks and client stats, as library metrics do,
+                defaults to True
+            model_id (str, optional): Model the request is for, reported to
+                hooks, defaults to None
+            kwargs (dict): Passed through to requests.Session.post
+        Returns:
+            Response: Response from the post request
+        """
+        if not managed:
+            return self.session.post(url, **kwargs)
+        if self.client_stats is None:
+            return self._post(url, idempotent, model_id, kwargs)
+
+        endpoint = urlsplit(url).path
+        start = self.client_stats._start(endpoint)
+        try:
+            response = self._post(url, idempotent, model_id, kwargs)
+        except Exception as e:
+            self.client_stats._finish(endpoint, start, type(e).__name__)
+            raise
+        code = response.status_code if response.status_code >= 400 else None
+        self.client_stats._finish(endpoint, start, code, _body_size(response.request),
+                                  _content_size(response, kwargs.get("stream")))
+        return response
+
+
+    def _post(self, url: str, idempotent: bool, model_id: str, kwargs: dict) -> "requests.Response":
+        """Sends a managed request through compression, hooks, rate limiting and retries."""
+        start = time.perf_counter()
+        if self.compression is not None and kwargs.get("json") is not None:
+            data, headers = _compress_json(kwargs.pop("json"), self.compression, self.compression_threshold)
+            kwargs["data"] = data
+            kwargs["headers"] = (kwargs.get("headers") or {}) | headers
+        if self.hooks is not None:
+            kwargs = self._timed_body(kwargs)
+
+        body = kwargs.get("data")
+        event = {"endpoint": urlsplit(url).path, "model_id": model_id}
+        prepare = time.perf_counter() - start
+
+        def send(attempt=0):
+            if attempt and hasattr(body, "rewind"):
+                body.rewind()
+            if self.hooks is not None:
+                return self._send_observed(url, kwargs, event | {"attempt": attempt}, prepare)
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(self.rate_limit_key)
+            return self.session.post(url, **kwargs)
+
+        if self.retry_policy is None:
+            return send()
+        return self.retry_policy.call(urlsplit(url).path, send, idempotent)
+
+
+    def _timed_body(self, kwargs: dict) -> dict:
+        """Sends the body through a _TimedBody, so its upload can be timed."""
+        from .timing import _TimedBody
+
+        if kwargs.get("json") is not None:
+            kwargs["data"] = json.dumps(kwargs.pop("json"), allow_nan=False).encode()
+            kwargs["headers"] = {"Content-Type": "application/json"} | (kwargs.get("headers") or {})
+        data = kwargs.get("data")
+        if isinstance(data, bytes) or (hasattr(data, "read") and hasattr(data, "__len__")):
+            kwargs["data"] = _TimedBody(data)
+        return kwargs
+
+
+    def _send_observed(self, url: str, kwargs: dict, event: dict, prepare: float):
+        """Sends one attempt, reporting its progress and phase timings to hooks.
+
+        Timings are in seconds. prepare is spent serializing and compressing
+        the body, queue waiting on the rate limiter, connect opening a new
+        connection, upload writing the body, wait until the response
+        headers arrive and download reading the response body.
+        """
+        from .timing import _connect_time, _reset_connect_time
+
+        hooks, body = self.hooks, kwargs.get("data")
+        timings = {"prepare": prepare}
+        marks = {}
+
+        def report(**fields) -> dict:
+            sent = body.sent if hasattr(body, "sent") else 0
+            return event | {"bytes_sent": sent, "timings": dict(timings)} | fields
+
+        def uploaded():
+            marks["uploaded"] = time.perf_counter()
+            timings["connect"] = _connect_time()
+            timings["upload"] = max(0.0, marks["uploaded"] - marks["sent"] - timings["connect"])
+            hooks._emit("on_upload_complete", report())
+
+        def received(response, *args, **kwargs):
+            marks["received"] = time.perf_counter()
+            return response
+
+        start = time.perf_counter()
+        hooks._emit("on_request_start", report())
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(self.rate_limit_key)
+        marks["sent"] = time.perf_counter()
+        timings["queue"] = marks["sent"] - start
+        _reset_connect_time()
+        if hasattr(body, "on_complete"):
+            body.on_complete = uploaded
+
+        try:
+            response = self.session.post(url, hooks={"response": received}, **kwargs)
+        except Exception as e:
+            timings["total"] = time.perf_counter() - start
+            hooks._emit("on_error", report(error=e))
+            raise
+
+        end = time.perf_counter()
+        if "uploaded" not in marks:
+            # Bodyless requests, and transports that never read the body
+            uploaded()
+        received_at = marks.get("received", end)
+        timings["wait"] = max(0.0, received_at - marks["uploaded"])
+        timings["download"] = end - received_at
+        timings["total"] = end - start
+        size = None if kwargs.get("stream") else len(response.content)
+        hooks._emit("on_response", report(status=response.status_code, bytes_received=size))
+        return response
+
+
+    def deduplicate(self, key, func):
+        """Runs func, sharing it with identical concurrent calls if enabled.
+
+        Args:
+            key (str): Request fingerprint, or None to always run func
+            func (callable): Makes the request and returns its result
+        Returns:
+            The result of func
+        """
+        if self.flights is None or key is None:
+            return func()
+        return self.flights.do(key, func)
+
+
+    def close(self):
+        """Closes all pooled connections held by this process."""
+        with self._lock:
+            if self._session is not None and self._pid == os.getpid():
+                self._session.close()
+            self._session = None
+            self._pid = None
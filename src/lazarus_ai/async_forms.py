@@ -0,0 +1,101 @@
+"""Class: AsyncForms
+
+Posts requests to forms/ endpoints without blocking the event loop.
+Requires an AsyncLazarusAuth instance on initialization. Including the
+optional model_id argument will create a custom AsyncForms instance, using
+the model corresponding to the model_id over the generic Forms model.
+"""
+
+import os
+
+from .async_lazarus_auth import AsyncLazarusAuth, _open_upload, _stream_upload
+from .responses import FormsResult
+
+from . import _utils
+from ._utils.config import BASE_URL
+
+
+class AsyncForms:
+    """A class to post asyncio requests to all forms/ endpoints."""
+
+    def __init__(self, auth: AsyncLazarusAuth, model_id=None, typed_results: bool = False):
+        """Initialize an AsyncForms() object.
+
+        Without model_id, creates an AsyncForms() object that uses the generic
+        forms model. With model_id, creates an AsyncForms() object that uses
+        the custom model corresponding to the model_id.
+
+        Args:
+            auth (AsyncLazarusAuth): Holds auth headers and the pooled client
+            model_id (str, optional): Custom model ID, defaults to None
+            typed_results (bool, optional): Return FormsResult objects instead of
+                dicts, defaults to False
+        """
+        self.auth = auth
+        self.headers = auth.headers
+        self.model_id = model_id
+        self.typed_results = typed_results
+
+
+    async def run_ocr(self, input_type, input_str, **kwargs):
+        """Posts a request to the relevant forms/ endpoint.
+
+        If the AsyncForms instance was not initialized with a model_id, we
+        post to the api/forms/generic endpoint. If a model_id was supplied on
+        init, we post to the api/forms/custom/{model_id} endpoint.
+
+        Args:
+            input_type (str): Type of input expected [FILE_PATH, URL, BASE64]
+            input_str (str): File to upload, expecting a file path, url, or a base64 encoded string
+            kwargs (dict, optional): Must include at least one of the following fields
+                file_id (str): Custom ID for the uploaded document
+                metadata (dict): Data to be returned in the response
+                webhook (str): Webhook to ping after call to API
+        """
+        kwargs = _utils._OCR_ARGS.validate(kwargs)
+
+        if self.model_id is not None:
+            url = f"{BASE_URL}/api/forms/custom/{self.model_id}"
+        else:
+            url = f"{BASE_URL}/api/forms/generic"
+
+        headers = self.headers | _utils._get_typed_headers(input_type)
+
+        if input_type == "FILE_PATH":
+            with await _open_upload(_utils._MultipartFileStream, input_str, kwargs) as body:
+                headers |= {"Content-Type": body.content_type, "Content-Length": str(len(body))}
+                response = await self.auth.post(url, headers=headers, content=_stream_upload(body))
+        else:
+            data = _utils._get_typed_body(input_type, input_str)
+            response = await self.auth.post(url, headers=headers, json=data | kwargs)
+
+        if response.is_success:
+            resp = _utils._decode_response(response)
+            _utils._record_metrics("forms", self.headers, self.model_id, resp)
+            return self._result(resp)
+
+        _utils._record_metrics("forms", self.headers, self.model_id)
+        _utils._error_handling(response)
+
+
+    def _result(self, resp: dict):
+        """Wraps a response in FormsResult if typed results are enabled."""
+        return FormsResult(resp) if self.typed_results else resp
+
+
+# AsyncForms class usage examples
+if __name__ == "__main__":
+    import asyncio
+
+    async def main():
+        # Create an AsyncLazarusAuth object with your org ID and auth key
+        org_id = os.environ.get("LAZARUS_ORG_ID")
+        auth_key = os.environ.get("LAZARUS_AUTH_KEY")
+        async with AsyncLazarusAuth(org_id, auth_key, max_in_flight=32) as auth:
+            forms = AsyncForms(auth)
+
+            # Run many documents concurrently over the shared connection pool
+            urls = ["https://fileurl.com/1.pdf", "https://fileurl.com/2.pdf"]
+            responses = await asyncio.gather(*(forms.run_ocr("URL", url) for url in urls))
+
+    asyncio.run(main())
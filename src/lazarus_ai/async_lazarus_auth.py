@@ -0,0 +1,184 @@
+"""Class: AsyncLazarusAuth
+
+AsyncLazarusAuth is the asyncio counterpart of LazarusAuth. It holds a
+user's Lazarus login credentials and owns a pooled, non-blocking HTTP
+client which is shared by AsyncForms and AsyncRikAI instances.
+
+A semaphore bounds the number of requests in flight at once across every
+object sharing the auth instance. The httpx package is required and can be
+installed with `pip install lazarus-ai[async]`.
+"""
+
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
+
+from .client_stats import ClientStats
+from . import _utils
+from .errors import InvalidAuthError
+from ._utils.config import BASE_URL
+
+# Seconds a request may take before it fails, OCR of long documents is slow
+DEFAULT_TIMEOUT = 300.0
+
+if TYPE_CHECKING:
+    import asyncio
+
+
+def _import_httpx():
+    """Imports httpx, raising a helpful error if it is not installed."""
+    try:
+        import httpx
+    except ImportError as e:
+        raise ImportError("The async client requires httpx. Install it with `pip install lazarus-ai[async]`.") from e
+    return httpx
+
+
+async def _open_upload(body_class, path: str, fields: dict):
+    """Opens a streamed FILE_PATH request body on a worker thread.
+
+    Args:
+        body_class (type): _MultipartFileStream or _Base64JSONStream
+        path (str): File path
+        fields (dict): Fields sent along with the file
+    Returns:
+        The opened body, to be closed once the request is sent
+    """
+    import asyncio
+
+    return await asyncio.to_thread(body_class, path, fields)
+
+
+async def _stream_upload(body):
+    """Yields a streamed request body, reading each chunk on a worker thread.
+
+    Like the sync client, only one chunk of the file is held in memory at a
+    time, and the event loop never waits on the disk.
+    """
+    import asyncio
+
+    while chunk := await asyncio.to_thread(body.read):
+        yield chunk
+
+
+class AsyncLazarusAuth:
+    """A class to validate and store Lazarus auth credentials for asyncio."""
+
+    def __init__(self, org_id: str, auth_key: str, max_connections: int = 100,
+                 max_keepalive_connections: int = 20, max_in_flight: int = 64, client_stats=None,
+                 timeout=DEFAULT_TIMEOUT):
+        """Initialize an AsyncLazarusAuth() object.
+
+        Unlike LazarusAuth, credentials cannot be checked from __init__.
+        Use `async with AsyncLazarusAuth(...) as auth` or await
+        authenticate() to validate them.
+
+        Args:
+            org_id (str): Lazarus organization ID
+            auth_key (str): Lazarus authentication key
+            max_connections (int, optional): Maximum number of open
+                connections in the pool, defaults to 100
+            max_keepalive_connections (int, optional): Maximum number of idle
+                connections kept alive, defaults to 20
+            max_in_flight (int, optional): Maximum number of concurrent
+                requests, defaults to 64
+            client_stats (ClientStats, optional): Aggregates to record
+                requests in, shared with other auth instances, defaults to
+                a new ClientStats
+            timeout (float | httpx.Timeout, optional): Seconds before a
+                request fails with httpx.TimeoutException, None waits
+                forever, defaults to DEFAULT_TIMEOUT
+        """
+        if not org_id or not auth_key:
+            raise ValueError("Cannot initialize with an empty string.")
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1.")
+        _import_httpx()
+        self.headers = {"orgId": org_id, "authKey": auth_key}
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.client_stats = client_stats if client_stats is not None else ClientStats()
+        self._client = None
+        self._semaphore = None
+
+
+    @property
+    def client(self):
+        """Returns the pooled httpx.AsyncClient, creating it if needed."""
+        if self._client is None:
+            httpx = _import_httpx()
+            limits = httpx.Limits(max_connections=self.max_connections,
+                                  max_keepalive_connections=self.max_keepalive_connections)
+            self._client = httpx.AsyncClient(limits=limits, timeout=self.timeout)
+        return self._client
+
+
+    @property
+    def semaphore(self) -> "asyncio.Semaphore":
+        """Returns the semaphore bounding in-flight requests."""
+        if self._semaphore is None:
+            import asyncio
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        return self._semaphore
+
+
+    async def post(self, url: str, **kwargs):
+        """Posts a request over the pooled client, bounded by the semaphore.
+
+        The request is recorded in client_stats once it returns or raises.
+
+        Args:
+            url (str): Request URL
+            kwargs (dict): Passed through to httpx.AsyncClient.post
+        Returns:
+            httpx.Response: Response from the post request
+        """
+        endpoint = urlsplit(url).path
+        start = self.client_stats._start(endpoint)
+        try:
+            async with self.semaphore:
+                response = await self.client.post(url, **kwargs)
+        except Exception as e:
+            self.client_stats._finish(endpoint, start, type(e).__name__)
+            raise
+        code = response.status_code if response.status_code >= 400 else None
+        self.client_stats._finish(endpoint, start, code, int(response.request.headers.get("Content-Length", 0)),
+                                  len(response.content))
+        return response
+
+
+    async def authenticate(self):
+        """Authenticates Org ID and Auth Key.
+
+        Posts a request to an API endpoint with no body. If the response
+        is an AUTH_FAILURE with status code 403, we raise an error. Users
+        will not be charged for this call as no pages are processed.
+
+        Raises:
+            InvalidAuthError
+        """
+        res = await self.post(f"{BASE_URL}/api/forms/generic", headers=self.headers)
+
+        if res.status_code == 403:
+            raise InvalidAuthError("Invalid org ID or auth key. Authentication failed.")
+
+
+    async def aclose(self):
+        """Closes the pooled client and all of its connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+    async def __aenter__(self):
+        try:
+            await self.authenticate()
+        except BaseException:
+            await self.aclose()
+            raise
+        return self
+
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
@@ -0,0 +1,142 @@
+"""Class: AsyncRikAI
+
+Posts requests to api/rikai/ endpoints without blocking the event loop.
+Requires an AsyncLazarusAuth instance on initialization. Including the
+optional model_id argument will create a custom AsyncRikAI instance, using
+the model corresponding to the model_id over the standard RikAI model.
+"""
+
+import os
+
+from .async_lazarus_auth import AsyncLazarusAuth, _open_upload, _stream_upload
+from .responses import RikAIResult
+
+from . import _utils
+from ._utils.config import BASE_URL
+
+
+class AsyncRikAI:
+    """A class to post asyncio requests to all rikai/ endpoints."""
+
+    def __init__(self, auth: AsyncLazarusAuth, model_id=None, typed_results: bool = False):
+        """Initialize an AsyncRikAI() object.
+
+        Without model_id, creates an AsyncRikAI() object that uses the
+        standard RikAI model. With model_id, creates an AsyncRikAI() object
+        that uses the custom model corresponding to the model_id.
+
+        Args:
+            auth (AsyncLazarusAuth): Holds auth headers and the pooled client
+            model_id (str, optional): Custom model ID, defaults to None
+            typed_results (bool, optional): Return RikAIResult objects instead of
+                dicts, defaults to False
+        """
+        self.auth = auth
+        self.headers = auth.headers
+        self.model_id = model_id
+        self.typed_results = typed_results
+
+
+    async def ask_question(self, input_type: str, input_str: str, question: list, **kwargs):
+        """Posts a request to the relevant rikai/ endpoint.
+
+        If the AsyncRikAI instance was not initialized with a model_id, we
+        post to the api/rikai endpoint. If a model_id was supplied on init,
+        we post to the api/rikai/custom/{model_id} endpoint.
+
+        Args:
+            input_type (str): Type of input expected [FILE_PATH, URL, BASE64]
+            input_str (str): File to upload, expecting a file path, url, or a base64 encoded string
+            question (list): A list of strings containing the question(s) to be asked
+            kwargs (dict, optional): Must include at least one of the following fields
+                file_id (str): Custom ID for the uploaded document
+                metadata (dict): Data to be returned in the response
+                webhook (str): Webhook to ping after call to API
+                settings (dict): User settings specified in the request, for custom RikAI only
+                return_ocr (bool): Set to True to add OCR results to the response, defaults to False
+                language (str): A 2 character language code or the name of the language you wish to translate answers into
+        """
+        url = f"{BASE_URL}/api/rikai"
+        validator = _utils._QUESTION_ARGS
+        if self.model_id is not None:
+            url += f"/custom/{self.model_id}"
+            validator = _utils._CUSTOM_QUESTION_ARGS
+
+        kwargs = validator.validate(kwargs)
+
+        headers = self.headers | _utils._get_typed_headers(input_type)
+
+        if input_type == "FILE_PATH":
+            with await _open_upload(_utils._MultipartFileStream, input_str, {"question": question} | kwargs) as body:
+                headers |= {"Content-Type": body.content_type, "Content-Length": str(len(body))}
+                response = await self.auth.post(url, headers=headers, content=_stream_upload(body))
+        else:
+            body = _utils._get_typed_body(input_type, input_str) | {"question": question} | kwargs
+            response = await self.auth.post(url, headers=headers, json=body)
+
+        if response.is_success:
+            resp = _utils._decode_response(response)
+            _utils._record_metrics("rikai", self.headers, self.model_id, resp)
+            return self._result(resp)
+
+        _utils._record_metrics("rikai", self.headers, self.model_id)
+        _utils._error_handling(response)
+
+
+    async def summarize(self, input_type: str, input_str: str, fields: dict):
+        """Posts a request to the rikai/summarize endpoint.
+
+        FILE_PATH inputs are base64 encoded while the request is sent, so
+        the file is never held in memory in full.
+
+        Args:
+            input_type (str): Type of input expected [FILE_PATH, URL, BASE64]
+            input_str (str): File to upload, expecting a file path, url, or a base64 encoded string
+            fields (dict): Required fields to prompt the summarizer
+                document_type (str): Type of document to summarize
+                summary_description (str): Description of what information should be included in the summary
+                secondary_description (str, optional): A secondary summary description, including this will return a secondary summary
+                json_format (str, optional): Specify a JSON output structure, content will be pulled from the resulting summary description
+        """
+        url = f"{BASE_URL}/api/rikai/summarize"
+        fields = _utils._SUMMARIZE_FIELDS.validate(fields)
+
+        headers = self.headers | _utils._get_typed_headers(input_type)
+
+        if input_type == "FILE_PATH":
+            with await _open_upload(_utils._Base64JSONStream, input_str, {"fields": fields}) as body:
+                headers |= {"Content-Type": body.content_type, "Content-Length": str(len(body))}
+                response = await self.auth.post(url, headers=headers, content=_stream_upload(body))
+        else:
+            body = _utils._get_typed_body(input_type, input_str) | {"fields": fields}
+            response = await self.auth.post(url, headers=headers, json=body)
+
+        if response.is_success:
+            resp = _utils._decode_response(response)
+            _utils._record_metrics("rikai/summarizer", self.headers, self.model_id, resp)
+            return self._result(resp)
+
+        _utils._record_metrics("rikai/summarizer", self.headers, self.model_id)
+        _utils._error_handling(response)
+
+
+    def _result(self, resp: dict):
+        """Wraps a response in RikAIResult if typed results are enabled."""
+        return RikAIResult(resp) if self.typed_results else resp
+
+
+# AsyncRikAI class usage examples
+if __name__ == "__main__":
+    import asyncio
+
+    async def main():
+        # Create an AsyncLazarusAuth object with your org ID and auth key
+        org_id = os.environ.get("LAZARUS_ORG_ID")
+        auth_key = os.environ.get("LAZARUS_AUTH_KEY")
+        async with AsyncLazarusAuth(org_id, auth_key) as auth:
+            rikai = AsyncRikAI(auth)
+
+            questions = ["What is this document about?", "When was this document published?"]
+            response = await rikai.ask_question("URL", "https://fileurl.com", questions)
+
+    asyncio.run(main())
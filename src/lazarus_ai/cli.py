@@ -0,0 +1,239 @@
+"""Command line bulk processing: python -m lazarus_ai
+
+Runs Forms.run_ocr, or RikAI.ask_question when questions are given, on
+every document in the directories and glob patterns passed, on a thread
+pool sharing one connection pool. Only files whose extension is in
+FILE_EXTENSIONS are sent.
+
+Results are appended to a JSONL file as each document finishes, one
+object per line holding its path and either the response or the error.
+A manifest next to it records every finished document by path, size and
+modification time, so running the same command again after an
+interruption skips documents already processed. Documents that failed,
+or changed since, are sent again.
+
+Usage:
+    python -m lazarus_ai DIR_OR_GLOB [...] [-o results.jsonl] [--model MODEL_ID]
+        [-q QUESTION ...] [-c CONCURRENCY] [-r]
+
+Credentials are read from the LAZARUS_ORG_ID and LAZARUS_AUTH_KEY
+environment variables unless passed as options.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+from .forms import Forms
+from .lazarus_auth import LazarusAuth
+from .rikai import RikAI
+
+from . import _utils
+from ._utils.input_types import FILE_EXTENSIONS
+
+# Seconds between progress line updates
+PROGRESS_INTERVAL = 0.5
+
+
+def _find_documents(patterns: list, recursive: bool = False) -> list:
+    """Expands directories and glob patterns into supported document paths.
+
+    Args:
+        patterns (list): Directories, file paths or glob patterns
+        recursive (bool, optional): Descend into subdirectories of
+            directories, defaults to False
+    Returns:
+        list: Sorted, de-duplicated paths with an extension in FILE_EXTENSIONS
+    """
+    paths = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            if recursive:
+                found = (os.path.join(root, name) for root, _, names in os.walk(pattern) for name in names)
+            else:
+                found = (os.path.join(pattern, name) for name in os.listdir(pattern))
+        else:
+            found = glob.glob(pattern, recursive=True)
+        paths.update(path for path in found
+                     if os.path.splitext(path)[1] in FILE_EXTENSIONS and os.path.isfile(path))
+    return sorted(paths)
+
+
+def _document_key(path: str) -> str:
+    """Identifies a document version by absolute path, size and mtime.
+
+    Returns None for a file that can no longer be read, such as one
+    removed after it was found.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def _read_manifest(path: str) -> set:
+    """Returns the keys of documents recorded as done in a manifest.
+
+    A partially written last line, left by an interrupted run, is ignored.
+    """
+    done = set()
+    try:
+        with open(path, encoding="utf-8") as manifest:
+            for line in manifest:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if entry.get("ok"):
+                    done.add(entry["key"])
+                else:
+                    done.discard(entry["key"])
+    except FileNotFoundError:
+        pass
+    return done
+
+
+def _format_error(error: Exception) -> dict:
+    """Describes an APIError or ValidationError for the results file."""
+    return {"type": type(error).__name__, "message": getattr(error, "message", str(error)),
+            "code": getattr(error, "code", None)}
+
+
+class _Progress:
+    """Prints throughput and ETA on one stderr line, at most twice a second."""
+
+    def __init__(self, total: int, stream=None, enabled: bool = True):
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self.stream = stream or sys.stderr
+        self.enabled = enabled
+        self._start = time.monotonic()
+        self._printed = 0.0
+
+
+    def update(self, ok: bool):
+        self.done += 1
+        self.failed += not ok
+        now = time.monotonic()
+        if now - self._printed >= PROGRESS_INTERVAL or self.done == self.total:
+            self._printed = now
+            self.show(now)
+
+
+    def show(self, now: float = None):
+        if not self.enabled:
+            return
+        elapsed = (now or time.monotonic()) - self._start
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        if rate > 0:
+            eta = int((self.total - self.done) / rate)
+            eta = f"{eta // 3600}:{eta // 60 % 60:02d}:{eta % 60:02d}"
+        else:
+            eta = "--:--:--"
+        self.stream.write(f"\r{self.done}/{self.total} documents  {rate:.2f} docs/s  "
+                          f"ETA {eta}  {self.failed} failed ")
+        self.stream.flush()
+
+
+    def finish(self):
+        if self.enabled:
+            self.stream.write("\n")
+            self.stream.flush()
+
+
+def _parse_args(argv) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m lazarus_ai",
+                                     description="Run Forms OCR or RikAI questions on many documents.")
+    parser.add_argument("inputs", nargs="+", help="Directories, files or glob patterns of documents")
+    parser.add_argument("-o", "--output", default="results.jsonl", help="JSONL file results are appended to")
+    parser.add_argument("--manifest", help="Manifest of finished documents, defaults to OUTPUT.manifest")
+    parser.add_argument("--model", help="Custom model ID")
+    parser.add_argument("-q", "--question", action="append", help="Ask RikAI this question, may be repeated")
+    parser.add_argument("-c", "--concurrency", type=int, default=8, help="Documents sent at once")
+    parser.add_argument("-r", "--recursive", action="store_true", help="Search directories recursively")
+    parser.add_argument("--org-id", default=os.environ.get("LAZARUS_ORG_ID"), help="Lazarus organization ID")
+    parser.add_argument("--auth-key", default=os.environ.get("LAZARUS_AUTH_KEY"), help="Lazarus auth key")
+    parser.add_argument("--quiet", action="store_true", help="Do not print progress")
+    args = parser.parse_args(argv)
+    if not args.org_id or not args.auth_key:
+        parser.error("set LAZARUS_ORG_ID and LAZARUS_AUTH_KEY, or pass --org-id and --auth-key")
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    return args
+
+
+def main(argv=None) -> int:
+    """Runs the bulk CLI.
+
+    Args:
+        argv (list, optional): Arguments, defaults to sys.argv[1:]
+    Returns:
+        int: 0 if every document succeeded, 1 if any failed, 130 if
+            interrupted
+    """
+    args = _parse_args(argv)
+    manifest_path = args.manifest or f"{args.output}.manifest"
+    done = _read_manifest(manifest_path)
+    documents = []
+    for path in _find_documents(args.inputs, args.recursive):
+        key = _document_key(path)
+        if key is not None and key not in done:
+            documents.append((path, key))
+
+    auth = LazarusAuth(args.org_id, args.auth_key, pool_maxsize=args.concurrency)
+    if args.question:
+        rikai = RikAI(auth, model_id=args.model)
+        call = lambda input_type, input_str: rikai.ask_question(input_type, input_str, args.question)
+    else:
+        call = Forms(auth, model_id=args.model).run_ocr
+
+    progress = _Progress(len(documents), enabled=not args.quiet)
+    progress.show()
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    executor = ThreadPoolExecutor(args.concurrency)
+    pending = {}
+    remaining = iter(documents)
+    with open(args.output, "a", encoding="utf-8") as output, open(manifest_path, "a", encoding="utf-8") as manifest:
+
+        def record(future):
+            path, key = pending.pop(future)
+            result = future.result()
+            ok = not isinstance(result, Exception)
+            entry = {"path": path, "response": result} if ok else {"path": path, "error": _format_error(result)}
+            output.write(json.dumps(entry) + "\n")
+            output.flush()
+            # The result is written before the document is marked done
+            manifest.write(json.dumps({"key": key, "ok": ok}) + "\n")
+            manifest.flush()
+            progress.update(ok)
+
+        try:
+            while True:
+                # Keep a bounded window in flight rather than queueing every document
+                for path, key in remaining:
+                    pending[executor.submit(_utils._call_safely, call, "FILE_PATH", path, {})] = (path, key)
+                    if len(pending) >= args.concurrency * 2:
+                        break
+                if not pending:
+                    break
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    record(future)
+        except KeyboardInterrupt:
+            # Requests already sent are billed, so wait for them and keep their results
+            executor.shutdown(wait=True, cancel_futures=True)
+            for future in [future for future in pending if future.done() and not future.cancelled()]:
+                record(future)
+            progress.finish()
+            return 130
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    progress.finish()
+    return 1 if progress.failed else 0
@@ -0,0 +1,220 @@
+"""Class: ClientStats
+
+In-process aggregates of every request sent through a LazarusAuth
+instance: request counts, error counts by code, latency histograms and
+bytes sent and received, per endpoint path. Each LazarusAuth keeps one,
+and an instance can be shared by several to aggregate them together.
+
+A request is one Forms or RikAI call to the transport, including any
+retries, so its latency is what the caller waited. Error codes are the
+HTTP status of responses of 400 and above, matching APIError.code, or
+the exception class name when no response was received.
+
+Read the aggregates with stats(), render them in the Prometheus text
+format with render_prometheus(), or serve them for scraping with serve().
+"""
+
+import bisect
+import threading
+import time
+
+# Upper bounds of the latency buckets, in seconds
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _label(value) -> str:
+    """Escapes a Prometheus label value."""
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _number(value) -> str:
+    """Formats a sample value or bucket bound the way Prometheus does."""
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _EndpointStats:
+    """Counters for one endpoint, updated under the ClientStats lock."""
+
+    __slots__ = ("requests", "in_flight", "errors", "bytes_sent", "bytes_received", "buckets", "seconds")
+
+    def __init__(self, size: int):
+        self.requests = 0
+        self.in_flight = 0
+        self.errors = {}
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        # One count per bucket, plus one above the last bound
+        self.buckets = [0] * (size + 1)
+        self.seconds = 0.0
+
+
+class ClientStats:
+    """Thread-safe request aggregates with a Prometheus text exporter.
+
+    Attributes:
+        buckets (tuple): Upper bounds of the latency buckets, in seconds
+        url (str): Address metrics are served on, or None until serve()
+    """
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        """Initialize a ClientStats() object.
+
+        Args:
+            buckets (tuple, optional): Increasing upper bounds of the latency
+                histogram buckets, in seconds, defaults to DEFAULT_BUCKETS
+        """
+        buckets = tuple(float(bound) for bound in buckets)
+        if not buckets or list(buckets) != sorted(set(buckets)):
+            raise ValueError("buckets must be a non-empty, strictly increasing sequence.")
+        self.buckets = buckets
+        self.url = None
+        self._lock = threading.Lock()
+        self._endpoints = {}
+        self._server = None
+
+
+    def _endpoint(self, endpoint: str) -> _EndpointStats:
+        # Called with the lock held
+        stats = self._endpoints.get(endpoint)
+        if stats is None:
+            stats = self._endpoints[endpoint] = _EndpointStats(len(self.buckets))
+        return stats
+
+
+    def _start(self, endpoint: str) -> float:
+        """Records a request starting, returning its start time."""
+        with self._lock:
+            self._endpoint(endpoint).in_flight += 1
+        return time.perf_counter()
+
+
+    def _finish(self, endpoint: str, start: float, code=None, bytes_sent: int = 0, bytes_received: int = 0):
+        """Records a request finishing, counting an error if code is set."""
+        seconds = time.perf_counter() - start
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            stats = self._endpoint(endpoint)
+            stats.in_flight -= 1
+            stats.requests += 1
+            stats.buckets[index] += 1
+            stats.seconds += seconds
+            stats.bytes_sent += bytes_sent
+            stats.bytes_received += bytes_received
+            if code is not None:
+                stats.errors[code] = stats.errors.get(code, 0) + 1
+
+
+    def stats(self) -> dict:
+        """Returns a snapshot of the aggregates, keyed by endpoint path.
+
+        Each endpoint maps to its requests, in_flight, errors by code,
+        bytes_sent, bytes_received and a latency histogram holding the
+        count, sum in seconds and cumulative bucket counts keyed by upper
+        bound, ending with float("inf").
+        """
+        with self._lock:
+            endpoints = {endpoint: (stats.requests, stats.in_flight, dict(stats.errors), stats.bytes_sent,
+                                    stats.bytes_received, list(stats.buckets), stats.seconds)
+                         for endpoint, stats in self._endpoints.items()}
+
+        snapshot = {}
+        for endpoint, (requests, in_flight, errors, sent, received, counts, seconds) in endpoints.items():
+            cumulative, total = {}, 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                total += count
+                cumulative[bound] = total
+            snapshot[endpoint] = {
+                "requests": requests,
+                "in_flight": in_flight,
+                "errors": errors,
+                "bytes_sent": sent,
+                "bytes_received": received,
+                "latency": {"count": requests, "sum": seconds, "buckets": cumulative},
+            }
+        return snapshot
+
+
+    def render_prometheus(self) -> str:
+        """Returns the aggregates in the Prometheus text exposition format."""
+        snapshot = self.stats()
+        lines = []
+
+        def family(name: str, kind: str, description: str, samples):
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            for suffix, labels, value in samples:
+                rendered = ",".join(f'{key}="{_label(label)}"' for key, label in labels)
+                lines.append(f"{name}{suffix}{{{rendered}}} {_number(value)}")
+
+        endpoints = sorted(snapshot.items())
+        family("lazarus_requests_total", "counter", "Requests sent, including their retries.",
+               (("", [("endpoint", endpoint)], stats["requests"]) for endpoint, stats in endpoints))
+        family("lazarus_requests_in_flight", "gauge", "Requests waiting on a response.",
+               (("", [("endpoint", endpoint)], stats["in_flight"]) for endpoint, stats in endpoints))
+        family("lazarus_request_errors_total", "counter", "Failed requests by status code or exception.",
+               (("", [("endpoint", endpoint), ("code", code)], count) for endpoint, stats in endpoints
+                for code, count in sorted(stats["errors"].items(), key=lambda item: str(item[0]))))
+        family("lazarus_request_duration_seconds", "histogram", "Request latency in seconds.",
+               [sample for endpoint, stats in endpoints for sample in (
+                   [("_bucket", [("endpoint", endpoint), ("le", _number(bound))], count)
+                    for bound, count in stats["latency"]["buckets"].items()]
+                   + [("_sum", [("endpoint", endpoint)], stats["latency"]["sum"]),
+                      ("_count", [("endpoint", endpoint)], stats["latency"]["count"])])])
+        family("lazarus_request_bytes_sent_total", "counter", "Request body bytes sent.",
+               (("", [("endpoint", endpoint)], stats["bytes_sent"]) for endpoint, stats in endpoints))
+        family("lazarus_response_bytes_received_total", "counter", "Response body bytes received.",
+               (("", [("endpoint", endpoint)], stats["bytes_received"]) for endpoint, stats in endpoints))
+        return "\n".join(lines) + "\n"
+
+
+    def serve(self, port: int = 9464, host: str = "127.0.0.1") -> str:
+        """Serves render_prometheus() over HTTP from a daemon thread.
+
+        Every GET path returns the metrics, so /metrics works as scrapers
+        expect. http.server is only imported once this is called.
+
+        Args:
+            port (int, optional): Port to listen on, 0 picks a free one,
+                defaults to 9464
+            host (str, optional): Interface to bind, defaults to "127.0.0.1"
+        Returns:
+            str: URL the metrics are served on
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        stats = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = stats.render_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        with self._lock:
+            if self._server is not None:
+                raise RuntimeError("ClientStats is already being served.")
+            self._server = ThreadingHTTPServer((host, port), Handler)
+            self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="lazarus-client-stats", daemon=True).start()
+        self.url = f"http://{host}:{self._server.server_port}/metrics"
+        return self.url
+
+
+    def close(self):
+        """Stops serving metrics, if serve() was called."""
+        with self._lock:
+            server, self._server = self._server, None
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+        self.url = None
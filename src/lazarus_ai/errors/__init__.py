@@ -0,0 +1,2 @@
+from .api_errors import APIError, AuthError, CircuitOpenError, PartialResultError
+from .library_errors import ValidationError, InvalidAuthError
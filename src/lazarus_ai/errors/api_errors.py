@@ -38,3 +38,22 @@ class APIError(Exception):
 
 class AuthError(APIError):
     """Raised when API encounters an Authentication Failure """
+
+
+class CircuitOpenError(APIError):
+    """Raised when requests to a failing endpoint are short-circuited """
+
+
+class PartialResultError(APIError):
+    """Raised when some chunks of a split document fail
+
+    Attributes:
+        completed (dict): Responses of the chunks that succeeded, keyed by
+            (first page, last page)
+        failed (dict): Errors of the chunks that failed, keyed the same way
+    """
+
+    def __init__(self, message, completed, failed):
+        super().__init__("FAILURE", message, None)
+        self.completed = completed
+        self.failed = failed
@@ -6,24 +6,26 @@ will create a custom Forms instance, using the model corresponding to
 the model_id over the generic Forms model.
 """
 
-import sys
+import contextlib
 import os
-import requests
+import time
 
+from .image_preprocessor import ImagePreprocessor
 from .lazarus_auth import LazarusAuth
+from .responses import FormsResult
+from .result_cache import ResultCache
+from .webhook_listener import WebhookListener
 
-parent_dir = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
-sys.path.append(parent_dir)
-
-import utils
-
-BASE_URL = os.environ.get("BASE_URL", "https://api.lazarusforms.com/")
+from . import _utils
+from .errors import PartialResultError, ValidationError
+from ._utils.config import BASE_URL
 
 
 class Forms:
     """A class to post requests to all forms/ endpoints."""
 
-    def __init__(self, auth: LazarusAuth, model_id=None):
+    def __init__(self, auth: LazarusAuth, model_id=None, cache: ResultCache = None, typed_results: bool = False,
+                 preprocessor: ImagePreprocessor = None):
         """Initialize a Forms() object.
 
         Without model_id, creates a Forms() object that uses the generic
@@ -33,9 +35,19 @@ class Forms:
         Args:
             auth (LazarusAuth): Holds authenticated header information
             model_id (str, optional): Custom model ID, defaults to None
+            cache (ResultCache, optional): Serves repeated requests for the
+                same document and arguments locally, defaults to None
+            typed_results (bool, optional): Return FormsResult objects instead of
+                dicts, defaults to False
+            preprocessor (ImagePreprocessor, optional): Shrinks FILE_PATH
+                and BASE64 images before upload, defaults to None
         """
         self.headers = auth.headers
+        self.transport = auth.transport
         self.model_id = model_id
+        self.cache = cache
+        self.typed_results = typed_results
+        self.preprocessor = preprocessor
 
 
     def run_ocr(self, input_type, input_str, **kwargs):
@@ -53,29 +65,232 @@ class Forms:
                 metadata (dict): Data to be returned in the response
                 webhook (str): Webhook to ping after call to API
         """
-        possible_kwargs = ["file_id", "metadata", "webhook"]
-        kwargs = utils._validate_args(kwargs, possible_kwargs)
+        url, headers, kwargs = self._prepare_ocr(input_type, kwargs)
+
+        request_key = self._request_key(url, input_type, input_str, kwargs)
+        if self.cache is not None and request_key is not None and (cached := self.cache.get(request_key)) is not None:
+            return self._result(cached)
+        return self._result(self.transport.deduplicate(
+            request_key, lambda: self._send_ocr(url, headers, input_type, input_str, kwargs, request_key)))
+
+
+    def run_ocr_stream(self, input_type, input_str, **kwargs):
+        """Posts a request to the relevant forms/ endpoint, streaming the OCR pages.
+
+        The response body is parsed as it arrives. Iterating over the
+        returned stream yields each page of "ocrResults" as soon as it has
+        been received, so peak memory is bounded by a single page. The other
+        response fields are available as stream.result once iteration has
+        finished. Streamed requests bypass the result cache and single-flight.
+
+        Args:
+            input_type (str): Type of input expected [FILE_PATH, URL, BASE64]
+            input_str (str): File to upload, expecting a file path, url, or a base64 encoded string
+            kwargs (dict, optional): Optional run_ocr arguments
+        Returns:
+            _PageStream: Iterable of page dicts, closed once exhausted or on close()
+        """
+        url, headers, kwargs = self._prepare_ocr(input_type, kwargs)
+        response = self._post_ocr(url, headers, input_type, input_str, kwargs, stream=True)
+
+        if response.ok:
+            return _utils._PageStream(response, on_complete=lambda result: _utils._record_metrics(
+                "forms", self.headers, self.model_id, result, transport=self.transport))
+
+        _utils._record_metrics("forms", self.headers, self.model_id, transport=self.transport)
+        _utils._error_handling(response)
+
+
+    def _prepare_ocr(self, input_type: str, kwargs: dict):
+        """Validates run_ocr arguments, returning the url, headers and API kwargs."""
+        kwargs = _utils._OCR_ARGS.validate(kwargs)
 
         if self.model_id is not None:
             url = f"{BASE_URL}/api/forms/custom/{self.model_id}"
         else:
             url = f"{BASE_URL}/api/forms/generic"
 
-        headers = self.headers | utils._get_typed_headers(input_type)
-        data = utils._get_typed_body(input_type, input_str)
+        headers = self.headers | _utils._get_typed_headers(input_type)
+        return url, headers, kwargs
+
+
+    def _post_ocr(self, url: str, headers: dict, input_type: str, input_str: str, kwargs: dict, stream: bool = False):
+        """Posts a validated OCR request and returns the raw response."""
+        with self._preprocessed(input_type, input_str) as (input_type, input_str):
+            if input_type == "FILE_PATH":
+                # Stream the file from disk, closing it as soon as the request ends
+                with _utils._MultipartFileStream(input_str, kwargs) as body:
+                    headers |= {"Content-Type": body.content_type}
+                    return self.transport.post(url, model_id=self.model_id, headers=headers, data=body, idempotent="fileId" in kwargs, stream=stream)
+
+            data = _utils._get_typed_body(input_type, input_str)
+            return self.transport.post(url, model_id=self.model_id, headers=headers, json=data | kwargs, idempotent="fileId" in kwargs, stream=stream)
 
-        if input_type == "FILE_PATH":
-            response = requests.post(url, headers=headers, files=data, data=kwargs)
-        else:
-            response = requests.post(url, headers=headers, json=data | kwargs)
+
+    def _preprocessed(self, input_type: str, input_str: str):
+        """Returns a context manager yielding the input to upload, preprocessed if enabled."""
+        if self.preprocessor is None:
+            return contextlib.nullcontext((input_type, input_str))
+        return self.preprocessor.prepare(input_type, input_str)
+
+
+    def _send_ocr(self, url: str, headers: dict, input_type: str, input_str: str, kwargs: dict, request_key: str):
+        """Sends a validated OCR request and caches its response."""
+        start = time.monotonic()
+        response = self._post_ocr(url, headers, input_type, input_str, kwargs)
 
         if response.ok:
-            resp = response.json()
-            utils._record_metrics("forms", self.headers, self.model_id, resp)
+            resp = _utils._decode_response(response)
+            _utils._record_metrics("forms", self.headers, self.model_id, resp, transport=self.transport)
+            if self.cache is not None and request_key is not None:
+                self.cache.set(request_key, resp, time.monotonic() - start)
             return resp
 
-        utils._record_metrics("forms", self.headers, self.model_id)
-        utils._error_handling(response)
+        _utils._record_metrics("forms", self.headers, self.model_id, transport=self.transport)
+        _utils._error_handling(response)
+
+
+    def submit_ocr(self, listener, input_type, input_str, timeout: float = None, **kwargs):
+        """Submits a document in webhook mode and returns a Future.
+
+        The Future is returned at once. The request is sent on the
+        listener's send pool with the listener's URL as the webhook and a
+        file_id, generated unless one is supplied. The Future resolves with
+        the webhook payload when the matching callback arrives, or fails
+        with the APIError or ValidationError if the request is not accepted.
+
+        Args:
+            listener (WebhookListener): A started listener receiving callbacks
+            input_type (str): Type of input expected [FILE_PATH, URL, BASE64]
+            input_str (str): File to upload, expecting a file path, url, or a base64 encoded string
+            timeout (float, optional): Seconds before the Future fails with
+                TimeoutError, defaults to the listener's default_timeout
+            kwargs (dict, optional): Optional run_ocr arguments, except webhook
+        Returns:
+            Future: Resolves with the webhook payload
+        """
+        if "webhook" in kwargs:
+            raise ValidationError("submit_ocr sets the webhook to the listener's URL.")
+        send = lambda file_id: self.run_ocr(input_type, input_str, file_id=file_id, webhook=listener.url, **kwargs)
+        return listener.submit(send, kwargs.pop("file_id", None), timeout)
+
+
+    def _result(self, resp: dict):
+        """Wraps a response in FormsResult if typed results are enabled."""
+        return FormsResult(resp) if self.typed_results else resp
+
+
+    def _request_key(self, url: str, input_type: str, input_str: str, params: dict):
+        """Returns the fingerprint used to cache or de-duplicate a request.
+
+        Returns None when neither a cache nor single-flight is enabled, as
+        fingerprinting a file reads it in full. Requests with a webhook are
+        never cached or shared, as serving them locally would skip the
+        webhook call.
+        """
+        if (self.cache is None and self.transport.flights is None) or "webhook" in params:
+            return None
+        return _utils._fingerprint(url, self.model_id, input_type, input_str, params)
+
+
+    def run_ocr_batch(self, inputs, max_workers: int = 8, progress_callback=None) -> list:
+        """Runs run_ocr on many documents in parallel.
+
+        Calls are made on a managed thread pool sharing this instance's
+        connection pool. Results are returned in input order. A failed
+        document does not abort the batch, its APIError or ValidationError
+        is returned in place of the response.
+
+        Args:
+            inputs (iterable): Tuples of (input_type, input_str) or
+                (input_type, input_str, kwargs), where kwargs holds the
+                optional run_ocr arguments for that document
+            max_workers (int, optional): Number of worker threads, defaults to 8
+            progress_callback (callable, optional): Called as
+                progress_callback(completed, total) after each document
+                finishes, defaults to None
+        Returns:
+            list: A response dict or an error object for every input
+        """
+        return _utils._run_batch(self.run_ocr, inputs, max_workers, progress_callback)
+
+
+    def run_ocr_split(self, input_type, input_str, pages_per_chunk: int = 20, max_workers: int = 8,
+                      chunk_retries: int = 2, completed: dict = None, **kwargs):
+        """Runs run_ocr on a large PDF in page chunks sent in parallel.
+
+        The PDF is split into chunks of pages_per_chunk pages, which are
+        submitted concurrently. Their responses are merged into one response
+        with pages numbered from the start of the whole document, so the
+        result looks like that of a single run_ocr call. Documents that are
+        not PDFs, or have no more than pages_per_chunk pages, are sent with
+        run_ocr as they are.
+
+        A failed chunk is resubmitted on its own, up to chunk_retries times.
+        If chunks still fail, a PartialResultError is raised. Its completed
+        attribute can be passed back as completed to resubmit only the
+        chunks that failed.
+
+        Args:
+            input_type (str): Type of input expected [FILE_PATH, BASE64]
+            input_str (str): PDF to upload, expecting a file path or a base64 encoded string
+            pages_per_chunk (int, optional): Pages per request, defaults to 20
+            max_workers (int, optional): Chunks sent at once, defaults to 8
+            chunk_retries (int, optional): Times a failed chunk is
+                resubmitted, defaults to 2
+            completed (dict, optional): Chunk responses from a previous
+                PartialResultError, defaults to None
+            kwargs (dict, optional): Optional run_ocr arguments, except webhook.
+                A file_id is suffixed with the page range of each chunk.
+        Returns:
+            dict: The merged response
+        """
+        if "webhook" in kwargs:
+            raise ValidationError("run_ocr_split does not support webhooks.")
+        if input_type not in ("FILE_PATH", "BASE64"):
+            raise ValidationError("run_ocr_split expects a FILE_PATH or BASE64 input.")
+        if pages_per_chunk < 1:
+            raise ValueError("pages_per_chunk must be at least 1.")
+
+        data = _utils._read_pdf(input_type, input_str)
+        chunks = _utils._split_pdf(data, pages_per_chunk) if data is not None else []
+        if len(chunks) <= 1:
+            return self.run_ocr(input_type, input_str, **kwargs)
+
+        def run_chunk(input_type, input_str, **chunk_kwargs):
+            result = self.run_ocr(input_type, input_str, **chunk_kwargs)
+            return result.raw if isinstance(result, FormsResult) else result
+
+        file_id = kwargs.pop("file_id", None)
+        completed = dict(completed or {})
+        failed = {}
+        for _ in range(chunk_retries + 1):
+            pending = [(first, last, chunk) for first, last, chunk in chunks if (first, last) not in completed]
+            if not pending:
+                break
+            inputs = [
+                ("BASE64", chunk, kwargs | ({"file_id": f"{file_id}:{first}-{last}"} if file_id else {}))
+                for first, last, chunk in pending
+            ]
+            results = _utils._run_batch(run_chunk, inputs, max_workers)
+            failed = {}
+            for (first, last, _), result in zip(pending, results):
+                if isinstance(result, Exception):
+                    failed[(first, last)] = result
+                else:
+                    completed[(first, last)] = result
+            if any(isinstance(error, ValidationError) for error in failed.values()):
+                # Invalid arguments fail every chunk alike, resubmitting cannot help
+                break
+
+        if failed:
+            ranges = ", ".join(f"{first}-{last}" for first, last in sorted(failed))
+            raise PartialResultError(f"Pages {ranges} failed.", completed, failed)
+
+        merged = _utils._merge_split_results([(first, completed[(first, last)]) for first, last, _ in chunks])
+        if file_id:
+            merged["documentId"] = file_id
+        return self._result(merged)
 
 
 # Forms class usage examples
@@ -105,3 +320,42 @@ if __name__ == "__main__":
     }
     forms.run_ocr("URL", "https://fileurl.com", **kwargs)
     forms.run_ocr("URL", "https://fileurl.com", file_id="filename", metadata={"foo": "bar"}, webhook="https://pingme.com")
+
+    # Submit documents in webhook mode, the futures resolve as callbacks arrive
+    with WebhookListener(host="0.0.0.0", port=8080, public_url="https://myhost.com:8080/lazarus-webhook") as listener:
+        futures = [forms.submit_ocr(listener, "URL", url, timeout=600) for url in ["https://fileurl.com"]]
+        responses = [future.result() for future in futures]
+
+    # Serve repeated requests for the same document from a result cache
+    cached_forms = Forms(auth, cache=ResultCache(ttl=24 * 60 * 60, path="/path/to/cache.sqlite"))
+    response = cached_forms.run_ocr("FILE_PATH", "/path/to/file.pdf")
+    response = cached_forms.run_ocr("FILE_PATH", "/path/to/file.pdf")
+    print(cached_forms.cache.stats())
+
+    # Upload many files in parallel, errors are returned in place of responses
+    inputs = [("FILE_PATH", "/path/to/file.pdf"), ("URL", "https://fileurl.com", {"file_id": "filename"})]
+    responses = forms.run_ocr_batch(inputs, max_workers=16, progress_callback=lambda done, total: print(f"{done}/{total}"))
+
+    # Return typed results, building pages and fields only when accessed
+    typed_forms = Forms(auth, typed_results=True)
+    result = typed_forms.run_ocr("URL", "https://fileurl.com")
+    fields = {field.key: field.value for field in result.fields}
+
+    # Stream the OCR pages of a large document as they arrive
+    with forms.run_ocr_stream("FILE_PATH", "/path/to/large_file.pdf") as stream:
+        for page in stream:
+            print(page["page"])
+    print(stream.result["status"])
+
+    # Downscale and recompress scanned images before they are uploaded
+    with ImagePreprocessor(max_dpi=200, grayscale=True, on_document=print) as preprocessor:
+        scan_forms = Forms(auth, preprocessor=preprocessor)
+        response = scan_forms.run_ocr("FILE_PATH", "/path/to/scan.png")
+        print(preprocessor.stats())
+
+    # Split a long PDF into 25 page chunks sent in parallel, resubmitting only chunks that failed
+    try:
+        response = forms.run_ocr_split("FILE_PATH", "/path/to/long_file.pdf", pages_per_chunk=25, file_id="filename")
+    except PartialResultError as e:
+        response = forms.run_ocr_split("FILE_PATH", "/path/to/long_file.pdf", pages_per_chunk=25,
+                                       file_id="filename", completed=e.completed)
@@ -0,0 +1,169 @@
+"""Class: ImagePreprocessor
+
+An optional stage that shrinks image documents before they are uploaded.
+Pass an instance to Forms or RikAI on initialization and FILE_PATH and
+BASE64 images are downscaled to a DPI and pixel budget, optionally converted
+to grayscale, and recompressed. PDFs, URLs and images that would not get
+smaller are sent unchanged. BASE64 documents are recognized as images by
+their leading bytes, so other documents never reach the worker processes.
+
+Images are processed in a process pool, so decoding and resampling do not
+hold the GIL while request threads are uploading. Requires Pillow, install
+it with `pip install lazarus-ai[images]`.
+"""
+
+import contextlib
+import os
+import shutil
+import threading
+import time
+
+from ._utils.images import (IMAGE_EXTENSIONS, FORMAT_EXTENSIONS, _import_pillow, _is_base64_image, _preprocess_file,
+                          _preprocess_base64)
+
+
+class ImagePreprocessor:
+    """Downscales and recompresses images before upload.
+
+    Attributes:
+        max_dpi (float): Largest resolution kept, in dots per inch
+        max_pixels (int): Largest number of pixels kept per page
+        grayscale (bool): True to convert color images to grayscale
+        image_format (str): Pillow format written, None keeps the original
+        quality (int): JPEG and WebP quality
+        max_workers (int): Worker processes, 0 processes in the calling thread
+    """
+
+    def __init__(self, max_dpi: float = 300, max_pixels: int = None, grayscale: bool = True,
+                 image_format: str = None, quality: int = 85, max_workers: int = None, on_document=None):
+        """Initialize an ImagePreprocessor() object.
+
+        Args:
+            max_dpi (float, optional): Images above this resolution are
+                downscaled to it, defaults to 300
+            max_pixels (int, optional): Images with more pixels are
+                downscaled to fit, defaults to None
+            grayscale (bool, optional): Convert color images to grayscale,
+                defaults to True
+            image_format (str, optional): One of "PNG", "JPEG", "TIFF" or
+                "WEBP" to convert images to, defaults to None which keeps
+                the original format
+            quality (int, optional): JPEG and WebP quality, defaults to 85
+            max_workers (int, optional): Worker processes, defaults to the
+                number of CPUs, 0 processes images in the calling thread
+            on_document (callable, optional): Called with a dict of
+                input_type, bytes_in, bytes_out, bytes_saved and seconds for
+                every image processed, defaults to None
+        """
+        _import_pillow()
+        if image_format is not None and image_format not in FORMAT_EXTENSIONS:
+            raise ValueError(f"image_format must be one of: {', '.join(FORMAT_EXTENSIONS)}")
+        if max_workers is not None and max_workers < 0:
+            raise ValueError("max_workers must not be negative.")
+        self.max_dpi = max_dpi
+        self.max_pixels = max_pixels
+        self.grayscale = grayscale
+        self.image_format = image_format
+        self.quality = quality
+        self.max_workers = max_workers
+        self.on_document = on_document
+
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+        self._stats = {"documents": 0, "bytes_in": 0, "bytes_out": 0, "bytes_saved": 0, "seconds": 0.0}
+
+
+    @contextlib.contextmanager
+    def prepare(self, input_type: str, input_str: str):
+        """Yields the input to upload in place of an image document.
+
+        A processed FILE_PATH image is written to a temporary file, which is
+        removed on leaving the with block.
+
+        Args:
+            input_type (str): Type of input [FILE_PATH, URL, BASE64]
+            input_str (str): A path to a file, url or a base64 encoded string
+        Yields:
+            tuple: (input_type, input_str) to send
+        """
+        if input_type == "FILE_PATH" and os.path.splitext(input_str)[1] in IMAGE_EXTENSIONS:
+            func = _preprocess_file
+        elif input_type == "BASE64" and _is_base64_image(input_str):
+            func = _preprocess_base64
+        else:
+            yield input_type, input_str
+            return
+
+        start = time.monotonic()
+        processed, bytes_in, bytes_out = self._run(func, input_str)
+        self._record(input_type, bytes_in, bytes_out, time.monotonic() - start)
+        if processed is None:
+            yield input_type, input_str
+        elif input_type == "FILE_PATH":
+            try:
+                yield input_type, processed
+            finally:
+                shutil.rmtree(os.path.dirname(processed), ignore_errors=True)
+        else:
+            yield input_type, processed
+
+
+    def stats(self) -> dict:
+        """Returns totals over every image processed.
+
+        Returns:
+            dict: documents, bytes_in, bytes_out, bytes_saved and seconds
+        """
+        with self._lock:
+            return dict(self._stats)
+
+
+    def close(self):
+        """Shuts down the worker processes."""
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown()
+            self._executor = None
+
+
+    def _options(self) -> dict:
+        return {"max_dpi": self.max_dpi, "max_pixels": self.max_pixels, "grayscale": self.grayscale,
+                "format": self.image_format, "quality": self.quality}
+
+
+    def _run(self, func, input_str: str):
+        """Runs a preprocessing function in the process pool."""
+        if self.max_workers == 0:
+            return func(input_str, self._options())
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                # Deferred, the process pool machinery is slow to import
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+
+                # Forking a process running metrics, request and webhook threads can deadlock
+                method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                self._executor = ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context(method))
+                self._pid = os.getpid()
+            executor = self._executor
+        return executor.submit(func, input_str, self._options()).result()
+
+
+    def _record(self, input_type: str, bytes_in: int, bytes_out: int, seconds: float):
+        report = {"input_type": input_type, "bytes_in": bytes_in, "bytes_out": bytes_out,
+                  "bytes_saved": bytes_in - bytes_out, "seconds": seconds}
+        with self._lock:
+            self._stats["documents"] += 1
+            for key in ("bytes_in", "bytes_out", "bytes_saved", "seconds"):
+                self._stats[key] += report[key]
+        if self.on_document is not None:
+            self.on_document(report)
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc_info):
+        self.close()
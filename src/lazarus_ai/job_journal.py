@@ -0,0 +1,248 @@
+"""Class: JobJournal
+
+An optional SQLite journal making long bulk runs safe to restart. Wrap
+Forms and RikAI calls with JobJournal.run() and every submission is
+recorded with its document's content hash, endpoint, file_id, state and
+a pointer to its result.
+
+A submission is committed before its request is sent, so a crash never
+loses track of a document that may have reached the API. Commits are
+grouped: callers wait for the next commit of the batch instead of one
+commit each, so many threads share the cost of every fsync. Results are
+committed in the background without holding the caller up.
+
+Run again after a crash, completed documents are answered from the
+journal without a request, while documents left in flight or failed are
+sent again with the file_id they were first submitted with.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from . import _utils
+
+STATES = ("submitted", "completed", "failed")
+
+
+def _accepts_file_id(func) -> bool:
+    """Checks whether func takes a file_id keyword argument."""
+    import inspect
+
+    try:
+        parameters = inspect.signature(func).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    return any(p.kind is p.VAR_KEYWORD or p.name == "file_id" for p in parameters)
+
+
+class JobJournal:
+    """A write-ahead journal of Forms and RikAI submissions.
+
+    Attributes:
+        path (str): Path to the SQLite database
+        commit_interval (float): Longest time, in seconds, a write waits
+            before it is committed
+        commit_batch (int): Writes that trigger a commit without waiting
+        results_dir (str): Directory results are written to, or None to
+            store them in the database
+    """
+
+    def __init__(self, path: str, commit_interval: float = 0.05, commit_batch: int = 256, results_dir: str = None):
+        """Initialize a JobJournal() object.
+
+        Args:
+            path (str): Path to the SQLite database, created if missing
+            commit_interval (float, optional): Seconds between group
+                commits, defaults to 0.05
+            commit_batch (int, optional): Pending writes that trigger a
+                commit immediately, defaults to 256
+            results_dir (str, optional): Writes each result to a JSON file
+                in this directory and records its path, defaults to None
+                which stores results in the database
+        """
+        if commit_interval <= 0 or commit_batch < 1:
+            raise ValueError("commit_interval must be positive and commit_batch at least 1.")
+        self.path = path
+        self.commit_interval = commit_interval
+        self.commit_batch = commit_batch
+        self.results_dir = results_dir
+        if results_dir is not None:
+            os.makedirs(results_dir, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # Durable across process crashes, only a power loss can undo the last commits
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "key TEXT PRIMARY KEY, content_hash TEXT NOT NULL, endpoint TEXT NOT NULL, file_id TEXT, "
+            "state TEXT NOT NULL, attempts INTEGER NOT NULL, result TEXT, error TEXT, updated REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state)")
+        self._conn.commit()
+
+        self._cond = threading.Condition()
+        self._written = 0
+        self._committed = 0
+        self._closed = False
+        self._stats = {"skipped": 0, "submitted": 0, "completed": 0, "failed": 0, "commits": 0}
+        self._flusher = threading.Thread(target=self._flush_loop, name="lazarus-job-journal", daemon=True)
+        self._flusher.start()
+
+
+    def run(self, func, input_type: str, input_str: str, *args, **kwargs):
+        """Calls a Forms or RikAI method through the journal.
+
+        A document already completed with the same method, model and
+        arguments returns its recorded response without a request. Any
+        other call is committed as submitted before func is called, then
+        recorded as completed or failed. Methods taking a file_id are given
+        a generated one, unless passed, which is reused when a failed or
+        interrupted submission is sent again.
+
+        Args:
+            func (callable): A method such as Forms.run_ocr or
+                RikAI.ask_question, called as func(input_type, input_str,
+                *args, **kwargs)
+            input_type (str): Type of input expected [FILE_PATH, URL, BASE64]
+            input_str (str): A path to a file, url or a base64 encoded string
+            args (tuple): Further positional arguments, such as questions
+            kwargs (dict): Keyword arguments passed to func
+        Returns:
+            The response of func, or the recorded one
+        """
+        owner = getattr(func, "__self__", None)
+        endpoint = f"{type(owner).__name__}.{func.__name__}" if owner is not None else func.__qualname__
+        content_hash = _utils._content_hash(input_type, input_str)
+        header = [endpoint, getattr(owner, "model_id", None), input_type, content_hash, list(args), kwargs]
+        key = hashlib.sha256(json.dumps(header, sort_keys=True, default=str).encode()).hexdigest()
+
+        with self._cond:
+            row = self._conn.execute("SELECT state, file_id, result FROM jobs WHERE key = ?", (key,)).fetchone()
+        if row is not None and row[0] == "completed":
+            with self._cond:
+                self._stats["skipped"] += 1
+            result = self._load_result(row[2])
+            return owner._result(result) if hasattr(owner, "_result") else result
+
+        if "file_id" not in kwargs and _accepts_file_id(func):
+            kwargs["file_id"] = row[1] if row is not None and row[1] else uuid.uuid4().hex
+        file_id = kwargs.get("file_id")
+
+        # Write ahead: the submission is committed before anything is sent
+        self._write(
+            "INSERT INTO jobs (key, content_hash, endpoint, file_id, state, attempts, updated) "
+            "VALUES (?, ?, ?, ?, 'submitted', 1, ?) ON CONFLICT (key) DO UPDATE SET "
+            "state = 'submitted', file_id = excluded.file_id, attempts = attempts + 1, error = NULL, "
+            "updated = excluded.updated",
+            (key, content_hash, endpoint, file_id, time.time()), "submitted", durable=True)
+
+        try:
+            result = func(input_type, input_str, *args, **kwargs)
+        except Exception as e:
+            self._write("UPDATE jobs SET state = 'failed', error = ?, updated = ? WHERE key = ?",
+                        (f"{type(e).__name__}: {getattr(e, 'message', None) or e}", time.time(), key), "failed")
+            raise
+
+        self._write("UPDATE jobs SET state = 'completed', result = ?, updated = ? WHERE key = ?",
+                    (self._store_result(key, getattr(result, "raw", result)), time.time(), key), "completed")
+        return result
+
+
+    def counts(self) -> dict:
+        """Returns the number of journaled documents in each state."""
+        with self._cond:
+            rows = self._conn.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall()
+        return dict.fromkeys(STATES, 0) | dict(rows)
+
+
+    def stats(self) -> dict:
+        """Returns counters for this session.
+
+        Returns:
+            dict: skipped, submitted, completed and failed calls, and the
+                number of group commits
+        """
+        with self._cond:
+            return dict(self._stats)
+
+
+    def flush(self):
+        """Commits every pending write."""
+        with self._cond:
+            self._commit()
+
+
+    def close(self):
+        """Commits pending writes and closes the database."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._commit()
+            self._cond.notify_all()
+        self._flusher.join()
+        self._conn.close()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+    def _write(self, sql: str, params: tuple, state: str, durable: bool = False):
+        """Executes a write in the open transaction, waiting for its commit if durable."""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("JobJournal is closed.")
+            self._conn.execute(sql, params)
+            self._written += 1
+            self._stats[state] += 1
+            written = self._written
+            if written - self._committed >= self.commit_batch:
+                self._commit()
+            while durable and self._committed < written:
+                self._cond.wait()
+
+
+    def _commit(self):
+        # Called with the condition held
+        if self._committed < self._written:
+            self._conn.commit()
+            self._committed = self._written
+            self._stats["commits"] += 1
+            self._cond.notify_all()
+
+
+    def _flush_loop(self):
+        """Commits pending writes every commit_interval until closed."""
+        with self._cond:
+            while not self._closed:
+                self._cond.wait(self.commit_interval)
+                self._commit()
+
+
+    def _store_result(self, key: str, result) -> str:
+        """Returns the result pointer recorded for a completed document."""
+        value = json.dumps(result)
+        if self.results_dir is None:
+            return value
+        path = os.path.join(self.results_dir, f"{key}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(value)
+        return path
+
+
+    def _load_result(self, pointer: str):
+        if self.results_dir is None:
+            return _utils._loads(pointer)
+        with open(pointer, "rb") as f:
+            return _utils._loads(f.read())
@@ -4,55 +4,161 @@ LazarusAuth holds and authenticates a user's Lazarus login credentials.
 The Forms and RikAI classes must be initialized with a valid LazarusAuth
 instance.
 
-If the auth information provided is not valid, an InvalidAuthError
-will be raised on initialization.
+By default credentials are not checked on initialization. Invalid
+credentials surface as an AuthError on the first real request, so no
+extra network round trip is made before doing work. Pass
+validation="eager" to raise an InvalidAuthError on initialization, or
+validation="cached" to validate once and share the result with other
+processes on the same host through a small marker file.
 """
 
+import hashlib
 import os
-import sys
-import requests
+import tempfile
+import time
 
-parent_dir = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
-sys.path.append(parent_dir)
+from .client_stats import ClientStats
+from .errors import InvalidAuthError
+from ._utils import Transport, _flush_metrics
+from ._utils.config import BASE_URL
 
-from errors import InvalidAuthError
-
-BASE_URL = os.environ.get("BASE_URL", "https://api.lazarusforms.com/")
+VALIDATION_MODES = ("lazy", "eager", "cached")
 
 
 class LazarusAuth:
     """A class to validate and store Lazarus auth credentials."""
 
-    def __init__(self, org_id: str, auth_key: str):
+    def __init__(self, org_id: str, auth_key: str, pool_connections: int = 10, pool_maxsize: int = 10,
+                 validation: str = "lazy", validation_ttl: float = 3600, validation_dir: str = None,
+                 retry_policy=None, rate_limiter=None, single_flight: bool = False, compression: str = None,
+                 compression_threshold: int = 1024, hooks=None, client_stats=None):
         """Initialize a LazarusAuth() object.
 
-        Org ID and Auth Key are authenticated on initialization.
-        Initializing with invalid credentials will raise an error.
+        With validation="lazy", credentials are checked by the first real
+        request, which raises an AuthError if they are invalid. With
+        validation="eager", Org ID and Auth Key are authenticated on
+        initialization and invalid credentials raise an InvalidAuthError.
+        With validation="cached", a successful eager check is recorded in a
+        marker file and reused by every process on the host until
+        validation_ttl expires. The marker file name is a hash of the
+        credentials and holds no secrets.
+
+        The LazarusAuth instance owns a pooled keep-alive HTTP transport
+        which is shared by every Forms and RikAI object created from it,
+        and a ClientStats aggregating the requests sent through it.
 
         Args:
             org_id (str): Lazarus organization ID
             auth_key (str): Lazarus authentication key
+            pool_connections (int, optional): Number of per-host connection
+                pools to cache, defaults to 10
+            pool_maxsize (int, optional): Maximum number of connections kept
+                open per host, defaults to 10
+            validation (str, optional): One of "lazy", "eager" or "cached",
+                defaults to "lazy"
+            validation_ttl (float, optional): Seconds a cached validation
+                stays valid, defaults to 3600
+            validation_dir (str, optional): Directory holding cached
+                validation markers, defaults to the system temp directory
+            retry_policy (RetryPolicy, optional): Retries failed requests
+                from every Forms and RikAI object sharing this auth, and
+                short-circuits endpoints that keep failing, defaults to None
+            rate_limiter (RateLimiter, optional): Token bucket consulted
+                before every request, keyed by org_id, defaults to None
+            single_flight (bool, optional): Concurrent Forms and RikAI calls
+                for the same document, model and arguments wait on a single
+                request and share its result or exception, defaults to False
+            compression (str, optional): "gzip" or "deflate" to compress
+                JSON request bodies, such as BASE64 and URL inputs, defaults
+                to None
+            compression_threshold (int, optional): Smallest JSON body, in
+                bytes, that is compressed, defaults to 1024
+            hooks (RequestHooks, optional): Callbacks reporting the phase
+                timings of every request attempt, defaults to None
+            client_stats (ClientStats, optional): Aggregates to record
+                requests in, shared with other LazarusAuth instances,
+                defaults to a new ClientStats
         """
         if not org_id or not auth_key:
             raise ValueError("Cannot initialize with an empty string.")
+        if validation not in VALIDATION_MODES:
+            raise ValueError(f"validation must be one of: {', '.join(VALIDATION_MODES)}")
         self.headers = {"orgId": org_id, "authKey": auth_key}
-        self.authenticate()
-
-
-    def authenticate(self):
+        self.client_stats = client_stats if client_stats is not None else ClientStats()
+        self.transport = Transport(pool_connections, pool_maxsize, retry_policy, rate_limiter, org_id, single_flight,
+                                   compression, compression_threshold, hooks, self.client_stats)
+        self.validation = validation
+        self.validation_ttl = validation_ttl
+        self.validation_dir = validation_dir or tempfile.gettempdir()
+
+        if validation == "eager":
+            self.authenticate()
+        elif validation == "cached" and not self._validation_cached():
+            # Outages and rate limits say nothing about the credentials, so they are not cached
+            if self.authenticate():
+                self._cache_validation()
+
+
+    def authenticate(self) -> bool:
         """Authenticates Org ID and Auth Key.
 
         Posts a request to an API endpoint with no body. If the response
         is an AUTH_FAILURE with status code 403, we raise an error. Users
         will not be charged for this call as no pages are processed.
 
+        Returns:
+            bool: True if the API accepted the credentials, answering with a
+                2xx or the 400 for the missing document, False if the answer
+                says nothing about them, such as a 429 or 5xx
         Raises:
             InvalidAuthError
         """
-        res = requests.post(f"{BASE_URL}/api/forms/generic", headers=self.headers)
+        res = self.transport.post(f"{BASE_URL}/api/forms/generic", headers=self.headers)
 
         if res.status_code == 403:
             raise InvalidAuthError("Invalid org ID or auth key. Authentication failed.")
+        return 200 <= res.status_code < 300 or res.status_code == 400
+
+
+    def _validation_path(self) -> str:
+        """Returns the marker file recording a successful validation."""
+        key = "\0".join([BASE_URL, self.headers["orgId"], self.headers["authKey"]])
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return os.path.join(self.validation_dir, f"lazarus-auth-{digest}")
+
+
+    def _validation_cached(self) -> bool:
+        """Checks for a marker file newer than validation_ttl."""
+        try:
+            return time.time() - os.path.getmtime(self._validation_path()) < self.validation_ttl
+        except OSError:
+            return False
+
+
+    def _cache_validation(self):
+        """Records a successful validation, ignoring unwritable directories."""
+        path = self._validation_path()
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.validation_dir)
+            os.close(fd)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+
+    def flush_metrics(self, timeout=None) -> bool:
+        """Blocks until queued library metrics have been reported.
+
+        Metrics are sent from a background thread and flushed automatically
+        at interpreter exit. Call this before exiting in environments where
+        atexit handlers may not run, such as some serverless runtimes.
+
+        Args:
+            timeout (float, optional): Seconds to wait, defaults to None
+        Returns:
+            bool: True if every queued event was sent
+        """
+        return _flush_metrics(timeout)
 
 
 # LazarusAuth class usage examples
@@ -60,3 +166,9 @@ if __name__ == "__main__":
     org_id = os.environ.get("LAZARUS_ORG_ID")
     auth_key = os.environ.get("LAZARUS_AUTH_KEY")
     auth = LazarusAuth(org_id, auth_key)
+
+    # Check credentials on initialization
+    auth = LazarusAuth(org_id, auth_key, validation="eager")
+
+    # Check credentials once per hour across every process on this host
+    auth = LazarusAuth(org_id, auth_key, validation="cached", validation_ttl=3600)
@@ -0,0 +1,139 @@
+"""Class: RateLimiter
+
+A client-side token bucket which keeps request throughput under an
+organization's quota. Pass an instance to LazarusAuth and every Forms and
+RikAI request, including retries, waits for a token before it is sent.
+Buckets are keyed by orgId.
+
+By default the bucket lives in process memory and is shared by all threads.
+Given a path, the bucket is stored in a SQLite database instead, so every
+process on the host that uses the same path draws from one bucket. When
+workers run on several hosts, give each host a limiter with its share of the
+organization's quota.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+
+class RateLimiter:
+    """A thread-safe token bucket with an optional cross-process backend.
+
+    Attributes:
+        rate (float): Tokens added per second, the sustained request rate
+        burst (float): Bucket capacity, the largest burst allowed
+        path (str): Path to the SQLite database shared between processes
+    """
+
+    def __init__(self, rate: float, burst: float = None, path: str = None):
+        """Initialize a RateLimiter() object.
+
+        Args:
+            rate (float): Requests allowed per second
+            burst (float, optional): Maximum requests sent back to back after
+                an idle period, defaults to rate, or 1 if rate is below 1
+            path (str, optional): SQLite database used to share the bucket
+                between processes, defaults to None
+        """
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0.")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        if self.burst < 1:
+            raise ValueError("burst must be at least 1.")
+        self.path = path
+
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self._conn = None
+        self._pid = None
+        self._stats = {"acquired": 0, "waited": 0, "wait_seconds": 0.0}
+
+
+    def acquire(self, key: str = "default"):
+        """Blocks until a token is available for key, then takes it.
+
+        Args:
+            key (str, optional): Bucket key, LazarusAuth passes the orgId,
+                defaults to "default"
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                if self.path is None:
+                    wait = self._take_memory(key)
+                else:
+                    wait = self._take_shared(key)
+                if wait <= 0:
+                    self._stats["acquired"] += 1
+                    if waited:
+                        self._stats["waited"] += 1
+                        self._stats["wait_seconds"] += waited
+                    return
+            time.sleep(wait)
+            waited += wait
+
+
+    def stats(self) -> dict:
+        """Returns counters of acquired tokens and time spent waiting.
+
+        Returns:
+            dict: acquired, waited (requests that had to wait) and
+                wait_seconds
+        """
+        with self._lock:
+            return dict(self._stats)
+
+
+    def _refill(self, tokens: float, updated: float, now: float) -> float:
+        return min(self.burst, tokens + (now - updated) * self.rate)
+
+
+    def _take_memory(self, key: str) -> float:
+        """Takes a token from the in-process bucket, or returns seconds to wait."""
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (self.burst, now))
+        tokens = self._refill(tokens, updated, now)
+        if tokens >= 1:
+            self._buckets[key] = (tokens - 1, now)
+            return 0.0
+        self._buckets[key] = (tokens, now)
+        return (1 - tokens) / self.rate
+
+
+    def _connection(self) -> sqlite3.Connection:
+        """Returns a SQLite connection for this process."""
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+            self._pid = os.getpid()
+        return self._conn
+
+
+    def _take_shared(self, key: str) -> float:
+        """Takes a token from the shared bucket, or returns seconds to wait.
+
+        Wall clock time is used since monotonic clocks are not comparable
+        across processes.
+        """
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            row = conn.execute("SELECT tokens, updated FROM buckets WHERE key = ?", (key,)).fetchone()
+            tokens, updated = row if row is not None else (self.burst, now)
+            tokens = self._refill(tokens, min(updated, now), now)
+            wait = 0.0 if tokens >= 1 else (1 - tokens) / self.rate
+            if tokens >= 1:
+                tokens -= 1
+            conn.execute("INSERT OR REPLACE INTO buckets (key, tokens, updated) VALUES (?, ?, ?)", (key, tokens, now))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return wait
@@ -0,0 +1,59 @@
+"""Class: RequestHooks
+
+Callbacks that observe every attempt sent through a LazarusAuth
+instance, to feed tracing or find where the latency of a slow call goes.
+Pass an instance to LazarusAuth and each Forms and RikAI request,
+including retries, reports its progress as it is sent.
+
+Every callback receives a dict with the endpoint path, model_id, retry
+attempt (0 for the first), bytes_sent and the phase timings measured so
+far, in seconds:
+    prepare: serializing and compressing the body
+    queue: waiting on the rate limiter
+    connect: opening a new connection, 0 when a pooled one is reused
+    upload: writing the body, which includes reading FILE_PATH inputs
+    wait: from the end of the upload to the response headers
+    download: reading the response body
+    total: the whole attempt, excluding prepare
+on_response events add status and bytes_received, None for streamed
+responses, and on_error events add the raised error.
+
+Library metrics are queued and posted from a background thread, so they
+never add to these timings.
+"""
+
+
+class RequestHooks:
+    """Callbacks run on the requesting thread as each attempt progresses.
+
+    Attributes:
+        on_request_start (callable): Called before the attempt is queued
+        on_upload_complete (callable): Called once the body has been sent
+        on_response (callable): Called when a response has been read
+        on_error (callable): Called when the attempt raises, before the
+            error propagates
+    """
+
+    def __init__(self, on_request_start=None, on_upload_complete=None, on_response=None, on_error=None):
+        """Initialize a RequestHooks() object.
+
+        Args:
+            on_request_start (callable, optional): Called with the event as
+                an attempt starts, defaults to None
+            on_upload_complete (callable, optional): Called with the event
+                once the request body has been written, defaults to None
+            on_response (callable, optional): Called with the event once the
+                response has been read, whatever its status, defaults to None
+            on_error (callable, optional): Called with the event when the
+                attempt fails without a response, defaults to None
+        """
+        self.on_request_start = on_request_start
+        self.on_upload_complete = on_upload_complete
+        self.on_response = on_response
+        self.on_error = on_error
+
+
+    def _emit(self, name: str, event: dict):
+        callback = getattr(self, name)
+        if callback is not None:
+            callback(event)
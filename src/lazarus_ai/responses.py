@@ -0,0 +1,235 @@
+"""Classes: FormsResult, RikAIResult
+
+Optional typed views over Forms and RikAI responses. Pass
+typed_results=True to Forms or RikAI and their methods return these
+objects instead of plain dicts.
+
+Every class wraps the decoded response without copying it and uses
+__slots__, so a result costs a few pointers on top of the dict it wraps.
+Nested objects such as pages, lines and answers are built on first access
+and kept, so a caller that only reads answers never builds the OCR tree.
+The raw dict is always available as .raw.
+"""
+
+
+def _text(value):
+    """Returns the text of a value that is either a string or a text object."""
+    if isinstance(value, dict):
+        return value.get("text", value.get("content"))
+    return value
+
+
+class Line:
+    """A line of text recognized on a page."""
+
+    __slots__ = ("raw",)
+
+    def __init__(self, raw: dict):
+        self.raw = raw
+
+
+    @property
+    def text(self) -> str:
+        return _text(self.raw)
+
+
+    @property
+    def bounding_box(self) -> list:
+        return self.raw.get("boundingBox")
+
+
+    @property
+    def words(self) -> list:
+        return self.raw.get("words", [])
+
+
+    def __repr__(self):
+        return f"Line({self.text!r})"
+
+
+class Page:
+    """A page of OCR results.
+
+    Attributes:
+        raw (dict): The page as returned by the API
+    """
+
+    __slots__ = ("raw", "_lines")
+
+    def __init__(self, raw: dict):
+        self.raw = raw
+        self._lines = None
+
+
+    @property
+    def number(self) -> int:
+        return self.raw.get("page")
+
+
+    @property
+    def width(self) -> float:
+        return self.raw.get("width")
+
+
+    @property
+    def height(self) -> float:
+        return self.raw.get("height")
+
+
+    @property
+    def lines(self) -> list:
+        """Returns the page's lines, building them on first access."""
+        if self._lines is None:
+            self._lines = [Line(line) for line in self.raw.get("lines", [])]
+        return self._lines
+
+
+    def __repr__(self):
+        return f"Page(number={self.number!r})"
+
+
+class Field:
+    """A key-value pair extracted from a form."""
+
+    __slots__ = ("raw",)
+
+    def __init__(self, raw: dict):
+        self.raw = raw
+
+
+    @property
+    def key(self) -> str:
+        return _text(self.raw.get("key"))
+
+
+    @property
+    def value(self) -> str:
+        return _text(self.raw.get("value"))
+
+
+    @property
+    def confidence(self) -> float:
+        return self.raw.get("confidence")
+
+
+    def __repr__(self):
+        return f"Field({self.key!r}: {self.value!r})"
+
+
+class Answer:
+    """A RikAI answer to a single question."""
+
+    __slots__ = ("raw",)
+
+    def __init__(self, raw: dict):
+        self.raw = raw
+
+
+    @property
+    def question(self) -> str:
+        return self.raw.get("question")
+
+
+    @property
+    def answer(self) -> str:
+        return self.raw.get("answer")
+
+
+    @property
+    def translated(self) -> str:
+        return self.raw.get("translated")
+
+
+    def __repr__(self):
+        return f"Answer({self.answer!r})"
+
+
+class _Result:
+    """Fields shared by Forms and RikAI responses."""
+
+    __slots__ = ("raw", "_pages")
+
+    def __init__(self, raw: dict):
+        self.raw = raw
+        self._pages = None
+
+
+    @property
+    def status(self) -> str:
+        return self.raw.get("status")
+
+
+    @property
+    def document_id(self) -> str:
+        return self.raw.get("documentId")
+
+
+    @property
+    def metadata(self) -> dict:
+        return self.raw.get("metadata")
+
+
+    @property
+    def pages(self) -> list:
+        """Returns the OCR pages, building them on first access."""
+        if self._pages is None:
+            self._pages = [Page(page) for page in self.raw.get("ocrResults") or []]
+        return self._pages
+
+
+    def __getitem__(self, key):
+        return self.raw[key]
+
+
+    def __eq__(self, other):
+        if isinstance(other, _Result):
+            return self.raw == other.raw
+        return self.raw == other
+
+
+    def __repr__(self):
+        return f"{type(self).__name__}(status={self.status!r}, document_id={self.document_id!r})"
+
+
+class FormsResult(_Result):
+    """A typed Forms response."""
+
+    __slots__ = ("_fields",)
+
+    def __init__(self, raw: dict):
+        super().__init__(raw)
+        self._fields = None
+
+
+    @property
+    def fields(self) -> list:
+        """Returns the extracted key-value pairs, building them on first access."""
+        if self._fields is None:
+            self._fields = [Field(field) for field in self.raw.get("keyValuePairs") or []]
+        return self._fields
+
+
+class RikAIResult(_Result):
+    """A typed RikAI response."""
+
+    __slots__ = ("_answers",)
+
+    def __init__(self, raw: dict):
+        super().__init__(raw)
+        self._answers = None
+
+
+    @property
+    def answers(self) -> list:
+        """Returns the answers in question order, building them on first access."""
+        if self._answers is None:
+            data = self.raw.get("data")
+            self._answers = [Answer(answer) for answer in data] if isinstance(data, list) else []
+        return self._answers
+
+
+    @property
+    def summary(self):
+        """Returns the summary of a summarize response, or None."""
+        data = self.raw.get("data")
+        return data.get("summary") if isinstance(data, dict) else None
@@ -0,0 +1,258 @@
+"""Class: ResultCache
+
+An optional content-addressed cache for Forms and RikAI results. Pass an
+instance to Forms or RikAI on initialization and repeated requests for the
+same document, endpoint, model and arguments are served locally.
+
+Results are held in an in-memory LRU tier and, if a path is given, in an
+on-disk SQLite tier that survives restarts and can be shared by several
+processes. Both tiers support a TTL and size-based eviction.
+
+Keeping the disk tier off the request path, access times of disk hits are
+written in batches, and the least recently used results are only evicted
+once the table outgrows max_disk_entries, making room for a tenth more.
+"""
+
+import collections
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from . import _utils
+
+# Disk hits whose access times are written together
+ACCESS_BATCH = 256
+
+
+def _page_count(result) -> int:
+    """Returns the number of OCR pages in a response."""
+    return len(result.get("ocrResults") or []) if isinstance(result, dict) else 0
+
+
+class ResultCache:
+    """A two-tier LRU and SQLite cache for API responses.
+
+    Attributes:
+        max_entries (int): Maximum number of results held in memory
+        max_bytes (int): Maximum total size of results held in memory
+        ttl (float): Seconds a result stays valid, None never expires
+        path (str): Path to the SQLite database, None disables the disk tier
+        max_disk_entries (int): Maximum number of results held on disk
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 256 * 1024 * 1024, ttl: float = None,
+                 path: str = None, max_disk_entries: int = 100_000):
+        """Initialize a ResultCache() object.
+
+        Args:
+            max_entries (int, optional): Maximum number of results held in
+                memory, defaults to 1024
+            max_bytes (int, optional): Maximum total size of serialized
+                results held in memory, defaults to 256 MiB
+            ttl (float, optional): Seconds a result stays valid, defaults to
+                None which never expires
+            path (str, optional): Path to a SQLite database used as a second
+                tier, defaults to None
+            max_disk_entries (int, optional): Maximum number of results held
+                on disk, defaults to 100,000
+        """
+        if max_entries < 1 or max_bytes < 1 or max_disk_entries < 1:
+            raise ValueError("Cache sizes must be at least 1.")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.path = path
+        self.max_disk_entries = max_disk_entries
+
+        self._lock = threading.Lock()
+        self._memory = collections.OrderedDict()
+        self._memory_bytes = 0
+        self._conn = None
+        self._pid = None
+        self._accessed = {}
+        self._disk_entries = 0
+        self._stats = {"hits": 0, "misses": 0, "memory_hits": 0, "disk_hits": 0, "saved_seconds": 0.0,
+                       "saved_pages": 0}
+
+
+    def get(self, key: str):
+        """Returns the cached result for key, or None on a miss.
+
+        Each call returns a freshly decoded copy, so callers may modify it.
+
+        Args:
+            key (str): Request fingerprint
+        Returns:
+            dict: The cached response, or None
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, created, elapsed, pages = entry
+                if self._expired(created, now):
+                    self._evict(key)
+                else:
+                    self._memory.move_to_end(key)
+                    self._record_hit("memory_hits", elapsed, pages)
+                    return _utils._loads(value)
+
+            row = self._disk_get(key, now)
+            if row is not None:
+                value, created, elapsed, pages = row
+                self._memory_set(key, value, created, elapsed, pages)
+                self._record_hit("disk_hits", elapsed, pages)
+                return _utils._loads(value)
+
+            self._stats["misses"] += 1
+            return None
+
+
+    def set(self, key: str, result: dict, elapsed: float = 0.0):
+        """Stores a result in every tier.
+
+        Args:
+            key (str): Request fingerprint
+            result (dict): API response to cache
+            elapsed (float, optional): Seconds the request took, reported as
+                saved time on later hits, defaults to 0.0
+        """
+        value = json.dumps(result)
+        created = time.time()
+        pages = _page_count(result)
+        with self._lock:
+            self._memory_set(key, value, created, elapsed, pages)
+            self._disk_set(key, value, created, elapsed, pages)
+
+
+    def clear(self):
+        """Removes every result from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            self._accessed.clear()
+            conn = self._connection()
+            if conn is not None:
+                conn.execute("DELETE FROM results")
+                conn.commit()
+                self._disk_entries = 0
+
+
+    def stats(self) -> dict:
+        """Returns hit and miss counters.
+
+        Returns:
+            dict: hits, misses, memory_hits, disk_hits, the saved_seconds
+                and saved_pages of OCR served from the cache, and the current
+                number of results held in memory
+        """
+        with self._lock:
+            return self._stats | {"entries": len(self._memory)}
+
+
+    def _record_hit(self, tier: str, elapsed: float, pages: int):
+        self._stats["hits"] += 1
+        self._stats[tier] += 1
+        self._stats["saved_seconds"] += elapsed
+        self._stats["saved_pages"] += pages
+
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.ttl is not None and now - created > self.ttl
+
+
+    def _memory_set(self, key: str, value: str, created: float, elapsed: float, pages: int):
+        if len(value) > self.max_bytes:
+            return
+        if key in self._memory:
+            self._evict(key)
+        self._memory[key] = (value, created, elapsed, pages)
+        self._memory_bytes += len(value)
+        while len(self._memory) > self.max_entries or self._memory_bytes > self.max_bytes:
+            self._evict(next(iter(self._memory)))
+
+
+    def _evict(self, key: str):
+        value, *_ = self._memory.pop(key)
+        self._memory_bytes -= len(value)
+
+
+    def _connection(self):
+        """Returns a SQLite connection for this process, if a path was given."""
+        if self.path is None:
+            return None
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, "
+                "accessed REAL NOT NULL, elapsed REAL NOT NULL, pages INTEGER NOT NULL DEFAULT 0)"
+            )
+            if "pages" not in [column[1] for column in self._conn.execute("PRAGMA table_info(results)")]:
+                self._conn.execute("ALTER TABLE results ADD COLUMN pages INTEGER NOT NULL DEFAULT 0")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+            self._conn.commit()
+            self._pid = os.getpid()
+            self._accessed.clear()
+            self._disk_entries = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        return self._conn
+
+
+    def _disk_get(self, key: str, now: float):
+        conn = self._connection()
+        if conn is None:
+            return None
+        row = conn.execute("SELECT value, created, elapsed, pages FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        if self._expired(row[1], now):
+            conn.execute("DELETE FROM results WHERE key = ?", (key,))
+            conn.commit()
+            return None
+        self._accessed[key] = now
+        if len(self._accessed) >= ACCESS_BATCH:
+            self._write_accessed(conn)
+            conn.commit()
+        return row
+
+
+    def _disk_set(self, key: str, value: str, created: float, elapsed: float, pages: int):
+        conn = self._connection()
+        if conn is None:
+            return
+        self._write_accessed(conn)
+        conn.execute(
+            "INSERT OR REPLACE INTO results (key, value, created, accessed, elapsed, pages) VALUES (?, ?, ?, ?, ?, ?)",
+            (key, value, created, created, elapsed, pages),
+        )
+        # Counts replacements and misses other processes' writes, so it is
+        # only a trigger to count the rows before evicting
+        self._disk_entries += 1
+        if self._disk_entries > self.max_disk_entries:
+            self._disk_evict(conn, created)
+        conn.commit()
+
+
+    def _write_accessed(self, conn):
+        """Writes the pending access times of disk hits, without committing."""
+        if self._accessed:
+            conn.executemany("UPDATE results SET accessed = ? WHERE key = ?",
+                             [(accessed, key) for key, accessed in self._accessed.items()])
+            self._accessed.clear()
+
+
+    def _disk_evict(self, conn, now: float):
+        """Removes expired results, then the least recently used beyond nine tenths of max_disk_entries."""
+        if self.ttl is not None:
+            conn.execute("DELETE FROM results WHERE created < ?", (now - self.ttl,))
+        self._disk_entries = conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        if self._disk_entries > self.max_disk_entries:
+            keep = max(1, self.max_disk_entries * 9 // 10)
+            conn.execute(
+                "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (keep,),
+            )
+            self._disk_entries = keep
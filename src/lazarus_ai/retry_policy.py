@@ -0,0 +1,262 @@
+"""Class: RetryPolicy
+
+Retries failed requests with exponential backoff and jitter, honoring the
+Retry-After header, and short-circuits requests to endpoints that keep
+failing. Pass an instance to LazarusAuth to apply it to every Forms and
+RikAI request made through that auth object.
+
+A POST that may have reached the server is only retried when it carries a
+file_id, which lets the API and the caller recognize duplicate submissions.
+Responses that guarantee the document was not processed (429 and 503) and
+failures to connect are always retried.
+"""
+
+import random
+import threading
+import time
+
+from .errors import CircuitOpenError
+
+# Statuses which mean the request was rejected before any processing
+SAFE_STATUSES = frozenset({429, 503})
+
+
+class _CircuitBreaker:
+    """Tracks consecutive failures of a single endpoint.
+
+    Closed lets every request through. After failure_threshold consecutive
+    failures the breaker opens and rejects requests for recovery_timeout
+    seconds, then lets a single trial request through. A successful trial
+    closes the breaker, a failed one opens it again.
+    """
+
+    def __init__(self, failure_threshold: int, recovery_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.recovery_timeout:
+            return "half_open"
+        return "open"
+
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self.trial_in_flight:
+            self.trial_in_flight = True
+            return True
+        return False
+
+
+    def record(self, success: bool):
+        self.trial_in_flight = False
+        if success:
+            self.failures = 0
+            self.opened_at = None
+            return
+        self.failures += 1
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+class RetryPolicy:
+    """A retry policy with per-endpoint circuit breakers.
+
+    Attributes:
+        max_retries (int): Maximum retries after the first attempt
+        backoff_factor (float): Base delay in seconds, doubled every retry
+        max_backoff (float): Maximum delay between attempts in seconds
+        jitter (bool): Randomizes delays to spread out retry bursts
+        retry_statuses (frozenset): Response statuses that may be retried
+        respect_retry_after (bool): Waits as long as Retry-After asks
+        failure_threshold (int): Consecutive failures that open a breaker
+        recovery_timeout (float): Seconds a breaker stays open
+    """
+
+    def __init__(self, max_retries: int = 3, backoff_factor: float = 0.5, max_backoff: float = 30.0,
+                 jitter: bool = True, retry_statuses=(429, 500, 502, 503, 504),
+                 respect_retry_after: bool = True, failure_threshold: int = 5,
+                 recovery_timeout: float = 30.0):
+        """Initialize a RetryPolicy() object.
+
+        Args:
+            max_retries (int, optional): Maximum retries after the first
+                attempt, defaults to 3
+            backoff_factor (float, optional): Base delay in seconds, doubled
+                every retry, defaults to 0.5
+            max_backoff (float, optional): Maximum delay between attempts in
+                seconds, also caps Retry-After, defaults to 30.0
+            jitter (bool, optional): Draws each delay uniformly between zero
+                and the backoff, defaults to True
+            retry_statuses (iterable, optional): Response statuses that may
+                be retried, defaults to (429, 500, 502, 503, 504)
+            respect_retry_after (bool, optional): Waits as long as the
+                Retry-After header asks, defaults to True
+            failure_threshold (int, optional): Consecutive failures that open
+                an endpoint's circuit breaker, defaults to 5
+            recovery_timeout (float, optional): Seconds a breaker stays open
+                before a trial request is let through, defaults to 30.0
+        """
+        if max_retries < 0 or failure_threshold < 1:
+            raise ValueError("max_retries must be at least 0 and failure_threshold at least 1.")
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_statuses = frozenset(retry_statuses)
+        self.respect_retry_after = respect_retry_after
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+
+        self._lock = threading.Lock()
+        self._breakers = {}
+        self._stats = {"requests": 0, "retries": 0, "backoff_seconds": 0.0, "rejected": 0}
+
+
+    def stats(self) -> dict:
+        """Returns retry counters and circuit breaker states.
+
+        Returns:
+            dict: requests, retries, backoff_seconds, requests rejected by
+                an open breaker, and the state of every endpoint's breaker
+        """
+        with self._lock:
+            breakers = {endpoint: breaker.state for endpoint, breaker in self._breakers.items()}
+            return self._stats | {"circuits": breakers}
+
+
+    def call(self, endpoint: str, send, idempotent: bool = False):
+        """Sends a request, retrying it according to the policy.
+
+        Args:
+            endpoint (str): Endpoint path, each has its own circuit breaker
+            send (callable): Called as send(attempt) to post the request,
+                returning a Response
+            idempotent (bool, optional): True if the request carries a
+                file_id and may be retried after reaching the server,
+                defaults to False
+        Returns:
+            Response: The first successful or non-retryable response, or the
+                last response once retries are exhausted
+        Raises:
+            CircuitOpenError if the endpoint's breaker is open
+        """
+        import requests
+
+        with self._lock:
+            breaker = self._breakers.setdefault(endpoint, _CircuitBreaker(self.failure_threshold, self.recovery_timeout))
+            self._stats["requests"] += 1
+
+        attempt = 0
+        while True:
+            with self._lock:
+                allowed = breaker.allow()
+                if not allowed:
+                    self._stats["rejected"] += 1
+            if not allowed:
+                raise CircuitOpenError("CIRCUIT_OPEN", f"Requests to {endpoint} are failing, retry later.", None)
+
+            response, error = None, None
+            try:
+                response = send(attempt)
+            except requests.RequestException as e:
+                error = e
+            except BaseException:
+                # The outcome is unknown, so free the half-open trial for the next request
+                with self._lock:
+                    breaker.trial_in_flight = False
+                raise
+
+            failed = error is not None or response.status_code >= 500
+            with self._lock:
+                breaker.record(not failed)
+
+            if attempt >= self.max_retries or not self._retryable(response, error, idempotent):
+                if error is not None:
+                    raise error
+                return response
+
+            delay = self._delay(attempt, response)
+            if response is not None:
+                # Release the pooled connection of a streamed response
+                response.close()
+            with self._lock:
+                self._stats["retries"] += 1
+                self._stats["backoff_seconds"] += delay
+            time.sleep(delay)
+            attempt += 1
+
+
+    def _retryable(self, response, error, idempotent: bool) -> bool:
+        """Decides whether a failed attempt may be sent again."""
+        import requests
+
+        if error is not None:
+            if isinstance(error, requests.ConnectionError) and _never_sent(error):
+                return True
+            return idempotent and isinstance(error, (requests.ConnectionError, requests.Timeout))
+        if response.status_code not in self.retry_statuses:
+            return False
+        return idempotent or response.status_code in SAFE_STATUSES
+
+
+    def _delay(self, attempt: int, response) -> float:
+        """Returns seconds to wait before the next attempt."""
+        if self.respect_retry_after and response is not None:
+            retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(retry_after, self.max_backoff)
+        backoff = min(self.max_backoff, self.backoff_factor * 2 ** attempt)
+        return random.uniform(0, backoff) if self.jitter else backoff
+
+
+def _never_sent(error: Exception) -> bool:
+    """Checks whether a connection error happened before the request was sent.
+
+    requests wraps the urllib3 error in a MaxRetryError, so the error's
+    arguments, reason and chained exceptions are searched for a
+    NewConnectionError, which name resolution failures subclass.
+    """
+    import requests
+    from urllib3.exceptions import NewConnectionError
+
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    seen = set()
+    causes = [error]
+    while causes:
+        cause = causes.pop()
+        if id(cause) in seen:
+            continue
+        seen.add(id(cause))
+        if isinstance(cause, NewConnectionError):
+            return True
+        linked = [*cause.args, getattr(cause, "reason", None), cause.__cause__, cause.__context__]
+        causes.extend(link for link in linked if isinstance(link, BaseException))
+    return False
+
+
+def _parse_retry_after(value):
+    """Parses a Retry-After header given in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    import email.utils
+
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
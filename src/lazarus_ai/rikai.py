@@ -6,24 +6,26 @@ will create a custom RikAI instance, using the model corresponding to
 the model_id over the standard RikAI model.
 """
 
+import contextlib
+import json
 import os
-import sys
-import requests
+import time
 
+from .image_preprocessor import ImagePreprocessor
 from .lazarus_auth import LazarusAuth
+from .responses import RikAIResult
+from .result_cache import ResultCache
 
-parent_dir = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
-sys.path.append(parent_dir)
-
-import utils
-
-BASE_URL = os.environ.get("BASE_URL", "https://api.lazarusforms.com/")
+from . import _utils
+from .errors import ValidationError
+from ._utils.config import BASE_URL
 
 
 class RikAI:
     """A class to post requests to all rikai/ endpoints."""
 
-    def __init__(self, auth: LazarusAuth, model_id=None):
+    def __init__(self, auth: LazarusAuth, model_id=None, cache: ResultCache = None, coalesce_window: float = None,
+                 typed_results: bool = False, preprocessor: ImagePreprocessor = None):
         """Initialize a RikAI() object.
 
         Without model_id, creates a RikAI() object that uses the standard
@@ -33,9 +35,23 @@ class RikAI:
         Args:
             auth (LazarusAuth): Holds authenticated header information
             model_id (str, optional): Custom model ID, defaults to None
+            cache (ResultCache, optional): Serves repeated requests for the
+                same document and arguments locally, defaults to None
+            coalesce_window (float, optional): Seconds to gather concurrent
+                ask_question calls about the same document into a single
+                request, defaults to None which sends every call on its own
+            typed_results (bool, optional): Return RikAIResult objects instead of
+                dicts, defaults to False
+            preprocessor (ImagePreprocessor, optional): Shrinks FILE_PATH
+                and BASE64 images before upload, defaults to None
         """
         self.headers = auth.headers
+        self.transport = auth.transport
         self.model_id = model_id
+        self.cache = cache
+        self.typed_results = typed_results
+        self.preprocessor = preprocessor
+        self._coalescer = _utils._QuestionCoalescer(coalesce_window) if coalesce_window is not None else None
 
 
     def ask_question(self, input_type: str, input_str: str, question: list, **kwargs):
@@ -45,6 +61,11 @@ class RikAI:
         the api/rikai endpoint. If a model_id was supplied on init, we post
         to the api/rikai/custom/{model_id} endpoint.
 
+        With a coalesce_window set, concurrent calls for the same document and
+        kwargs are sent as one request with the questions merged, and each
+        caller receives the answers to its own questions. Calls with a
+        webhook are always sent on their own.
+
         Args:
             input_type (str): Type of input expected [FILE_PATH, URL, BASE64]
             input_str (str): File to upload, expecting a file path, url, or a base64 encoded string
@@ -57,63 +78,229 @@ class RikAI:
                 return_ocr (bool): Set to True to add OCR results to the response, defaults to False
                 language (str): A 2 character language code or the name of the language you wish to translate answers into
         """
+        url, headers, kwargs = self._prepare_question(input_type, kwargs)
+
+        if self._coalescer is None or "webhook" in kwargs:
+            return self._result(self._ask(url, headers, input_type, input_str, question, kwargs))
+
+        key = (url, input_type, input_str, json.dumps(kwargs, sort_keys=True, default=str))
+        questions = [question] if isinstance(question, str) else list(question)
+        return self._result(self._coalescer.ask(
+            key, questions, lambda merged: self._ask(url, headers, input_type, input_str, merged, kwargs)))
+
+
+    def ask_question_stream(self, input_type: str, input_str: str, question: list, **kwargs):
+        """Posts a request to the relevant rikai/ endpoint, streaming the OCR pages.
+
+        return_ocr defaults to True. The response body is parsed as it
+        arrives. Iterating over the returned stream yields each page of
+        "ocrResults" as soon as it has been received, so peak memory is
+        bounded by a single page. The answers and other response fields are
+        available as stream.result once iteration has finished. Streamed
+        requests bypass coalescing, the result cache and single-flight.
+
+        Args:
+            input_type (str): Type of input expected [FILE_PATH, URL, BASE64]
+            input_str (str): File to upload, expecting a file path, url, or a base64 encoded string
+            question (list): A list of strings containing the question(s) to be asked
+            kwargs (dict, optional): Optional ask_question arguments
+        Returns:
+            _PageStream: Iterable of page dicts, closed once exhausted or on close()
+        """
+        url, headers, kwargs = self._prepare_question(input_type, {"return_ocr": True} | kwargs)
+        response = self._post_question(url, headers, input_type, input_str, question, kwargs, stream=True)
+
+        if response.ok:
+            return _utils._PageStream(response, on_complete=lambda result: _utils._record_metrics(
+                "rikai", self.headers, self.model_id, result, transport=self.transport))
+
+        _utils._record_metrics("rikai", self.headers, self.model_id, transport=self.transport)
+        _utils._error_handling(response)
+
+
+    def _prepare_question(self, input_type: str, kwargs: dict):
+        """Validates ask_question arguments, returning the url, headers and API kwargs."""
         url = f"{BASE_URL}/api/rikai"
-        possible_kwargs = ["file_id", "metadata", "webhook", "return_ocr", "language"]
+        validator = _utils._QUESTION_ARGS
         if self.model_id is not None:
             url += f"/custom/{self.model_id}"
-            possible_kwargs.append("settings")
+            validator = _utils._CUSTOM_QUESTION_ARGS
+
+        kwargs = validator.validate(kwargs)
 
-        kwargs = utils._validate_args(kwargs, possible_kwargs)
+        headers = self.headers | _utils._get_typed_headers(input_type)
+        return url, headers, kwargs
 
-        headers = self.headers | utils._get_typed_headers(input_type)
-        body = utils._get_typed_body(input_type, input_str)
 
-        if input_type == "FILE_PATH":
-            data = {"question": question} | kwargs
-            response = requests.post(url, headers=headers, files=body, data=data)
-        else:
-            body |= {"question": question} | kwargs
-            response = requests.post(url, headers=headers, json=body)
+    def _ask(self, url: str, headers: dict, input_type: str, input_str: str, question: list, kwargs: dict):
+        """Sends a validated question request, or serves it from the cache or an identical request in flight."""
+        request_key = self._request_key(url, input_type, input_str, {"question": question} | kwargs)
+        if self.cache is not None and request_key is not None and (cached := self.cache.get(request_key)) is not None:
+            return cached
+        return self.transport.deduplicate(
+            request_key, lambda: self._send_question(url, headers, input_type, input_str, question, kwargs, request_key))
+
+
+    def _send_question(self, url: str, headers: dict, input_type: str, input_str: str, question: list,
+                       kwargs: dict, request_key: str):
+        """Sends a validated question request and caches its response."""
+        start = time.monotonic()
+        response = self._post_question(url, headers, input_type, input_str, question, kwargs)
 
         if response.ok:
-            resp = response.json()
-            utils._record_metrics("rikai", self.headers, self.model_id, resp)
+            resp = _utils._decode_response(response)
+            _utils._record_metrics("rikai", self.headers, self.model_id, resp, transport=self.transport)
+            if self.cache is not None and request_key is not None:
+                self.cache.set(request_key, resp, time.monotonic() - start)
             return resp
 
-        utils._record_metrics("rikai", self.headers, self.model_id)
-        utils._error_handling(response)
+        _utils._record_metrics("rikai", self.headers, self.model_id, transport=self.transport)
+        _utils._error_handling(response)
+
+
+    def _post_question(self, url: str, headers: dict, input_type: str, input_str: str, question: list,
+                       kwargs: dict, stream: bool = False):
+        """Posts a validated question request and returns the raw response."""
+        fields = {"question": question} | kwargs
+        with self._preprocessed(input_type, input_str) as (input_type, input_str):
+            if input_type == "FILE_PATH":
+                # Stream the file from disk, closing it as soon as the request ends
+                with _utils._MultipartFileStream(input_str, fields) as body:
+                    headers |= {"Content-Type": body.content_type}
+                    return self.transport.post(url, model_id=self.model_id, headers=headers, data=body, idempotent="fileId" in kwargs, stream=stream)
+
+            body = _utils._get_typed_body(input_type, input_str) | fields
+            return self.transport.post(url, model_id=self.model_id, headers=headers, json=body, idempotent="fileId" in kwargs, stream=stream)
+
+
+    def _preprocessed(self, input_type: str, input_str: str):
+        """Returns a context manager yielding the input to upload, preprocessed if enabled."""
+        if self.preprocessor is None:
+            return contextlib.nullcontext((input_type, input_str))
+        return self.preprocessor.prepare(input_type, input_str)
+
+
+    def submit_question(self, listener, input_type: str, input_str: str, question: list, timeout: float = None, **kwargs):
+        """Submits a question in webhook mode and returns a Future.
+
+        The Future is returned at once. The request is sent on the
+        listener's send pool with the listener's URL as the webhook and a
+        file_id, generated unless one is supplied. The Future resolves with
+        the webhook payload when the matching callback arrives, or fails
+        with the APIError or ValidationError if the request is not accepted.
+
+        Args:
+            listener (WebhookListener): A started listener receiving callbacks
+            input_type (str): Type of input expected [FILE_PATH, URL, BASE64]
+            input_str (str): File to upload, expecting a file path, url, or a base64 encoded string
+            question (list): A list of strings containing the question(s) to be asked
+            timeout (float, optional): Seconds before the Future fails with
+                TimeoutError, defaults to the listener's default_timeout
+            kwargs (dict, optional): Optional ask_question arguments, except webhook
+        Returns:
+            Future: Resolves with the webhook payload
+        """
+        if "webhook" in kwargs:
+            raise ValidationError("submit_question sets the webhook to the listener's URL.")
+        send = lambda file_id: self.ask_question(input_type, input_str, question, file_id=file_id,
+                                                 webhook=listener.url, **kwargs)
+        return listener.submit(send, kwargs.pop("file_id", None), timeout)
+
+
+    def ask_question_batch(self, inputs, question: list, max_workers: int = 8, progress_callback=None) -> list:
+        """Runs ask_question on many documents in parallel.
+
+        The same question(s) are asked of every document. Calls are made on
+        a managed thread pool sharing this instance's connection pool.
+        Results are returned in input order. A failed document does not
+        abort the batch, its APIError or ValidationError is returned in
+        place of the response.
+
+        Args:
+            inputs (iterable): Tuples of (input_type, input_str) or
+                (input_type, input_str, kwargs), where kwargs holds the
+                optional ask_question arguments for that document
+            question (list): A list of strings containing the question(s) to be asked
+            max_workers (int, optional): Number of worker threads, defaults to 8
+            progress_callback (callable, optional): Called as
+                progress_callback(completed, total) after each document
+                finishes, defaults to None
+        Returns:
+            list: A response dict or an error object for every input
+        """
+        def ask(input_type, input_str, **kwargs):
+            return self.ask_question(input_type, input_str, question, **kwargs)
+
+        return _utils._run_batch(ask, inputs, max_workers, progress_callback)
 
 
     def summarize(self, input_type: str, input_str: str, fields: dict):
         """Posts a request to the rikai/summarize endpoint.
 
+        FILE_PATH inputs are base64 encoded while the request is sent, so
+        the file is never held in memory in full.
+
         Args:
-            input_type (str): Type of input expected [URL, BASE64]
-            input_str (str): File to upload, expecting a url or a base64 encoded string
+            input_type (str): Type of input expected [FILE_PATH, URL, BASE64]
+            input_str (str): File to upload, expecting a file path, url, or a base64 encoded string
             fields (dict): Required fields to prompt the summarizer
                 document_type (str): Type of document to summarize
                 summary_description (str): Description of what information should be included in the summary
                 secondary_description (str, optional): A secondary summary description, including this will return a secondary summary
                 json_format (str, optional): Specify a JSON output structure, content will be pulled from the resulting summary description
         """
-        if input_type == "FILE_PATH":
-            raise ValueError("Summarize only accepts \"URL\" and \"BASE64\" input types")
-
         url = f"{BASE_URL}/api/rikai/summarize"
-        fields = utils._validate_args(fields, ["secondary_description", "json_format"], ["document_type", "summary_description"])
+        fields = _utils._SUMMARIZE_FIELDS.validate(fields)
+
+        headers = self.headers | _utils._get_typed_headers(input_type)
+
+        request_key = self._request_key(url, input_type, input_str, {"fields": fields})
+        if self.cache is not None and request_key is not None and (cached := self.cache.get(request_key)) is not None:
+            return self._result(cached)
+        return self._result(self.transport.deduplicate(
+            request_key, lambda: self._send_summarize(url, headers, input_type, input_str, fields, request_key)))
+
 
-        headers = self.headers | utils._get_typed_headers(input_type)
-        body = utils._get_typed_body(input_type, input_str) | {"fields": fields}
+    def _send_summarize(self, url: str, headers: dict, input_type: str, input_str: str, fields: dict, request_key: str):
+        """Sends a validated summarize request and caches its response."""
+        start = time.monotonic()
 
-        response = requests.post(url, headers=headers, json=body)
+        with self._preprocessed(input_type, input_str) as (input_type, input_str):
+            if input_type == "FILE_PATH":
+                with _utils._Base64JSONStream(input_str, {"fields": fields}) as body:
+                    headers |= {"Content-Type": body.content_type}
+                    response = self.transport.post(url, model_id=self.model_id, headers=headers, data=body)
+            else:
+                body = _utils._get_typed_body(input_type, input_str) | {"fields": fields}
+                response = self.transport.post(url, model_id=self.model_id, headers=headers, json=body)
 
         if response.ok:
-            resp = response.json()
-            utils._record_metrics("rikai/summarizer", self.headers, self.model_id, resp)
+            resp = _utils._decode_response(response)
+            _utils._record_metrics("rikai/summarizer", self.headers, self.model_id, resp, transport=self.transport)
+            if self.cache is not None and request_key is not None:
+                self.cache.set(request_key, resp, time.monotonic() - start)
             return resp
 
-        utils._record_metrics("rikai/summarizer", self.headers, self.model_id)
-        utils._error_handling(response)
+        _utils._record_metrics("rikai/summarizer", self.headers, self.model_id, transport=self.transport)
+        _utils._error_handling(response)
+
+
+    def _result(self, resp: dict):
+        """Wraps a response in RikAIResult if typed results are enabled."""
+        return RikAIResult(resp) if self.typed_results else resp
+
+
+    def _request_key(self, url: str, input_type: str, input_str: str, params: dict):
+        """Returns the fingerprint used to cache or de-duplicate a request.
+
+        Returns None when neither a cache nor single-flight is enabled, as
+        fingerprinting a file reads it in full. Requests with a webhook are
+        never cached or shared, as serving them locally would skip the
+        webhook call.
+        """
+        if (self.cache is None and self.transport.flights is None) or "webhook" in params:
+            return None
+        return _utils._fingerprint(url, self.model_id, input_type, input_str, params)
 
 
 # RikAI class usage examples
@@ -148,6 +335,8 @@ if __name__ == "__main__":
     response = rikai.summarize("URL", "https://fileurl.com", fields)
     # Upload a file using a Base64 encoded string
     response = rikai.summarize("BASE64", "base64_encoded_string", fields)
+    # Upload a file using a local file path
+    response = rikai.summarize("FILE_PATH", "/path/to/file.pdf", fields)
 
     # Upload a file using optional args
     kwargs = {
@@ -162,3 +351,22 @@ if __name__ == "__main__":
     }
     rikai.ask_question("URL", "https://fileurl.com", questions, **kwargs)
     rikai.ask_question("URL", "https://fileurl.com", questions, return_ocr=True, language="Japanese")
+
+    # Ask the same questions of many files in parallel
+    inputs = [("FILE_PATH", "/path/to/file.pdf"), ("URL", "https://fileurl.com", {"language": "Japanese"})]
+    responses = rikai.ask_question_batch(inputs, questions, max_workers=16)
+
+    # Merge questions asked about the same document within 50 ms into one request
+    coalescing_rikai = RikAI(auth, coalesce_window=0.05)
+    response = coalescing_rikai.ask_question("URL", "https://fileurl.com", ["What is this document about?"])
+
+    # Return typed results, only answers are built when the OCR pages are not used
+    typed_rikai = RikAI(auth, typed_results=True)
+    result = typed_rikai.ask_question("URL", "https://fileurl.com", questions, return_ocr=True)
+    answers = [answer.answer for answer in result.answers]
+
+    # Stream the OCR pages of a large document as they arrive, then read the answers
+    with rikai.ask_question_stream("FILE_PATH", "/path/to/large_file.pdf", questions) as stream:
+        for page in stream:
+            print(page["page"])
+    print(stream.result["data"])
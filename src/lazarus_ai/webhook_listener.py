@@ -0,0 +1,326 @@
+"""Class: WebhookListener
+
+A lightweight local HTTP server that receives Lazarus webhook callbacks and
+resolves a Future for each submitted document. Forms.submit_ocr and
+RikAI.submit_question return a Future at once, and their requests are sent
+with a generated file_id and the listener's URL as the webhook on a small
+pool of send threads. A thread is only held while a document is uploaded,
+never while it waits for its callback, so one process can keep thousands
+of documents in flight. A request that fails to send fails its Future.
+
+The listener runs an asyncio server on a daemon thread. It binds to
+127.0.0.1 unless another host is given. The API must be able to reach it,
+so bind host="0.0.0.0" or put it behind a proxy, and when running behind
+NAT or a load balancer pass the externally reachable address as
+public_url. A random token is added to the webhook URL and callbacks
+without it are rejected, so other peers cannot resolve pending Futures.
+"""
+
+import hmac
+import json
+import secrets
+import threading
+import uuid
+from urllib.parse import parse_qs
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import asyncio
+
+MAX_HEADER_BYTES = 64 * 1024
+# Webhook payloads carry full OCR results, larger bodies are rejected unread
+MAX_BODY_BYTES = 32 * 1024 * 1024
+# Requests sent at once by a listener's send pool
+MAX_SENDS = 16
+
+# Response fields that may carry the file_id of the finished document
+FILE_ID_FIELDS = ("documentId", "fileId", "file_id")
+
+
+class WebhookListener:
+    """A local webhook receiver correlating callbacks by file_id.
+
+    Attributes:
+        host (str): Interface the server binds to
+        port (int): Port the server listens on, assigned on start if 0
+        path (str): URL path callbacks are accepted on
+        public_url (str): Webhook URL sent to the API, without the token
+        default_timeout (float): Seconds before a pending Future fails
+        token (str): Secret every callback must carry in its query string
+        max_body_bytes (int): Largest callback body accepted
+        max_sends (int): Requests submit() sends at once
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, path: str = "/lazarus-webhook",
+                 public_url: str = None, default_timeout: float = None, token: str = None,
+                 max_body_bytes: int = MAX_BODY_BYTES, max_sends: int = MAX_SENDS):
+        """Initialize a WebhookListener() object.
+
+        Args:
+            host (str, optional): Interface to bind, defaults to "127.0.0.1"
+            port (int, optional): Port to listen on, defaults to 0 which
+                picks a free port
+            path (str, optional): URL path callbacks are accepted on,
+                defaults to "/lazarus-webhook"
+            public_url (str, optional): Externally reachable webhook URL,
+                defaults to http://{host}:{port}{path}
+            default_timeout (float, optional): Seconds before a pending
+                Future fails with TimeoutError, defaults to None
+            token (str, optional): Secret added to the webhook URL as
+                ?token=, defaults to a new random token
+            max_body_bytes (int, optional): Callbacks with a larger body are
+                rejected with 413, defaults to MAX_BODY_BYTES
+            max_sends (int, optional): Threads sending submitted requests,
+                defaults to MAX_SENDS
+        """
+        if max_sends < 1:
+            raise ValueError("max_sends must be at least 1.")
+        self.host = host
+        self.port = port
+        self.path = path
+        self.public_url = public_url
+        self.default_timeout = default_timeout
+        self.token = token or secrets.token_urlsafe(16)
+        self.max_body_bytes = max_body_bytes
+        self.max_sends = max_sends
+
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._loop = None
+        self._server = None
+        self._thread = None
+        self._sender = None
+        self._stats = {"received": 0, "resolved": 0, "unmatched": 0, "rejected": 0, "timed_out": 0,
+                       "send_failed": 0}
+
+
+    @property
+    def url(self) -> str:
+        """Returns the webhook URL sent to the API, including the token."""
+        url = self.public_url or f"http://{self.host}:{self.port}{self.path}"
+        return f"{url}{'&' if '?' in url else '?'}token={self.token}"
+
+
+    def start(self):
+        """Starts the server on a daemon thread, returning once it listens."""
+        if self._thread is not None:
+            return self
+        # Deferred so importing the library does not load the event loop machinery
+        import asyncio
+        from concurrent.futures import ThreadPoolExecutor
+
+        started = threading.Event()
+        errors = []
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            try:
+                self._server = self._loop.run_until_complete(
+                    asyncio.start_server(self._handle, self.host, self.port))
+                self.port = self._server.sockets[0].getsockname()[1]
+            except OSError as e:
+                errors.append(e)
+                started.set()
+                return
+            started.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name="lazarus-webhook", daemon=True)
+        self._thread.start()
+        started.wait()
+        if errors:
+            self._thread = None
+            raise errors[0]
+        self._sender = ThreadPoolExecutor(self.max_sends, thread_name_prefix="lazarus-webhook-send")
+        return self
+
+
+    def stop(self):
+        """Stops the server and fails every pending Future.
+
+        Requests already being sent are finished first, while submitted
+        requests not yet sent are dropped.
+        """
+        if self._thread is None:
+            return
+        import asyncio
+
+        self._sender.shutdown(wait=True, cancel_futures=True)
+        self._sender = None
+
+        async def shutdown():
+            self._server.close()
+            await self._server.wait_closed()
+
+        asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._thread = None
+
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            future.set_exception(RuntimeError("Webhook listener stopped before a callback arrived."))
+
+
+    def register(self, file_id: str = None, timeout: float = None):
+        """Creates a Future resolved by the callback for file_id.
+
+        Args:
+            file_id (str, optional): ID sent with the request, defaults to a
+                new random ID
+            timeout (float, optional): Seconds before the Future fails with
+                TimeoutError, defaults to default_timeout
+        Returns:
+            tuple: (file_id, Future)
+        """
+        if self._thread is None:
+            raise RuntimeError("Start the webhook listener before submitting requests.")
+        from concurrent.futures import Future
+
+        file_id = file_id or uuid.uuid4().hex
+        future = Future()
+        future.set_running_or_notify_cancel()
+        timeout = timeout if timeout is not None else self.default_timeout
+
+        with self._lock:
+            if file_id in self._pending:
+                raise ValueError(f"A request with file_id {file_id} is already pending.")
+            self._pending[file_id] = future
+        if timeout is not None:
+            self._loop.call_soon_threadsafe(self._loop.call_later, timeout, self._expire, file_id)
+        return file_id, future
+
+
+    def submit(self, send, file_id: str = None, timeout: float = None):
+        """Registers file_id and sends its request on the send pool.
+
+        Returns without waiting for the request. If send raises, the
+        Future fails with its exception instead of the caller.
+
+        Args:
+            send (callable): Sends the request, called as send(file_id)
+            file_id (str, optional): ID sent with the request, defaults to a
+                new random ID
+            timeout (float, optional): Seconds before the Future fails with
+                TimeoutError, defaults to default_timeout
+        Returns:
+            Future: Resolves with the webhook payload
+        """
+        sender = self._sender
+        file_id, future = self.register(file_id, timeout)
+
+        def run():
+            try:
+                send(file_id)
+            except Exception as e:
+                self._fail(file_id, e)
+
+        try:
+            sender.submit(run)
+        except RuntimeError:
+            # The listener was stopped meanwhile
+            self.discard(file_id)
+            raise
+        return future
+
+
+    def discard(self, file_id: str):
+        """Forgets a pending file_id, used when its request failed to send."""
+        with self._lock:
+            self._pending.pop(file_id, None)
+
+
+    def stats(self) -> dict:
+        """Returns callback counters and the number of pending Futures."""
+        with self._lock:
+            return self._stats | {"pending": len(self._pending)}
+
+
+    def _fail(self, file_id: str, error: Exception):
+        """Fails the Future of a request that could not be sent."""
+        with self._lock:
+            future = self._pending.pop(file_id, None)
+            self._stats["send_failed"] += 1
+        if future is not None:
+            future.set_exception(error)
+
+
+    def _expire(self, file_id: str):
+        with self._lock:
+            future = self._pending.pop(file_id, None)
+            if future is not None:
+                self._stats["timed_out"] += 1
+        if future is not None:
+            future.set_exception(TimeoutError(f"No webhook callback received for file_id {file_id}."))
+
+
+    def _authorized(self, token: str) -> bool:
+        """Checks a callback's token, counting rejected callbacks."""
+        if hmac.compare_digest(token.encode(), self.token.encode()):
+            return True
+        with self._lock:
+            self._stats["rejected"] += 1
+        return False
+
+
+    def _resolve(self, payload):
+        """Resolves the Future matching the callback payload."""
+        file_id = None
+        if isinstance(payload, dict):
+            file_id = next((payload[key] for key in FILE_ID_FIELDS if key in payload), None)
+        with self._lock:
+            self._stats["received"] += 1
+            future = self._pending.pop(file_id, None) if file_id is not None else None
+            self._stats["resolved" if future is not None else "unmatched"] += 1
+        if future is not None:
+            future.set_result(payload)
+
+
+    async def _handle(self, reader: "asyncio.StreamReader", writer: "asyncio.StreamWriter"):
+        """Handles a single HTTP request on the listener."""
+        import asyncio
+
+        status = "200 OK"
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+            if len(head) > MAX_HEADER_BYTES:
+                raise ValueError("Request headers too large")
+            request_line, *header_lines = head.decode("latin-1").split("\r\n")
+            method, target, _ = request_line.split(" ", 2)
+            headers = {}
+            for line in header_lines:
+                if ":" in line:
+                    name, value = line.split(":", 1)
+                    headers[name.strip().lower()] = value.strip()
+
+            path, _, query = target.partition("?")
+            length = int(headers.get("content-length", 0))
+            if length < 0:
+                raise ValueError("Negative Content-Length")
+            if method != "POST" or path != self.path:
+                status = "404 Not Found"
+            elif not self._authorized(parse_qs(query).get("token", [""])[0]):
+                # Checked before the body is read, so forged callbacks cost nothing
+                status = "403 Forbidden"
+            elif length > self.max_body_bytes:
+                status = "413 Content Too Large"
+            else:
+                self._resolve(json.loads(await reader.readexactly(length)))
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError, UnicodeDecodeError):
+            status = "400 Bad Request"
+
+        writer.write(f"HTTP/1.1 {status}\r\nContent-Length: 0\r\nConnection: close\r\n\r\n".encode())
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+
+    def __enter__(self):
+        return self.start()
+
+
+    def __exit__(self, *exc_info):
+        self.stop()
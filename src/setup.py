@@ -1,7 +1,7 @@
 from setuptools import setup, find_packages
 setup(
   name = 'lazarus-ai',
-  packages = ['lazarus_ai', 'errors', 'utils'],
+  packages = find_packages(),
   version = '1.0.0',
   license='MIT',
   description = 'Lazarus AI Python Library',
@@ -9,10 +9,16 @@ setup(
   author_email = 'caroline@lazarus.enterprises, kathleen@lazarus.enterprises, alvin@lazarus.enterprises',
   url = 'https://www.lazarusforms.com/',
   download_url = 'https://github.com/Lazarus-AI/lazarus-ai-python/archive/refs/tags/v1.0.0.tar.gz',
+  python_requires='>=3.10',
   install_requires=[
           'requests',
-          'stringcase',
   ],
+  extras_require={
+          'async': ['httpx'],
+          'fast': ['orjson'],
+          'images': ['pillow'],
+          'pdf': ['pypdf'],
+  },
   project_urls={
     "Bug Tracker": "https://github.com/Lazarus-AI/lazarus-ai-python/issues",
     "Documentation": "https://lazarus.stoplight.io/docs/lazarus-forms/welcome",
@@ -21,6 +27,9 @@ setup(
   classifiers=[
     'License :: OSI Approved :: MIT License',
     'Programming Language :: Python :: 3',
-    'Programming Language :: Python :: 3.7',
+    'Programming Language :: Python :: 3.10',
+    'Programming Language :: Python :: 3.11',
+    'Programming Language :: Python :: 3.12',
+    'Programming Language :: Python :: 3.13',
   ],
 )
@@ -1,4 +0,0 @@
-from .args_validation import _validate_args
-from .error_handling import _error_handling
-from .input_types import _get_typed_headers, _get_typed_body, _get_multipart_data
-from .metrics import _record_metrics
@@ -1,12 +1,8 @@
 """ Integration testing the Forms class """
 
 import os
-import sys
 
-parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
-sys.path.append(parent_dir)
-
-from src import LazarusAuth, Forms
+from lazarus_ai import LazarusAuth, Forms
 
 
 def get_b64_test_file(path: str):
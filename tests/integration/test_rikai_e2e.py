@@ -1,12 +1,8 @@
 """ Integration testing the RikAI class """
 
 import os
-import sys
 
-parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
-sys.path.append(parent_dir)
-
-from src import LazarusAuth, RikAI
+from lazarus_ai import LazarusAuth, RikAI
 
 def get_b64_test_file(path: str):
     with open(os.path.join(os.path.abspath(""), path)) as f:
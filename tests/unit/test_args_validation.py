@@ -0,0 +1,44 @@
+""" Unit testing the argument validators """
+
+import pytest
+
+from lazarus_ai import _utils
+from lazarus_ai.errors import ValidationError
+
+
+def test_camel_case_keys() -> None:
+    """ Tests that valid keys are converted to the API's camelCase names """
+    args = {"file_id": "abc", "metadata": {"a": 1}, "return_ocr": True, "language": "fr"}
+    assert _utils._QUESTION_ARGS.validate(args) == {"fileId": "abc", "metadata": {"a": 1},
+                                                   "returnOCR": True, "language": "fr"}
+    assert _utils._SUMMARIZE_FIELDS.validate({"document_type": "invoice", "json_format": "{}"}) == \
+        {"documentType": "invoice", "jsonFormat": "{}"}
+
+
+def test_invalid_keys() -> None:
+    """ Tests that every unexpected key is reported in order """
+    with pytest.raises(ValidationError, match="not valid arguments: color, size"):
+        _utils._OCR_ARGS.validate({"color": 1, "file_id": "abc", "size": 2})
+
+
+def test_custom_only_keys() -> None:
+    """ Tests that settings are only accepted by custom RikAI models """
+    with pytest.raises(ValidationError):
+        _utils._QUESTION_ARGS.validate({"settings": {}})
+    assert _utils._CUSTOM_QUESTION_ARGS.validate({"settings": {}}) == {"settings": {}}
+
+
+def test_validator_options() -> None:
+    """ Tests ignored keys and disabling the case change """
+    validator = _utils._ArgsValidator(["page_count"], ["document_type"], change_case=False)
+    args = {"page_count": 2, "document_type": "form"}
+    assert validator.validate(args) == args
+    assert validator.valid_keys == frozenset({"page_count"})
+
+
+def test_validate_args() -> None:
+    """ Tests the one-off validation helper """
+    assert _utils._validate_args({"file_id": "abc"}, ["file_id"]) == {"fileId": "abc"}
+    assert _utils._validate_args({}, []) == {}
+    with pytest.raises(ValidationError):
+        _utils._validate_args({"file_id": "abc"}, [])
@@ -0,0 +1,160 @@
+""" Unit testing the AsyncLazarusAuth, AsyncForms and AsyncRikAI classes """
+
+import asyncio
+import base64
+import json
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from lazarus_ai import AsyncLazarusAuth, AsyncForms, AsyncRikAI
+from lazarus_ai.errors import ValidationError, APIError, InvalidAuthError
+
+INPUT_URL = "https://fileurl.com/sample.pdf"
+FILE_PATH = "tests/resources/sample_form.pdf"
+
+
+def make_auth(handler, **kwargs):
+    """ Creates an AsyncLazarusAuth whose client is served by handler """
+    auth = AsyncLazarusAuth("org_id", "auth_key", **kwargs)
+    auth._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return auth
+
+
+class TestAsyncClient():
+    """ Unit tests for the async client classes """
+
+    def test_run_ocr_ok(self) -> None:
+        """ Test successful call to run_ocr with camelCased kwargs """
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json={"status": "SUCCESS"})
+
+        forms = AsyncForms(make_auth(handler))
+        resp = asyncio.run(forms.run_ocr("URL", INPUT_URL, file_id="file_id"))
+
+        assert resp == {"status": "SUCCESS"}
+        assert requests[0].url.path.endswith("/api/forms/generic")
+        assert json.loads(requests[0].content) == {"inputUrl": INPUT_URL, "fileId": "file_id"}
+        stats = forms.auth.client_stats.stats()[requests[0].url.path]
+        assert (stats["requests"], stats["bytes_sent"]) == (1, len(requests[0].content))
+
+
+    def test_run_ocr_file_path_ok(self) -> None:
+        """ Test FILE_PATH uploads are sent as multipart form data """
+        def handler(request):
+            assert request.headers["Content-Type"].startswith("multipart/form-data")
+            return httpx.Response(200, json={"status": "SUCCESS"})
+
+        forms = AsyncForms(make_auth(handler), "model")
+        resp = asyncio.run(forms.run_ocr("FILE_PATH", FILE_PATH, metadata={"foo": "bar"}))
+
+        assert resp == {"status": "SUCCESS"}
+
+
+    def test_file_path_streamed_off_loop(self, monkeypatch) -> None:
+        """ Test FILE_PATH documents are streamed from worker threads, not read on the event loop """
+        import threading
+        from lazarus_ai import _utils
+
+        threads = []
+        read = _utils._MultipartFileStream.read
+
+        def record(self, size=-1):
+            threads.append(threading.current_thread())
+            return read(self, size)
+
+        monkeypatch.setattr(_utils._MultipartFileStream, "read", record)
+
+        def handler(request):
+            body = request.read()
+            assert body.count(b"%PDF") == 1
+            assert int(request.headers["Content-Length"]) == len(body)
+            return httpx.Response(200, json={"status": "SUCCESS", "data": []})
+
+        rikai = AsyncRikAI(make_auth(handler))
+        assert asyncio.run(rikai.ask_question("FILE_PATH", FILE_PATH, ["Question?"]))["status"] == "SUCCESS"
+        assert len(threads) > 1
+        assert threading.main_thread() not in threads
+
+
+    def test_summarize_file_path(self) -> None:
+        """ Test summarize accepts FILE_PATH like the sync client, sending it as base64 JSON """
+        with open(FILE_PATH, "rb") as f:
+            encoded = base64.b64encode(f.read()).decode()
+        fields = {"document_type": "Medical form", "summary_description": "Patient info"}
+
+        def handler(request):
+            assert json.loads(request.read())["base64"] == encoded
+            return httpx.Response(200, json={"status": "SUCCESS"})
+
+        rikai = AsyncRikAI(make_auth(handler))
+        assert asyncio.run(rikai.summarize("FILE_PATH", FILE_PATH, fields)) == {"status": "SUCCESS"}
+
+
+    def test_default_timeout(self) -> None:
+        """ Test the client has a finite timeout callers can override """
+        assert AsyncLazarusAuth("org_id", "auth_key").client.timeout.read == 300
+        assert AsyncLazarusAuth("org_id", "auth_key", timeout=5).client.timeout.connect == 5
+
+
+    def test_run_ocr_kwargs_bad(self) -> None:
+        """ Test bad kwargs are rejected before a request is sent """
+        def handler(request):
+            raise AssertionError("No request expected")
+
+        forms = AsyncForms(make_auth(handler))
+        with pytest.raises(ValidationError):
+            asyncio.run(forms.run_ocr("URL", INPUT_URL, badKwarg="bad"))
+
+
+    def test_ask_question_error(self) -> None:
+        """ Test failed responses are mapped to APIError """
+        def handler(request):
+            return httpx.Response(500, json={"status": "FAILURE", "message": "Server error"})
+
+        rikai = AsyncRikAI(make_auth(handler))
+        with pytest.raises(APIError) as e:
+            asyncio.run(rikai.ask_question("URL", INPUT_URL, ["Question"]))
+
+        assert e.value.code == 500
+        assert e.value.message == "Server error"
+
+
+    def test_in_flight_bounded(self) -> None:
+        """ Test the semaphore caps the number of concurrent requests """
+        in_flight = 0
+        peak = 0
+
+        async def handler(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200, json={"status": "SUCCESS"})
+
+        async def run():
+            rikai = AsyncRikAI(make_auth(handler, max_in_flight=3))
+            fields = {"document_type": "Medical form", "summary_description": "Patient info"}
+            return await asyncio.gather(*(rikai.summarize("URL", INPUT_URL, fields) for _ in range(10)))
+
+        responses = asyncio.run(run())
+
+        assert len(responses) == 10
+        assert peak == 3
+
+
+    def test_authenticate_bad(self) -> None:
+        """ Test a 403 on authenticate raises InvalidAuthError """
+        def handler(request):
+            return httpx.Response(403, json={"status": "AUTH_FAILURE", "message": "Invalid"})
+
+        async def run():
+            async with make_auth(handler):
+                pass
+
+        with pytest.raises(InvalidAuthError):
+            asyncio.run(run())
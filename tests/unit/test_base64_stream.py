@@ -0,0 +1,67 @@
+""" Unit testing the streaming base64 JSON body encoder """
+
+import os
+import io
+import base64
+import json
+import tracemalloc
+import pytest
+
+from lazarus_ai import _utils
+
+
+FILE_PATH = "tests/resources/sample_form.pdf"
+
+
+@pytest.mark.parametrize("chunk_size", [3, 1000, 48 * 1024])
+def test_base64_stream_body(chunk_size):
+    """ Tests the streamed body is the JSON a full encode would produce """
+    with open(FILE_PATH, "rb") as f:
+        content = f.read()
+
+    fields = {"fields": {"documentType": "Medical form"}}
+    with _utils._Base64JSONStream(FILE_PATH, fields, chunk_size=chunk_size) as stream:
+        body = b"".join(stream)
+
+    assert len(body) == len(stream)
+    assert json.loads(body) == {"base64": base64.b64encode(content).decode()} | fields
+
+
+def test_base64_stream_file_object():
+    """ Tests file objects are encoded from their current position """
+    source = io.BytesIO(b"skip" + b"document bytes")
+    source.seek(4)
+    stream = _utils._Base64JSONStream(source)
+    body = b"".join(stream)
+
+    assert json.loads(body) == {"base64": base64.b64encode(b"document bytes").decode()}
+    stream.close()
+    assert not source.closed
+
+
+def test_base64_stream_bad_path():
+    """ Tests invalid extensions and missing files are rejected """
+    with pytest.raises(ValueError):
+        _utils._Base64JSONStream("bad_extension")
+
+    with pytest.raises(FileNotFoundError):
+        _utils._Base64JSONStream("bad_path.pdf")
+
+
+def test_base64_stream_memory_flat(tmp_path):
+    """ Tests peak memory stays bounded by the chunk size """
+    path = tmp_path / "large.pdf"
+    with open(path, "wb") as f:
+        for _ in range(16):
+            f.write(os.urandom(1024 * 1024))
+
+    tracemalloc.start()
+    with _utils._Base64JSONStream(str(path), {"fields": {}}) as stream:
+        sent = 0
+        while chunk := stream.read(8192):
+            sent += len(chunk)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert sent == len(stream)
+    assert peak < 512 * 1024
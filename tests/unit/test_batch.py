@@ -0,0 +1,56 @@
+""" Unit testing the batch helper used by run_ocr_batch and ask_question_batch """
+
+import time
+import pytest
+
+from lazarus_ai import _utils
+from lazarus_ai.errors import APIError, ValidationError
+
+
+def fake_call(input_type, input_str, **kwargs):
+    """ Echoes its input, sleeping longer for earlier items """
+    if input_str == "api_error":
+        raise APIError("FAILURE", "Server error", 500)
+    if input_str == "missing.pdf":
+        raise FileNotFoundError(input_str)
+    time.sleep(0.01 * (5 - int(input_str)))
+    return {"input": input_str} | kwargs
+
+
+def test_run_batch_order():
+    """ Tests results are returned in input order """
+    inputs = [("URL", str(i)) for i in range(5)]
+    results = _utils._run_batch(fake_call, inputs, max_workers=5)
+
+    assert results == [{"input": str(i)} for i in range(5)]
+
+
+def test_run_batch_kwargs():
+    """ Tests per-item kwargs are passed to each call """
+    results = _utils._run_batch(fake_call, [("URL", "1", {"file_id": "a"}), ("URL", "2")])
+
+    assert results == [{"input": "1", "file_id": "a"}, {"input": "2"}]
+
+
+def test_run_batch_errors_per_item():
+    """ Tests failures are returned in place instead of aborting the batch """
+    inputs = [("URL", "1"), ("URL", "api_error"), ("FILE_PATH", "missing.pdf")]
+    results = _utils._run_batch(fake_call, inputs, max_workers=2)
+
+    assert results[0] == {"input": "1"}
+    assert isinstance(results[1], APIError) and results[1].code == 500
+    assert isinstance(results[2], ValidationError)
+
+
+def test_run_batch_progress():
+    """ Tests the progress callback sees every completion """
+    progress = []
+    _utils._run_batch(fake_call, [("URL", str(i)) for i in range(4)], 2, lambda done, total: progress.append((done, total)))
+
+    assert progress == [(1, 4), (2, 4), (3, 4), (4, 4)]
+
+
+def test_run_batch_bad_input():
+    """ Tests malformed inputs are rejected before any call is made """
+    with pytest.raises(ValidationError):
+        _utils._run_batch(fake_call, ["URL"])
@@ -0,0 +1,128 @@
+""" Unit testing the bulk command line interface """
+
+import json
+import os
+import shutil
+import time
+import pytest
+
+from lazarus_ai import cli
+
+BASE_URL = os.environ.get("BASE_URL")
+FILE_PATH = "tests/resources/sample_form.pdf"
+CREDENTIALS = ["--org-id", "org_id", "--auth-key", "auth_key", "--quiet"]
+
+
+@pytest.fixture
+def documents(tmp_path):
+    """ A directory of three PDFs, a nested image and an unsupported file """
+    for name in ("a.pdf", "b.pdf", "c.pdf", "nested/d.png"):
+        os.makedirs((tmp_path / name).parent, exist_ok=True)
+        shutil.copy(FILE_PATH, tmp_path / name)
+    (tmp_path / "notes.txt").write_text("skip me")
+    return tmp_path
+
+
+def read_jsonl(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+class TestCLI():
+    """ Unit tests for the bulk CLI """
+
+    def test_find_documents(self, documents) -> None:
+        """ Test directories and globs are filtered with FILE_EXTENSIONS """
+        names = lambda paths: [os.path.relpath(path, documents) for path in paths]
+
+        assert names(cli._find_documents([str(documents)])) == ["a.pdf", "b.pdf", "c.pdf"]
+        assert names(cli._find_documents([str(documents)], recursive=True)) == \
+            ["a.pdf", "b.pdf", "c.pdf", os.path.join("nested", "d.png")]
+        assert names(cli._find_documents([str(documents / "**" / "*"), str(documents / "a.pdf")])) == \
+            ["a.pdf", "b.pdf", "c.pdf", os.path.join("nested", "d.png")]
+
+
+    def test_forms_results(self, documents, requests_mock) -> None:
+        """ Test every document is sent and its result written as it finishes """
+        requests_mock.post(f"{BASE_URL}/api/forms/custom/model", json={"status": "SUCCESS"})
+        output = documents / "out.jsonl"
+
+        assert cli.main([str(documents), "-o", str(output), "--model", "model", "-c", "2"] + CREDENTIALS) == 0
+
+        results = read_jsonl(output)
+        assert sorted(os.path.basename(result["path"]) for result in results) == ["a.pdf", "b.pdf", "c.pdf"]
+        assert all(result["response"] == {"status": "SUCCESS"} for result in results)
+        assert requests_mock.call_count == 3
+
+
+    def test_resume(self, documents, requests_mock) -> None:
+        """ Test a second run skips finished documents and retries failed ones """
+        requests_mock.post(f"{BASE_URL}/api/rikai", [{"json": {"status": "SUCCESS", "data": []}},
+                                                     {"status_code": 500, "json": {"message": "Down"}},
+                                                     {"json": {"status": "SUCCESS", "data": []}},
+                                                     {"json": {"status": "SUCCESS", "data": []}}])
+        output = documents / "out.jsonl"
+        args = [str(documents), "-o", str(output), "-q", "Total?", "-c", "1"] + CREDENTIALS
+
+        assert cli.main(args) == 1
+        failed = [result for result in read_jsonl(output) if "error" in result]
+        assert len(failed) == 1 and failed[0]["error"]["code"] == 500
+        assert requests_mock.call_count == 3
+
+        assert cli.main(args) == 0
+        assert requests_mock.call_count == 4
+        assert read_jsonl(output)[-1]["path"] == failed[0]["path"]
+
+        # Modified documents are sent again
+        with open(failed[0]["path"], "ab") as f:
+            f.write(b"\n")
+        requests_mock.post(f"{BASE_URL}/api/rikai", json={"status": "SUCCESS", "data": []})
+        assert cli.main(args) == 0
+        assert requests_mock.call_count == 5
+
+
+    def test_interrupt_keeps_in_flight_results(self, documents, requests_mock, monkeypatch) -> None:
+        """ Test results of requests in flight when interrupted are still written """
+        def slow(request, context):
+            time.sleep(0.1)
+            return {"status": "SUCCESS"}
+
+        calls = []
+
+        def interrupt(self, ok):
+            # Ctrl-C arrives once, after the first result is written
+            calls.append(ok)
+            if len(calls) == 1:
+                raise KeyboardInterrupt
+
+        requests_mock.post(f"{BASE_URL}/api/forms/generic", json=slow)
+        monkeypatch.setattr(cli._Progress, "update", interrupt)
+        output = documents / "out.jsonl"
+
+        assert cli.main([str(documents), "-o", str(output), "-c", "3"] + CREDENTIALS) == 130
+        assert requests_mock.call_count == 3
+        assert len(read_jsonl(output)) == 3
+        assert len(cli._read_manifest(f"{output}.manifest")) == 3
+
+
+    def test_vanished_document(self, documents) -> None:
+        """ Test a document removed after it was found is skipped """
+        assert cli._document_key(str(documents / "missing.pdf")) is None
+
+
+    def test_torn_manifest(self, tmp_path) -> None:
+        """ Test a partially written manifest line is ignored """
+        manifest = tmp_path / "out.jsonl.manifest"
+        manifest.write_text('{"key": "a", "ok": true}\n{"key": "b", "ok": false}\n{"key": "c", "o')
+
+        assert cli._read_manifest(str(manifest)) == {"a"}
+
+
+    def test_missing_credentials(self, documents, monkeypatch) -> None:
+        """ Test the CLI exits with usage help when credentials are missing """
+        monkeypatch.delenv("LAZARUS_ORG_ID", raising=False)
+        monkeypatch.delenv("LAZARUS_AUTH_KEY", raising=False)
+
+        with pytest.raises(SystemExit) as e:
+            cli.main([str(documents)])
+        assert e.value.code == 2
@@ -0,0 +1,117 @@
+""" Unit testing the ClientStats class """
+
+import json
+import os
+import threading
+import time
+import pytest
+import requests
+
+from lazarus_ai import LazarusAuth, Forms, RikAI, ClientStats, RetryPolicy
+from lazarus_ai.errors import APIError
+from lazarus_ai import _utils
+
+BASE_URL = os.environ.get("BASE_URL")
+INPUT_URL = "https://fileurl.com/sample.pdf"
+REPLY = {"status": "SUCCESS", "data": []}
+
+
+class TestClientStats():
+    """ Unit tests for ClientStats class """
+
+    def test_counts_and_bytes(self, requests_mock) -> None:
+        """ Test requests, bytes and errors by APIError.code are aggregated per endpoint """
+        auth = LazarusAuth("org_id", "auth_key")
+        rikai = RikAI(auth)
+        requests_mock.post(f"{BASE_URL}/api/rikai", [{"json": REPLY}, {"json": REPLY},
+                                                      {"status_code": 503, "json": {"message": "Busy"}}])
+        requests_mock.post(f"{BASE_URL}/api/forms/generic", json={"status": "SUCCESS"})
+
+        rikai.ask_question("URL", INPUT_URL, ["Question?"])
+        rikai.ask_question("URL", INPUT_URL, ["Question?"])
+        with pytest.raises(APIError) as e:
+            rikai.ask_question("URL", INPUT_URL, ["Question?"])
+        Forms(auth).run_ocr("URL", INPUT_URL)
+
+        stats = auth.client_stats.stats()
+        assert set(stats) == {"/api/rikai", "/api/forms/generic"}
+        rikai_stats = stats["/api/rikai"]
+        assert rikai_stats["requests"] == 3
+        assert rikai_stats["in_flight"] == 0
+        assert rikai_stats["errors"] == {e.value.code: 1}
+        assert rikai_stats["bytes_sent"] == 3 * len(requests_mock.request_history[0].body)
+        assert rikai_stats["bytes_received"] == 2 * len(json.dumps(REPLY)) + len(json.dumps({"message": "Busy"}))
+        assert stats["/api/forms/generic"]["requests"] == 1
+
+
+    def test_retries_count_once(self, requests_mock, monkeypatch) -> None:
+        """ Test a retried request is recorded once, with the wait included """
+        monkeypatch.setattr(time, "sleep", lambda seconds: None)
+        auth = LazarusAuth("org_id", "auth_key", retry_policy=RetryPolicy(jitter=False))
+        requests_mock.post(f"{BASE_URL}/api/rikai", [{"status_code": 503}, {"json": REPLY}])
+
+        RikAI(auth).ask_question("URL", INPUT_URL, ["Question?"])
+
+        stats = auth.client_stats.stats()["/api/rikai"]
+        assert stats["requests"] == 1
+        assert stats["errors"] == {}
+
+
+    def test_connection_error(self) -> None:
+        """ Test failures without a response are counted by exception name """
+        stats = ClientStats()
+        transport = _utils.Transport(client_stats=stats)
+
+        with pytest.raises(requests.ConnectionError):
+            transport.post("http://127.0.0.1:1/api/rikai", json={})
+
+        assert stats.stats()["/api/rikai"]["errors"] == {"ConnectionError": 1}
+
+
+    def test_histogram_threads(self) -> None:
+        """ Test concurrent updates land in cumulative buckets without losing counts """
+        stats = ClientStats(buckets=(0.1, 1))
+
+        def record(seconds):
+            for _ in range(1000):
+                stats._finish("/api/rikai", time.perf_counter() - seconds, bytes_sent=1)
+
+        threads = [threading.Thread(target=record, args=(seconds,)) for seconds in (0.0, 0.5, 5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        endpoint = stats.stats()["/api/rikai"]
+        assert endpoint["requests"] == endpoint["bytes_sent"] == 3000
+        assert endpoint["latency"]["buckets"] == {0.1: 1000, 1.0: 2000, float("inf"): 3000}
+        assert endpoint["latency"]["sum"] >= 5500
+
+
+    def test_render_and_serve(self, requests_mock) -> None:
+        """ Test the Prometheus text format, served over HTTP """
+        stats = ClientStats(buckets=(1,))
+        stats._finish("/api/forms/custom/a\"b", time.perf_counter(), code=500, bytes_received=10)
+        requests_mock.real_http = True
+
+        url = stats.serve(port=0)
+        try:
+            response = requests.get(url)
+        finally:
+            stats.close()
+
+        assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+        text = response.text
+        assert text == stats.render_prometheus()
+        assert '# TYPE lazarus_request_duration_seconds histogram' in text
+        assert 'lazarus_requests_total{endpoint="/api/forms/custom/a\\"b"} 1' in text
+        assert 'lazarus_request_errors_total{endpoint="/api/forms/custom/a\\"b",code="500"} 1' in text
+        assert 'lazarus_request_duration_seconds_bucket{endpoint="/api/forms/custom/a\\"b",le="+Inf"} 1' in text
+        assert 'lazarus_response_bytes_received_total{endpoint="/api/forms/custom/a\\"b"} 10' in text
+        assert stats.url is None
+
+
+    def test_bad_buckets(self) -> None:
+        """ Test histogram bounds must increase """
+        with pytest.raises(ValueError):
+            ClientStats(buckets=(1, 0.5))
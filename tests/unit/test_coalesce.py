@@ -0,0 +1,85 @@
+""" Unit testing the question coalescer used by RikAI """
+
+import threading
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+
+from lazarus_ai import _utils
+from lazarus_ai.errors import APIError
+
+
+class FakeAPI:
+    """ Answers every question, recording the question lists sent """
+
+    def __init__(self, error=None):
+        self.sent = []
+        self.error = error
+        self.lock = threading.Lock()
+
+    def send(self, questions):
+        with self.lock:
+            self.sent.append(questions)
+        if self.error is not None:
+            raise self.error
+        return {"status": "SUCCESS", "data": [{"question": q, "answer": q.upper()} for q in questions]}
+
+
+def ask_concurrently(coalescer, api, calls):
+    with ThreadPoolExecutor(len(calls)) as pool:
+        futures = [pool.submit(coalescer.ask, key, questions, api.send) for key, questions in calls]
+        return [future.result() if future.exception() is None else future.exception() for future in futures]
+
+
+def test_coalesce_merges_questions():
+    """ Tests concurrent calls for one key share a request and get their own answers """
+    coalescer = _utils._QuestionCoalescer(0.2)
+    api = FakeAPI()
+    results = ask_concurrently(coalescer, api, [("doc", ["a"]), ("doc", ["b", "c"]), ("doc", ["d"])])
+
+    assert len(api.sent) == 1
+    assert sorted(api.sent[0]) == ["a", "b", "c", "d"]
+    assert [[item["answer"] for item in result["data"]] for result in results] == [["A"], ["B", "C"], ["D"]]
+    assert coalescer.stats() == {"calls": 3, "requests": 1}
+
+
+def test_coalesce_separate_keys():
+    """ Tests calls for different keys are sent separately """
+    coalescer = _utils._QuestionCoalescer(0.05)
+    api = FakeAPI()
+    results = ask_concurrently(coalescer, api, [("doc1", ["a"]), ("doc2", ["b"])])
+
+    assert len(api.sent) == 2
+    assert [result["data"][0]["answer"] for result in results] == ["A", "B"]
+
+
+def test_coalesce_max_questions():
+    """ Tests a full group is sent without waiting out the window """
+    coalescer = _utils._QuestionCoalescer(10, max_questions=2)
+    api = FakeAPI()
+    result = coalescer.ask("doc", ["a", "b"], api.send)
+
+    assert result["data"] == [{"question": "a", "answer": "A"}, {"question": "b", "answer": "B"}]
+
+
+def test_coalesce_error_shared():
+    """ Tests every caller in a group raises the request's exception """
+    coalescer = _utils._QuestionCoalescer(0.2)
+    api = FakeAPI(APIError("FAILURE", "Server error", 500))
+    results = ask_concurrently(coalescer, api, [("doc", ["a"]), ("doc", ["b"])])
+
+    assert len(api.sent) == 1
+    assert all(isinstance(result, APIError) for result in results)
+
+
+def test_coalesce_unsplittable_response():
+    """ Tests responses without one answer per question are returned whole """
+    coalescer = _utils._QuestionCoalescer(0)
+    response = coalescer.ask("doc", ["a", "b"], lambda questions: {"status": "SUCCESS", "data": ["only"]})
+
+    assert response == {"status": "SUCCESS", "data": ["only"]}
+
+
+def test_coalesce_bad_window():
+    """ Tests a negative window raises a ValueError """
+    with pytest.raises(ValueError):
+        _utils._QuestionCoalescer(-1)
@@ -1,18 +1,19 @@
 """ Unit testing the Forms class """
 
-import sys
 import os
+import base64
+import io
+import time
 import pytest
+from concurrent.futures import ThreadPoolExecutor
 import requests_mock
 
-parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
-sys.path.append(parent_dir)
-
-from src import LazarusAuth, Forms
-from errors import ValidationError
+from lazarus_ai import LazarusAuth, Forms, FormsResult, ResultCache
+from lazarus_ai.errors import PartialResultError, ValidationError
 
 BASE_URL = os.environ.get("BASE_URL")
 INPUT_URL = "https://firebasestorage.googleapis.com/v0/b/lazarus-apis-testing.appspot.com/o/examples%2FSample%20Form.pdf?alt=media&token=5b537052-ea54-4be4-9d36-9620ee994c1c"
+FILE_PATH_7_PAGES = "tests/resources/sample_7_pages.pdf"
 
 ORG_ID = os.environ.get("ORG_ID")
 AUTH_KEY = os.environ.get("AUTH_KEY")
@@ -57,3 +58,139 @@ class TestForms():
             forms.run_ocr("URL", INPUT_URL, **kwargs)
 
         assert not post_mock.called
+
+
+    def test_run_ocr_cached(self, requests_mock):
+        """ Test repeated calls are served from the result cache """
+        forms = Forms(AUTH, cache=ResultCache())
+        mock_response = {"status": "SUCCESS"}
+        post_mock = requests_mock.post(f"{BASE_URL}/api/forms/generic", json=mock_response)
+
+        assert forms.run_ocr("URL", INPUT_URL, file_id="a") == mock_response
+        assert forms.run_ocr("URL", INPUT_URL, file_id="a") == mock_response
+        assert forms.run_ocr("URL", INPUT_URL, file_id="b") == mock_response
+
+        assert post_mock.call_count == 2
+        assert forms.cache.stats()["hits"] == 1
+
+
+    def test_run_ocr_webhook_not_cached(self, requests_mock):
+        """ Test webhook calls always reach the API """
+        forms = Forms(AUTH, cache=ResultCache())
+        post_mock = requests_mock.post(f"{BASE_URL}/api/forms/generic", json={"status": "SUCCESS"})
+
+        forms.run_ocr("URL", INPUT_URL, webhook="url")
+        forms.run_ocr("URL", INPUT_URL, webhook="url")
+
+        assert post_mock.call_count == 2
+
+
+    def test_run_ocr_single_flight(self, requests_mock):
+        """ Test concurrent identical calls share one request """
+        forms = Forms(LazarusAuth(ORG_ID, AUTH_KEY, single_flight=True))
+
+        def respond(request, context):
+            time.sleep(0.2)
+            return {"status": "SUCCESS"}
+
+        post_mock = requests_mock.post(f"{BASE_URL}/api/forms/generic", json=respond)
+
+        with ThreadPoolExecutor(4) as pool:
+            results = list(pool.map(lambda _: forms.run_ocr("URL", INPUT_URL, file_id="a"), range(4)))
+
+        assert results == [{"status": "SUCCESS"}] * 4
+        assert post_mock.call_count == 1
+
+
+    def test_run_ocr_typed_results(self, requests_mock):
+        """ Test typed_results wraps responses, including cached ones """
+        forms = Forms(AUTH, cache=ResultCache(), typed_results=True)
+        mock_response = {"status": "SUCCESS", "keyValuePairs": [{"key": "Name", "value": "Jane"}]}
+        requests_mock.post(f"{BASE_URL}/api/forms/generic", json=mock_response)
+
+        for _ in range(2):
+            resp = forms.run_ocr("URL", INPUT_URL)
+            assert isinstance(resp, FormsResult)
+            assert [(field.key, field.value) for field in resp.fields] == [("Name", "Jane")]
+
+
+    def test_run_ocr_stream(self, requests_mock):
+        """ Test pages are yielded from a streamed response and the rest kept as result """
+        forms = Forms(AUTH)
+        mock_response = {"status": "SUCCESS", "ocrResults": [{"page": 1}, {"page": 2}], "keyValuePairs": []}
+        requests_mock.post(f"{BASE_URL}/api/forms/generic", json=mock_response)
+
+        with forms.run_ocr_stream("URL", INPUT_URL) as stream:
+            pages = list(stream)
+
+        assert pages == mock_response["ocrResults"]
+        assert stream.result == {"status": "SUCCESS", "keyValuePairs": []}
+
+
+    def split_responder(self, fail_pages=(), failures=1):
+        """ Answers each chunk with one OCR page per PDF page, failing chunks starting on fail_pages """
+        pypdf = pytest.importorskip("pypdf")
+        calls = []
+        remaining = {page: failures for page in fail_pages}
+
+        def respond(request, context):
+            body = request.json()
+            pages = len(pypdf.PdfReader(io.BytesIO(base64.b64decode(body["base64"]))).pages)
+            first = int(body["fileId"].rsplit(":", 1)[1].split("-")[0])
+            calls.append(body["fileId"])
+            if remaining.get(first):
+                remaining[first] -= 1
+                context.status_code = 500
+                return {"status": "FAILURE", "message": "Server error"}
+            return {"status": "SUCCESS", "documentId": body["fileId"], "ocrResults": [{"page": i + 1} for i in range(pages)]}
+
+        return respond, calls
+
+
+    def test_run_ocr_split(self, requests_mock):
+        """ Test a PDF is split, sent in chunks and merged with pages renumbered """
+        respond, calls = self.split_responder()
+        requests_mock.post(f"{BASE_URL}/api/forms/generic", json=respond)
+
+        resp = Forms(AUTH).run_ocr_split("FILE_PATH", FILE_PATH_7_PAGES, pages_per_chunk=3, file_id="doc")
+
+        assert sorted(calls) == ["doc:1-3", "doc:4-6", "doc:7-7"]
+        assert resp["documentId"] == "doc"
+        assert [page["page"] for page in resp["ocrResults"]] == list(range(1, 8))
+
+
+    def test_run_ocr_split_retries_chunk(self, requests_mock):
+        """ Test only the failed chunk is resubmitted """
+        respond, calls = self.split_responder(fail_pages=(4,))
+        requests_mock.post(f"{BASE_URL}/api/forms/generic", json=respond)
+
+        resp = Forms(AUTH).run_ocr_split("FILE_PATH", FILE_PATH_7_PAGES, pages_per_chunk=3, file_id="doc")
+
+        assert sorted(calls) == ["doc:1-3", "doc:4-6", "doc:4-6", "doc:7-7"]
+        assert len(resp["ocrResults"]) == 7
+
+
+    def test_run_ocr_split_partial(self, requests_mock):
+        """ Test a PartialResultError can be resumed without resending completed chunks """
+        respond, calls = self.split_responder(fail_pages=(7,), failures=2)
+        requests_mock.post(f"{BASE_URL}/api/forms/generic", json=respond)
+        forms = Forms(AUTH)
+
+        with pytest.raises(PartialResultError) as error:
+            forms.run_ocr_split("FILE_PATH", FILE_PATH_7_PAGES, pages_per_chunk=3, chunk_retries=1, file_id="doc")
+        assert sorted(error.value.completed) == [(1, 3), (4, 6)]
+        assert list(error.value.failed) == [(7, 7)]
+
+        calls.clear()
+        resp = forms.run_ocr_split("FILE_PATH", FILE_PATH_7_PAGES, pages_per_chunk=3, file_id="doc",
+                                   completed=error.value.completed)
+        assert calls == ["doc:7-7"]
+        assert [page["page"] for page in resp["ocrResults"]] == list(range(1, 8))
+
+
+    def test_run_ocr_split_bad(self):
+        """ Test URL inputs and webhooks are rejected """
+        with pytest.raises(ValidationError):
+            Forms(AUTH).run_ocr_split("URL", INPUT_URL)
+        with pytest.raises(ValidationError):
+            Forms(AUTH).run_ocr_split("FILE_PATH", FILE_PATH_7_PAGES, webhook="url")
@@ -0,0 +1,119 @@
+""" Unit testing the ImagePreprocessor class """
+
+import os
+import base64
+import io
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+from lazarus_ai import ImagePreprocessor, LazarusAuth, Forms
+
+BASE_URL = os.environ.get("BASE_URL")
+B64_PDF = "tests/resources/sample_b64.txt"
+
+
+def make_scan(path, size=(1200, 1600), dpi=600, mode="RGB"):
+    """ Writes a synthetic color scan with text-like stripes """
+    image = Image.new(mode, size, "white")
+    for y in range(0, size[1], 40):
+        image.paste((20, 40, 200) if mode == "RGB" else 0, (100, y, size[0] - 100, y + 8))
+    image.save(path, dpi=(dpi, dpi))
+    return path
+
+
+class TestImagePreprocessor():
+    """ Unit tests for ImagePreprocessor class """
+
+    def test_prepare_file_path(self, tmp_path) -> None:
+        """ Test image files are downscaled, converted and removed afterwards """
+        path = make_scan(str(tmp_path / "scan.png"))
+        reports = []
+        preprocessor = ImagePreprocessor(max_dpi=150, max_workers=0, on_document=reports.append)
+
+        with preprocessor.prepare("FILE_PATH", path) as (input_type, processed):
+            assert input_type == "FILE_PATH"
+            assert os.path.basename(processed) == "scan.png"
+            with Image.open(processed) as image:
+                assert image.size == (300, 400)
+                assert image.mode == "L"
+                assert round(image.info["dpi"][0]) == 150
+
+        assert not os.path.exists(processed)
+        assert reports[0]["bytes_saved"] == reports[0]["bytes_in"] - reports[0]["bytes_out"] > 0
+        assert preprocessor.stats()["documents"] == 1
+
+
+    def test_prepare_base64(self, tmp_path) -> None:
+        """ Test base64 images are replaced and other documents sent unchanged """
+        path = make_scan(str(tmp_path / "scan.tif"))
+        with open(path, "rb") as f:
+            encoded = base64.b64encode(f.read()).decode()
+        with open(B64_PDF) as f:
+            pdf = f.read()
+        preprocessor = ImagePreprocessor(max_pixels=100_000, image_format="JPEG", max_workers=0)
+
+        with preprocessor.prepare("BASE64", encoded) as (_, processed):
+            with Image.open(io.BytesIO(base64.b64decode(processed))) as image:
+                assert image.format == "JPEG"
+                assert image.width * image.height <= 100_000
+        with preprocessor.prepare("BASE64", pdf) as (_, processed):
+            assert processed == pdf
+        # Only the image is processed, the PDF never reaches Pillow
+        assert preprocessor.stats()["documents"] == 1
+
+
+    def test_prepare_skips_non_images(self) -> None:
+        """ Test PDFs and URLs are passed through without being processed """
+        preprocessor = ImagePreprocessor(max_workers=0)
+
+        with preprocessor.prepare("FILE_PATH", "tests/resources/sample_form.pdf") as prepared:
+            assert prepared == ("FILE_PATH", "tests/resources/sample_form.pdf")
+        with preprocessor.prepare("URL", "https://fileurl.com/scan.png") as prepared:
+            assert prepared == ("URL", "https://fileurl.com/scan.png")
+        assert preprocessor.stats()["documents"] == 0
+
+
+    def test_prepare_process_pool(self, tmp_path) -> None:
+        """ Test images are processed in worker processes """
+        path = make_scan(str(tmp_path / "scan.png"))
+        with ImagePreprocessor(max_dpi=300, max_workers=1) as preprocessor:
+            with preprocessor.prepare("FILE_PATH", path) as (_, processed):
+                assert processed != path
+
+        assert preprocessor.stats()["bytes_saved"] > 0
+
+
+    def test_base64_signatures(self, tmp_path) -> None:
+        """ Test base64 documents are recognized as images by their leading bytes """
+        from lazarus_ai._utils import images
+
+        for fmt in ("PNG", "JPEG", "TIFF", "WEBP"):
+            out = io.BytesIO()
+            Image.new("RGB", (8, 8)).save(out, format=fmt)
+            assert images._is_base64_image(base64.b64encode(out.getvalue()).decode()), fmt
+        with open(B64_PDF) as f:
+            assert not images._is_base64_image(f.read())
+        assert not images._is_base64_image("not base64!")
+
+
+    def test_image_format_bad(self) -> None:
+        """ Test unsupported output formats are rejected """
+        with pytest.raises(ValueError):
+            ImagePreprocessor(image_format="BMP")
+
+
+    def test_run_ocr_preprocessed(self, tmp_path, requests_mock) -> None:
+        """ Test Forms uploads the preprocessed image """
+        path = make_scan(str(tmp_path / "scan.png"))
+        sizes = []
+
+        def respond(request, context):
+            sizes.append(len(b"".join(request.body)))
+            return {"status": "SUCCESS"}
+
+        requests_mock.post(f"{BASE_URL}/api/forms/generic", json=respond)
+        forms = Forms(LazarusAuth("org", "key"), preprocessor=ImagePreprocessor(max_dpi=150, max_workers=0))
+
+        assert forms.run_ocr("FILE_PATH", path) == {"status": "SUCCESS"}
+        assert sizes[0] < os.path.getsize(path)
@@ -0,0 +1,61 @@
+""" Regression testing the time taken to import the library """
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))), "src")
+
+# Cumulative import time allowed for lazarus_ai, in milliseconds
+BUDGET_MS = float(os.environ.get("IMPORT_TIME_BUDGET_MS", 150))
+
+# Dependencies that must only be imported once they are used
+DEFERRED_MODULES = ("requests", "asyncio", "httpx", "PIL", "pypdf", "concurrent.futures")
+
+
+def import_times(module: str) -> dict:
+    """Imports module in a fresh interpreter, returning cumulative times in ms."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            env=os.environ | {"PYTHONPATH": SRC_DIR}, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative) / 1000
+    return times
+
+
+def test_heavy_dependencies_deferred() -> None:
+    """ Tests that importing the library does not import heavy dependencies """
+    times = import_times("lazarus_ai")
+    assert "lazarus_ai" in times
+    for module in DEFERRED_MODULES:
+        assert module not in times, f"{module} is imported with lazarus_ai"
+
+
+def test_import_time_budget() -> None:
+    """ Tests that the library imports within the time budget """
+    # The fastest of a few runs is the least affected by a busy machine
+    elapsed = min(import_times("lazarus_ai")["lazarus_ai"] for _ in range(3))
+    assert elapsed < BUDGET_MS, f"Importing lazarus_ai took {elapsed:.1f} ms, over the {BUDGET_MS:.0f} ms budget"
+
+
+@pytest.mark.parametrize("module", ["lazarus_ai", "lazarus_ai._utils", "lazarus_ai.errors"])
+def test_import_leaves_sys_path(module) -> None:
+    """ Tests that importing a package does not modify sys.path """
+    check = f"import sys; before = list(sys.path); import {module}; assert sys.path == before"
+    subprocess.run([sys.executable, "-c", check], env=os.environ | {"PYTHONPATH": SRC_DIR}, check=True)
+
+
+def test_application_modules_not_shadowed(tmp_path) -> None:
+    """ Tests that an application's own utils and errors modules coexist with the library """
+    (tmp_path / "utils.py").write_text("NAME = 'app'\n")
+    (tmp_path / "errors").mkdir()
+    (tmp_path / "errors" / "__init__.py").write_text("NAME = 'app'\n")
+    check = "import utils, errors, lazarus_ai, lazarus_ai.errors; assert utils.NAME == errors.NAME == 'app'; " \
+            "from lazarus_ai import Forms, RikAI; from lazarus_ai.errors import APIError"
+    subprocess.run([sys.executable, "-c", check], cwd=tmp_path,
+                   env=os.environ | {"PYTHONPATH": os.pathsep.join([str(tmp_path), SRC_DIR])}, check=True)
@@ -0,0 +1,111 @@
+""" Unit testing the JobJournal class """
+
+import os
+import sqlite3
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+
+from lazarus_ai import LazarusAuth, Forms, RikAI, FormsResult, JobJournal
+from lazarus_ai.errors import APIError
+
+BASE_URL = os.environ.get("BASE_URL")
+INPUT_URL = "https://fileurl.com/sample.pdf"
+FILE_PATH = "tests/resources/sample_form.pdf"
+
+
+def committed_states(path):
+    """ Reads the journal from a separate connection, seeing only committed rows """
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT state, file_id, attempts FROM jobs").fetchall()
+
+
+class TestJobJournal():
+    """ Unit tests for JobJournal class """
+
+    def test_completed_skipped_after_restart(self, tmp_path, requests_mock) -> None:
+        """ Test a restarted journal answers completed documents without a request """
+        requests_mock.post(f"{BASE_URL}/api/forms/generic", json={"status": "SUCCESS", "documentId": "doc"})
+        forms = Forms(LazarusAuth("org_id", "auth_key"), typed_results=True)
+        path = str(tmp_path / "journal.sqlite")
+
+        with JobJournal(path) as journal:
+            first = journal.run(forms.run_ocr, "FILE_PATH", FILE_PATH)
+        with JobJournal(path) as journal:
+            second = journal.run(forms.run_ocr, "FILE_PATH", FILE_PATH)
+            assert journal.stats()["skipped"] == 1
+            assert journal.counts() == {"submitted": 0, "completed": 1, "failed": 0}
+
+        assert requests_mock.call_count == 1
+        assert isinstance(second, FormsResult)
+        assert second.raw == first.raw
+
+
+    def test_submission_written_ahead(self, tmp_path, requests_mock) -> None:
+        """ Test a submission is committed before it is sent, and resent with its file_id after a crash """
+        path = str(tmp_path / "journal.sqlite")
+        seen = []
+
+        def crash(request, context):
+            seen.append((committed_states(path), request.json()["fileId"]))
+            raise KeyboardInterrupt
+
+        requests_mock.post(f"{BASE_URL}/api/rikai", json=crash)
+        rikai = RikAI(LazarusAuth("org_id", "auth_key"))
+        journal = JobJournal(path)
+        with pytest.raises(KeyboardInterrupt):
+            journal.run(rikai.ask_question, "URL", INPUT_URL, ["Question?"])
+        journal.close()
+
+        (states, file_id), = seen
+        assert states == [("submitted", file_id, 1)]
+
+        requests_mock.post(f"{BASE_URL}/api/rikai", json={"status": "SUCCESS", "data": []})
+        with JobJournal(path) as journal:
+            journal.run(rikai.ask_question, "URL", INPUT_URL, ["Question?"])
+        assert requests_mock.last_request.json()["fileId"] == file_id
+        assert committed_states(path) == [("completed", file_id, 2)]
+
+
+    def test_failed_retried(self, tmp_path, requests_mock) -> None:
+        """ Test failures are recorded and retried on the next call """
+        requests_mock.post(f"{BASE_URL}/api/forms/generic", [{"status_code": 500, "json": {"message": "Down"}},
+                                                             {"json": {"status": "SUCCESS"}}])
+        forms = Forms(LazarusAuth("org_id", "auth_key"))
+
+        with JobJournal(str(tmp_path / "journal.sqlite")) as journal:
+            with pytest.raises(APIError):
+                journal.run(forms.run_ocr, "URL", INPUT_URL, file_id="mine")
+            assert journal.counts()["failed"] == 1
+            assert journal.run(forms.run_ocr, "URL", INPUT_URL, file_id="mine") == {"status": "SUCCESS"}
+            assert journal.counts() == {"submitted": 0, "completed": 1, "failed": 0}
+
+        assert [request.json()["fileId"] for request in requests_mock.request_history] == ["mine", "mine"]
+
+
+    def test_results_dir(self, tmp_path) -> None:
+        """ Test results can be written to files, recording their path """
+        path, results_dir = str(tmp_path / "journal.sqlite"), str(tmp_path / "results")
+        summarize = lambda input_type, input_str, fields: {"data": {"summary": input_str}}
+
+        with JobJournal(path, results_dir=results_dir) as journal:
+            journal.run(summarize, "BASE64", "abc", {"document_type": "invoice"})
+        with JobJournal(path, results_dir=results_dir) as journal:
+            assert journal.run(summarize, "BASE64", "abc", {"document_type": "invoice"}) == {"data": {"summary": "abc"}}
+            assert journal.stats()["skipped"] == 1
+
+        with sqlite3.connect(path) as conn:
+            (pointer, file_id), = conn.execute("SELECT result, file_id FROM jobs").fetchall()
+        assert os.path.dirname(pointer) == results_dir
+        assert file_id is None
+
+
+    def test_group_commits(self, tmp_path) -> None:
+        """ Test concurrent submissions share commits """
+        with JobJournal(str(tmp_path / "journal.sqlite"), commit_interval=0.02) as journal:
+            with ThreadPoolExecutor(16) as executor:
+                list(executor.map(lambda i: journal.run(lambda t, s, **kwargs: kwargs, "URL", f"url-{i}"), range(64)))
+            journal.flush()
+            stats = journal.stats()
+
+        assert stats["submitted"] == stats["completed"] == 64
+        assert stats["commits"] < 64
@@ -0,0 +1,33 @@
+""" Unit testing the JSON decoding helpers """
+
+import pytest
+
+from lazarus_ai import _utils
+from lazarus_ai._utils import json_codec
+
+
+class FakeResponse:
+    def __init__(self, content):
+        self.content = content
+
+
+@pytest.mark.parametrize("decoder", ["orjson", "json"])
+def test_loads_decoders_agree(monkeypatch, decoder):
+    """ Tests both decoders return the same plain objects """
+    if decoder == "json":
+        monkeypatch.setattr(json_codec, "orjson", None)
+    document = b'{"status": "SUCCESS", "data": [{"answer": "caf\\u00e9"}], "n": 1.5}'
+
+    assert _utils._loads(document) == {"status": "SUCCESS", "data": [{"answer": "café"}], "n": 1.5}
+    assert _utils._decode_response(FakeResponse(document.decode())) == _utils._loads(document)
+
+
+def test_loads_nan_fallback():
+    """ Tests documents only the standard library accepts still decode """
+    assert _utils._loads(b'{"confidence": NaN}')["confidence"] != 0
+
+
+def test_loads_invalid():
+    """ Tests invalid documents raise a ValueError """
+    with pytest.raises(ValueError):
+        _utils._loads(b"not json")
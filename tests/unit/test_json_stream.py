@@ -0,0 +1,78 @@
+""" Unit testing the incremental page parser used for streamed responses """
+
+import json
+import pytest
+
+from lazarus_ai import _utils
+
+RESPONSE = {
+    "status": "SUCCESS",
+    "documentId": "id with \"quotes\" and \\ slashes",
+    "ocrResults": [
+        {"page": i, "lines": [{"text": f"héllo ] }} , [{{ \\\" {i}", "words": [1, 2.5, None, True]}]}
+        for i in range(1, 21)
+    ],
+    "data": [{"answer": "réponse"}],
+    "empty": [],
+    "number": -1.5e3,
+}
+
+
+class FakeResponse:
+    """ Serves a body in fixed-size chunks, recording how much was read """
+
+    def __init__(self, body: bytes, chunk: int):
+        self.body = body
+        self.chunk = chunk
+        self.read = 0
+        self.closed = False
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.body), self.chunk):
+            self.read = i + self.chunk
+            yield self.body[i:i + self.chunk]
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.mark.parametrize("chunk", [1, 7, 64, 100000])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_page_stream_parses(chunk, indent):
+    """ Tests pages and the other fields are decoded exactly for any chunking """
+    response = FakeResponse(json.dumps(RESPONSE, indent=indent, ensure_ascii=False).encode(), chunk)
+    completed = []
+    stream = _utils._PageStream(response, on_complete=completed.append)
+
+    assert list(stream) == RESPONSE["ocrResults"]
+    expected = {key: value for key, value in RESPONSE.items() if key != "ocrResults"}
+    assert stream.result == expected
+    assert completed == [expected]
+    assert response.closed
+
+
+def test_page_stream_incremental():
+    """ Tests the first page is yielded before the body has been read in full """
+    body = json.dumps(RESPONSE).encode()
+    response = FakeResponse(body, 64)
+    first = next(iter(_utils._PageStream(response)))
+
+    assert first == RESPONSE["ocrResults"][0]
+    assert response.read < len(body) / 4
+
+
+def test_page_stream_early_close():
+    """ Tests closing the stream part way through closes the response """
+    response = FakeResponse(json.dumps(RESPONSE).encode(), 64)
+    with _utils._PageStream(response) as stream:
+        next(iter(stream))
+
+    assert response.closed
+    assert stream.result is None
+
+
+@pytest.mark.parametrize("body", [b'{"ocrResults": [{"page": 1}', b'[1, 2]', b'{"status" "SUCCESS"}'])
+def test_page_stream_bad_body(body):
+    """ Tests truncated or malformed bodies raise a ValueError """
+    with pytest.raises(ValueError):
+        list(_utils._PageStream(FakeResponse(body, 4)))
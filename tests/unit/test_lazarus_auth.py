@@ -1,15 +1,12 @@
 """ Unit testing the LazarusAuth class """
 
-import sys
 import os
 import pytest
 
-parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
-sys.path.append(parent_dir)
-
-from src import LazarusAuth
-from errors import InvalidAuthError
+from lazarus_ai import LazarusAuth
+from lazarus_ai.errors import InvalidAuthError
 
+BASE_URL = os.environ.get('BASE_URL')
 ORG_ID = os.environ.get('ORG_ID')
 AUTH_KEY = os.environ.get('AUTH_KEY')
 
@@ -24,9 +21,65 @@ class TestLazarusAuth:
 
 
     def test_init_bad(self) -> None:
-        """ Test init of LazarusAuth with bad credentials """
+        """ Test eager init of LazarusAuth with bad credentials """
         with pytest.raises(InvalidAuthError):
-            LazarusAuth("bad_org_id", "bad_auth_key")
+            LazarusAuth("bad_org_id", "bad_auth_key", validation="eager")
+
+
+    def test_init_lazy_ok(self, requests_mock) -> None:
+        """ Test default init makes no request """
+        post_mock = requests_mock.post(f"{BASE_URL}/api/forms/generic")
+        LazarusAuth("org_id", "auth_key")
+
+        assert not post_mock.called
+
+
+    def test_init_eager_bad(self, requests_mock) -> None:
+        """ Test eager init raises on a 403 response """
+        requests_mock.post(f"{BASE_URL}/api/forms/generic", status_code=403)
+
+        with pytest.raises(InvalidAuthError):
+            LazarusAuth("org_id", "auth_key", validation="eager")
+
+
+    def test_init_cached_ok(self, requests_mock, tmp_path) -> None:
+        """ Test cached validation is shared until the TTL expires """
+        post_mock = requests_mock.post(f"{BASE_URL}/api/forms/generic", status_code=400)
+
+        LazarusAuth("org_id", "auth_key", validation="cached", validation_dir=str(tmp_path))
+        LazarusAuth("org_id", "auth_key", validation="cached", validation_dir=str(tmp_path))
+        assert post_mock.call_count == 1
+
+        LazarusAuth("org_id", "auth_key", validation="cached", validation_ttl=0, validation_dir=str(tmp_path))
+        assert post_mock.call_count == 2
+
+
+    def test_init_cached_bad(self, requests_mock, tmp_path) -> None:
+        """ Test failed validations are not cached """
+        post_mock = requests_mock.post(f"{BASE_URL}/api/forms/generic", status_code=403)
+
+        for _ in range(2):
+            with pytest.raises(InvalidAuthError):
+                LazarusAuth("org_id", "auth_key", validation="cached", validation_dir=str(tmp_path))
+        assert post_mock.call_count == 2
+        assert not os.listdir(tmp_path)
+
+
+    @pytest.mark.parametrize("status_code", [429, 500, 502, 503])
+    def test_init_cached_unknown(self, requests_mock, tmp_path, status_code) -> None:
+        """ Test outages and rate limits are not cached as valid credentials """
+        post_mock = requests_mock.post(f"{BASE_URL}/api/forms/generic", status_code=status_code)
+
+        for _ in range(2):
+            LazarusAuth("org_id", "auth_key", validation="cached", validation_dir=str(tmp_path))
+        assert post_mock.call_count == 2
+        assert not os.listdir(tmp_path)
+
+
+    def test_init_validation_bad(self) -> None:
+        """ Test unknown validation modes are rejected """
+        with pytest.raises(ValueError):
+            LazarusAuth(ORG_ID, AUTH_KEY, validation="sometimes")
 
 
     def test_init_empty_bad(self) -> None:
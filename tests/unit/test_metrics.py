@@ -0,0 +1,76 @@
+""" Unit testing the background library metrics reporter """
+
+import threading
+import time
+
+from lazarus_ai import _utils
+from lazarus_ai._utils import metrics
+
+
+class FakeTransport:
+    """ Records posted metrics, optionally blocking until released """
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.posts = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def post(self, url, **kwargs):
+        self.release.wait()
+        time.sleep(self.delay)
+        self.posts.append((url, kwargs["json"]))
+
+
+def test_record_metrics_non_blocking(monkeypatch):
+    """ Tests recording returns before the metrics post completes """
+    monkeypatch.setenv("TEST_MODE", "False")
+    transport = FakeTransport(delay=0.2)
+
+    start = time.monotonic()
+    _utils._record_metrics("forms", {"orgId": "org"}, None, {"status": "SUCCESS"}, transport=transport)
+    assert time.monotonic() - start < 0.1
+
+    assert _utils._flush_metrics(timeout=5)
+    assert len(transport.posts) == 1
+
+
+def test_record_metrics_trims_response(monkeypatch):
+    """ Tests only summary fields of the response are reported """
+    monkeypatch.setenv("TEST_MODE", "False")
+    transport = FakeTransport()
+    response = {"status": "SUCCESS", "documentId": "doc", "ocrResults": ["large"] * 1000}
+
+    _utils._record_metrics("forms", {"orgId": "org"}, "model", response, transport=transport)
+    _utils._flush_metrics(timeout=5)
+
+    url, data = transport.posts[0]
+    assert url.endswith("/api/library-metrics/forms-python/model")
+    assert data == {"endpoint": "forms", "response": {"status": "SUCCESS", "documentId": "doc"}}
+
+
+def test_record_metrics_test_mode():
+    """ Tests nothing is queued while TEST_MODE is set """
+    transport = FakeTransport()
+    _utils._record_metrics("forms", {"orgId": "org"}, transport=transport)
+    _utils._flush_metrics(timeout=5)
+
+    assert not transport.posts
+
+
+def test_reporter_drops_oldest():
+    """ Tests a full queue discards its oldest events """
+    reporter = metrics._MetricsReporter(max_queue=2, batch_size=1)
+    transport = FakeTransport()
+    transport.release.clear()
+
+    reporter.submit(("url", {}, {"n": 0}, transport))
+    while reporter._queue:
+        time.sleep(0.001)
+    for n in range(1, 4):
+        reporter.submit(("url", {}, {"n": n}, transport))
+    transport.release.set()
+
+    assert reporter.flush(timeout=5)
+    assert reporter.dropped == 1
+    assert [data["n"] for _, data in transport.posts] == [0, 2, 3]
@@ -0,0 +1,72 @@
+""" Unit testing the streaming multipart encoder """
+
+import os
+import email
+import tracemalloc
+import pytest
+
+from lazarus_ai import _utils
+
+
+FILE_PATH = "tests/resources/sample_form.pdf"
+
+
+def parse_body(stream):
+    """ Parses an encoded body back into its form parts """
+    body = b"".join(stream)
+    message = email.message_from_bytes(f"Content-Type: {stream.content_type}\r\n\r\n".encode() + body)
+    return body, {part.get_param("name", header="content-disposition"): part for part in message.get_payload()}
+
+
+def test_multipart_stream_body():
+    """ Tests the encoded body holds the fields and the full file """
+    fields = {"question": ["Q1", "Q2"], "metadata": {"foo": "bar"}, "returnOCR": True}
+    with _utils._MultipartFileStream(FILE_PATH, fields) as stream:
+        length = len(stream)
+        body, parts = parse_body(stream)
+
+    with open(FILE_PATH, "rb") as f:
+        content = f.read()
+
+    assert len(body) == length
+    assert parts["file"].get_payload(decode=True) == content
+    assert parts["file"].get_content_type() == "application/pdf"
+    assert parts["metadata"].get_payload() == '{"foo": "bar"}'
+    assert parts["returnOCR"].get_payload() == "True"
+    assert body.count(b'name="question"') == 2
+
+
+def test_multipart_stream_closes_file():
+    """ Tests the file handle is closed on leaving the with block """
+    with _utils._MultipartFileStream(FILE_PATH) as stream:
+        assert not stream.closed
+    assert stream.closed
+
+
+def test_multipart_stream_bad_path():
+    """ Tests invalid extensions and missing files are rejected """
+    with pytest.raises(ValueError):
+        _utils._MultipartFileStream("bad_extension")
+
+    with pytest.raises(FileNotFoundError):
+        _utils._MultipartFileStream("bad_path.pdf")
+
+
+@pytest.mark.parametrize("size_mb", [1, 32])
+def test_multipart_stream_memory_flat(tmp_path, size_mb):
+    """ Tests peak memory while streaming does not grow with file size """
+    path = tmp_path / "large.pdf"
+    with open(path, "wb") as f:
+        for _ in range(size_mb):
+            f.write(os.urandom(1024 * 1024))
+
+    tracemalloc.start()
+    with _utils._MultipartFileStream(str(path)) as stream:
+        sent = 0
+        while chunk := stream.read(8192):
+            sent += len(chunk)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert sent == len(stream)
+    assert peak < 512 * 1024
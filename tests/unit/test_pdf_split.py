@@ -0,0 +1,54 @@
+""" Unit testing the PDF splitting helpers used by run_ocr_split """
+
+import base64
+import io
+import pytest
+
+pypdf = pytest.importorskip("pypdf")
+
+from lazarus_ai import _utils
+
+
+def make_pdf(pages: int) -> bytes:
+    """ Builds a PDF with the given number of blank pages """
+    writer = pypdf.PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=612, height=792)
+    out = io.BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+
+def test_split_pdf_chunks():
+    """ Tests a PDF is split into chunks of consecutive pages """
+    chunks = _utils._split_pdf(make_pdf(7), 3)
+
+    assert [(first, last) for first, last, _ in chunks] == [(1, 3), (4, 6), (7, 7)]
+    sizes = [len(pypdf.PdfReader(io.BytesIO(base64.b64decode(chunk))).pages) for _, _, chunk in chunks]
+    assert sizes == [3, 3, 1]
+
+
+def test_read_pdf(tmp_path):
+    """ Tests only PDF inputs are read for splitting """
+    data = make_pdf(1)
+    path = tmp_path / "doc.pdf"
+    path.write_bytes(data)
+
+    assert _utils._read_pdf("FILE_PATH", str(path)) == data
+    assert _utils._read_pdf("BASE64", base64.b64encode(data).decode()) == data
+    assert _utils._read_pdf("BASE64", base64.b64encode(b"\x89PNG").decode()) is None
+    assert _utils._read_pdf("URL", "https://fileurl.com/doc.pdf") is None
+
+
+def test_merge_split_results():
+    """ Tests list fields are concatenated with pages renumbered """
+    results = [
+        (1, {"status": "SUCCESS", "ocrResults": [{"page": 1}, {"page": 2}], "keyValuePairs": [{"key": "a", "page": 2}]}),
+        (3, {"status": "SUCCESS", "ocrResults": [{"page": 1}], "keyValuePairs": [{"key": "b", "pageNumber": 1}]}),
+    ]
+    merged = _utils._merge_split_results(results)
+
+    assert merged["status"] == "SUCCESS"
+    assert merged["ocrResults"] == [{"page": 1}, {"page": 2}, {"page": 3}]
+    assert merged["keyValuePairs"] == [{"key": "a", "page": 2}, {"key": "b", "pageNumber": 3}]
+    assert results[1][1]["ocrResults"] == [{"page": 1}]
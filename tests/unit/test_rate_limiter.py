@@ -0,0 +1,89 @@
+""" Unit testing the RateLimiter class """
+
+import os
+import threading
+import time
+import pytest
+
+from lazarus_ai import LazarusAuth, Forms, RateLimiter
+
+BASE_URL = os.environ.get("BASE_URL")
+
+
+class TestRateLimiter():
+    """ Unit tests for RateLimiter class """
+
+    def test_burst_then_rate(self) -> None:
+        """ Test a full bucket allows a burst and then paces requests """
+        limiter = RateLimiter(rate=50, burst=5)
+
+        start = time.monotonic()
+        for _ in range(5):
+            limiter.acquire()
+        assert time.monotonic() - start < 0.05
+
+        for _ in range(5):
+            limiter.acquire()
+        assert time.monotonic() - start >= 0.09
+        assert limiter.stats()["acquired"] == 10
+
+
+    def test_shared_across_threads(self) -> None:
+        """ Test threads draw from a single bucket """
+        limiter = RateLimiter(rate=100, burst=1)
+
+        def worker():
+            for _ in range(5):
+                limiter.acquire()
+
+        start = time.monotonic()
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert time.monotonic() - start >= 0.18
+
+
+    def test_keys_independent(self) -> None:
+        """ Test each key has its own bucket """
+        limiter = RateLimiter(rate=1, burst=1)
+
+        start = time.monotonic()
+        limiter.acquire("org_a")
+        limiter.acquire("org_b")
+        assert time.monotonic() - start < 0.5
+
+
+    def test_shared_backend(self, tmp_path) -> None:
+        """ Test limiters using the same path share one bucket """
+        path = str(tmp_path / "limits.sqlite")
+        first = RateLimiter(rate=20, burst=2, path=path)
+        second = RateLimiter(rate=20, burst=2, path=path)
+
+        start = time.monotonic()
+        first.acquire()
+        first.acquire()
+        second.acquire()
+
+        assert time.monotonic() - start >= 0.04
+        assert second.stats()["waited"] == 1
+
+
+    def test_bad_rate(self) -> None:
+        """ Test non-positive rates are rejected """
+        with pytest.raises(ValueError):
+            RateLimiter(rate=0)
+
+
+    def test_auth_rate_limited(self, requests_mock) -> None:
+        """ Test requests take a token from the orgId bucket before sending """
+        limiter = RateLimiter(rate=10, burst=1)
+        forms = Forms(LazarusAuth("org_id", "auth_key", rate_limiter=limiter))
+        requests_mock.post(f"{BASE_URL}/api/forms/generic", json={"status": "SUCCESS"})
+
+        forms.run_ocr("URL", "https://fileurl.com")
+
+        assert limiter.stats()["acquired"] == 1
+        assert "org_id" in limiter._buckets
@@ -0,0 +1,132 @@
+""" Unit testing the RequestHooks class """
+
+import json
+import os
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import requests
+
+from lazarus_ai import LazarusAuth, Forms, RikAI, RequestHooks, RetryPolicy
+from lazarus_ai import _utils
+
+BASE_URL = os.environ.get("BASE_URL")
+INPUT_URL = "https://fileurl.com/sample.pdf"
+FILE_PATH = "tests/resources/sample_form.pdf"
+REPLY = json.dumps({"status": "SUCCESS", "ocrResults": [{"page": 1}]}).encode()
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    """ Reads the body, waits, then replies """
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        time.sleep(0.05)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(REPLY)))
+        self.end_headers()
+        self.wfile.write(REPLY)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def recording_hooks():
+    events = []
+    hooks = RequestHooks(*(lambda event, name=name: events.append((name, event))
+                           for name in ("start", "upload", "response", "error")))
+    return hooks, events
+
+
+class TestRequestHooks():
+    """ Unit tests for RequestHooks class """
+
+    def test_phase_timings(self, server_url) -> None:
+        """ Test events arrive in order with timings and byte counts over a real socket """
+        hooks, events = recording_hooks()
+        transport = _utils.Transport(hooks=hooks)
+        body = {"base64": "A" * 100_000}
+
+        for _ in range(2):
+            transport.post(f"{server_url}/api/forms/generic", model_id="model", json=body)
+
+        assert [name for name, _ in events] == ["start", "upload", "response"] * 2
+        first, second = events[2][1], events[5][1]
+        assert first["endpoint"] == "/api/forms/generic"
+        assert first["model_id"] == "model"
+        assert first["attempt"] == 0
+        assert first["status"] == 200
+        assert first["bytes_sent"] == len(json.dumps(body))
+        assert first["bytes_received"] == len(REPLY)
+        assert first["timings"]["wait"] >= 0.04
+        assert set(first["timings"]) == {"prepare", "queue", "connect", "upload", "wait", "download", "total"}
+        # The second request reuses the pooled connection
+        assert first["timings"]["connect"] > 0
+        assert second["timings"]["connect"] == 0
+
+
+    def test_forms_file_path(self, server_url, monkeypatch) -> None:
+        """ Test streamed multipart uploads report the model and bytes sent """
+        monkeypatch.setattr("lazarus_ai.forms.BASE_URL", server_url)
+        hooks, events = recording_hooks()
+        forms = Forms(LazarusAuth("org_id", "auth_key", hooks=hooks), model_id="invoices")
+
+        assert forms.run_ocr("FILE_PATH", FILE_PATH)["status"] == "SUCCESS"
+
+        assert [name for name, _ in events] == ["start", "upload", "response"]
+        upload, response = events[1][1], events[2][1]
+        assert response["endpoint"] == "/api/forms/custom/invoices"
+        assert response["model_id"] == "invoices"
+        assert upload["bytes_sent"] == response["bytes_sent"] > os.path.getsize(FILE_PATH)
+
+
+    def test_retry_attempts(self, requests_mock, monkeypatch) -> None:
+        """ Test each retry is reported with its attempt number """
+        monkeypatch.setattr(time, "sleep", lambda seconds: None)
+        hooks, events = recording_hooks()
+        auth = LazarusAuth("org_id", "auth_key", hooks=hooks, retry_policy=RetryPolicy(jitter=False))
+        requests_mock.post(f"{BASE_URL}/api/rikai", [{"status_code": 503}, {"json": {"status": "SUCCESS", "data": []}}])
+
+        RikAI(auth).ask_question("URL", INPUT_URL, ["Question?"])
+
+        responses = [event for name, event in events if name == "response"]
+        assert [(event["attempt"], event["status"]) for event in responses] == [(0, 503), (1, 200)]
+        assert responses[0]["endpoint"] == "/api/rikai"
+
+
+    def test_on_error(self) -> None:
+        """ Test a failed connection reports the error before it is raised """
+        hooks, events = recording_hooks()
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+
+        with pytest.raises(requests.ConnectionError):
+            _utils.Transport(hooks=hooks).post(f"http://127.0.0.1:{port}/api/rikai", json={})
+
+        assert [name for name, _ in events] == ["start", "error"]
+        assert isinstance(events[1][1]["error"], requests.ConnectionError)
+        assert "total" in events[1][1]["timings"]
+
+
+    def test_no_hooks_unchanged(self, requests_mock) -> None:
+        """ Test requests without hooks send their JSON body as before """
+        requests_mock.post(f"{BASE_URL}/api/forms/generic", json={"status": "SUCCESS"})
+
+        Forms(LazarusAuth("org_id", "auth_key")).run_ocr("URL", INPUT_URL)
+        assert requests_mock.last_request.json() == {"inputUrl": INPUT_URL}
@@ -0,0 +1,73 @@
+""" Unit testing the typed FormsResult and RikAIResult classes """
+
+import pytest
+
+from lazarus_ai import FormsResult, RikAIResult
+
+FORMS_RESPONSE = {
+    "status": "SUCCESS",
+    "documentId": "doc",
+    "metadata": {"foo": "bar"},
+    "ocrResults": [
+        {"page": 1, "width": 8.5, "height": 11, "lines": [{"text": "Name: Jane", "boundingBox": [0, 1, 2, 3]}]},
+        {"page": 2, "lines": [{"content": "Page two"}]},
+    ],
+    "keyValuePairs": [{"key": {"text": "Name"}, "value": {"text": "Jane"}, "confidence": 0.9}],
+}
+
+RIKAI_RESPONSE = {
+    "status": "SUCCESS",
+    "documentId": "doc",
+    "data": [{"question": "Who?", "answer": "Jane", "translated": "Jane"}, {"question": "When?", "answer": "Today"}],
+}
+
+
+def test_forms_result_fields():
+    """ Tests top-level fields, pages, lines and key-value pairs are exposed """
+    result = FormsResult(FORMS_RESPONSE)
+
+    assert (result.status, result.document_id, result.metadata) == ("SUCCESS", "doc", {"foo": "bar"})
+    assert [page.number for page in result.pages] == [1, 2]
+    assert result.pages[0].width == 8.5
+    assert [line.text for page in result.pages for line in page.lines] == ["Name: Jane", "Page two"]
+    assert result.pages[0].lines[0].bounding_box == [0, 1, 2, 3]
+    assert [(field.key, field.value, field.confidence) for field in result.fields] == [("Name", "Jane", 0.9)]
+
+
+def test_rikai_result_answers():
+    """ Tests answers are returned in question order """
+    result = RikAIResult(RIKAI_RESPONSE)
+
+    assert [(a.question, a.answer) for a in result.answers] == [("Who?", "Jane"), ("When?", "Today")]
+    assert result.answers[1].translated is None
+    assert result.pages == []
+    assert result.summary is None
+
+
+def test_result_lazy():
+    """ Tests nested objects are only built on first access and then reused """
+    result = FormsResult(FORMS_RESPONSE)
+
+    assert result._pages is None and result._fields is None
+    pages = result.pages
+    assert result.pages is pages
+    assert pages[0]._lines is None
+
+
+def test_result_slots():
+    """ Tests result objects do not carry a per-instance __dict__ """
+    result = RikAIResult(RIKAI_RESPONSE)
+
+    with pytest.raises(AttributeError):
+        result.extra = 1
+    assert not hasattr(result.answers[0], "__dict__")
+
+
+def test_result_raw_access():
+    """ Tests results compare equal to and index like the wrapped dict """
+    result = RikAIResult(RIKAI_RESPONSE)
+
+    assert result == RIKAI_RESPONSE
+    assert result["status"] == "SUCCESS"
+    assert result.raw is RIKAI_RESPONSE
+    assert RikAIResult({"data": {"summary": "Text"}}).summary == "Text"
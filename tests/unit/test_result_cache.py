@@ -0,0 +1,144 @@
+""" Unit testing the ResultCache class """
+
+import shutil
+import sqlite3
+import time
+import pytest
+
+from lazarus_ai import ResultCache
+from lazarus_ai import _utils
+
+
+FILE_PATH = "tests/resources/sample_form.pdf"
+
+
+class TestResultCache():
+    """ Unit tests for ResultCache class """
+
+    def test_get_set(self) -> None:
+        """ Test stored results are returned as copies and counted as hits """
+        cache = ResultCache()
+        cache.set("key", {"status": "SUCCESS"}, elapsed=1.5)
+
+        result = cache.get("key")
+        result["status"] = "MODIFIED"
+
+        assert cache.get("key") == {"status": "SUCCESS"}
+        assert cache.get("missing") is None
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["saved_seconds"]) == (2, 1, 3.0)
+
+
+    def test_lru_eviction(self) -> None:
+        """ Test the least recently used result is evicted first """
+        cache = ResultCache(max_entries=2)
+        cache.set("a", {"n": 1})
+        cache.set("b", {"n": 2})
+        cache.get("a")
+        cache.set("c", {"n": 3})
+
+        assert cache.get("b") is None
+        assert cache.get("a") == {"n": 1}
+        assert cache.get("c") == {"n": 3}
+
+
+    def test_size_eviction(self) -> None:
+        """ Test results are evicted to stay under max_bytes """
+        cache = ResultCache(max_bytes=30)
+        cache.set("a", {"text": "x" * 10})
+        cache.set("b", {"text": "y" * 10})
+
+        assert cache.get("a") is None
+        assert cache.get("b") is not None
+
+
+    def test_ttl(self) -> None:
+        """ Test expired results are treated as misses """
+        cache = ResultCache(ttl=0.05)
+        cache.set("key", {"status": "SUCCESS"})
+        time.sleep(0.1)
+
+        assert cache.get("key") is None
+
+
+    def test_disk_tier(self, tmp_path) -> None:
+        """ Test results persist across instances through SQLite """
+        path = str(tmp_path / "cache.sqlite")
+        ResultCache(path=path).set("key", {"status": "SUCCESS"})
+
+        cache = ResultCache(path=path)
+        assert cache.get("key") == {"status": "SUCCESS"}
+        assert cache.stats()["disk_hits"] == 1
+
+
+    def test_disk_tier_max_entries(self, tmp_path) -> None:
+        """ Test the disk tier keeps only the most recent results """
+        path = str(tmp_path / "cache.sqlite")
+        writer = ResultCache(path=path, max_disk_entries=2)
+        for key in ("a", "b", "c"):
+            writer.set(key, {"key": key})
+
+        reader = ResultCache(path=path)
+        assert reader.get("a") is None
+        assert reader.get("c") == {"key": "c"}
+
+
+    def test_saved_pages(self, tmp_path) -> None:
+        """ Test hits count the OCR pages they saved, in both tiers """
+        path = str(tmp_path / "cache.sqlite")
+        ResultCache(path=path).set("key", {"ocrResults": [{"page": 1}, {"page": 2}]}, elapsed=2.0)
+
+        cache = ResultCache(path=path)
+        cache.get("key")
+        cache.get("key")
+        cache.set("answer", {"status": "SUCCESS", "data": []})
+        cache.get("answer")
+
+        stats = cache.stats()
+        assert (stats["disk_hits"], stats["memory_hits"]) == (1, 2)
+        assert (stats["saved_pages"], stats["saved_seconds"]) == (4, 4.0)
+
+
+    def test_disk_access_batched(self, tmp_path, monkeypatch) -> None:
+        """ Test disk hits write their access times in batches rather than one commit each """
+        monkeypatch.setattr("lazarus_ai.result_cache.ACCESS_BATCH", 3)
+        path = str(tmp_path / "cache.sqlite")
+        writer = ResultCache(path=path)
+        for key in ("a", "b", "c"):
+            writer.set(key, {"key": key})
+        accessed = lambda: dict(sqlite3.connect(path).execute("SELECT key, accessed FROM results").fetchall())
+        written = accessed()
+
+        cache = ResultCache(path=path, max_entries=1)
+        assert cache.get("a") and cache.get("b")
+        assert accessed() == written
+
+        assert cache.get("c")
+        assert all(accessed()[key] > written[key] for key in ("a", "b", "c"))
+        assert cache.stats()["disk_hits"] == 3
+
+
+    def test_disk_eviction_amortized(self, tmp_path) -> None:
+        """ Test the disk tier is only trimmed once it outgrows max_disk_entries """
+        path = str(tmp_path / "cache.sqlite")
+        cache = ResultCache(path=path, max_disk_entries=10)
+        count = lambda: sqlite3.connect(path).execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+        for i in range(10):
+            cache.set(str(i), {"n": i})
+        assert count() == 10
+        cache.set("10", {"n": 10})
+        assert count() == 9
+        assert ResultCache(path=path).get("10") == {"n": 10}
+        assert ResultCache(path=path).get("0") is None
+
+
+    def test_fingerprint(self, tmp_path) -> None:
+        """ Test documents are keyed by content and params by value """
+        copy = str(tmp_path / "copy.pdf")
+        shutil.copy(FILE_PATH, copy)
+
+        key = _utils._fingerprint("forms", None, "FILE_PATH", FILE_PATH, {"a": 1, "b": 2})
+        assert key == _utils._fingerprint("forms", None, "FILE_PATH", copy, {"b": 2, "a": 1})
+        assert key != _utils._fingerprint("forms", "model", "FILE_PATH", FILE_PATH, {"a": 1, "b": 2})
+        assert key != _utils._fingerprint("forms", None, "FILE_PATH", FILE_PATH, {"a": 1})
@@ -0,0 +1,168 @@
+""" Unit testing the RetryPolicy class """
+
+import os
+import time
+import pytest
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError, ProtocolError
+
+from lazarus_ai import LazarusAuth, Forms, RetryPolicy
+from lazarus_ai.errors import APIError, CircuitOpenError
+
+BASE_URL = os.environ.get("BASE_URL")
+INPUT_URL = "https://fileurl.com/sample.pdf"
+FILE_PATH = "tests/resources/sample_form.pdf"
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """ Records backoff delays instead of sleeping """
+    delays = []
+    monkeypatch.setattr(time, "sleep", delays.append)
+    return delays
+
+
+def make_forms(**kwargs):
+    policy = RetryPolicy(**{"backoff_factor": 0.1, "jitter": False} | kwargs)
+    return Forms(LazarusAuth("org_id", "auth_key", retry_policy=policy)), policy
+
+
+class TestRetryPolicy():
+    """ Unit tests for RetryPolicy class """
+
+    def test_retry_safe_status(self, requests_mock, sleeps) -> None:
+        """ Test 429 and 503 responses are retried with exponential backoff """
+        forms, policy = make_forms()
+        post_mock = requests_mock.post(f"{BASE_URL}/api/forms/generic", [
+            {"status_code": 429}, {"status_code": 503}, {"json": {"status": "SUCCESS"}}
+        ])
+
+        assert forms.run_ocr("URL", INPUT_URL) == {"status": "SUCCESS"}
+        assert post_mock.call_count == 3
+        assert sleeps == [0.1, 0.2]
+        assert policy.stats()["retries"] == 2
+
+
+    def test_retry_after(self, requests_mock, sleeps) -> None:
+        """ Test the Retry-After header sets the delay """
+        forms, _ = make_forms()
+        requests_mock.post(f"{BASE_URL}/api/forms/generic", [
+            {"status_code": 429, "headers": {"Retry-After": "7"}}, {"json": {"status": "SUCCESS"}}
+        ])
+
+        forms.run_ocr("URL", INPUT_URL)
+        assert sleeps == [7.0]
+
+
+    def test_retry_requires_file_id(self, requests_mock, sleeps) -> None:
+        """ Test 500 responses are only retried when a file_id guards against duplicates """
+        forms, _ = make_forms()
+        post_mock = requests_mock.post(f"{BASE_URL}/api/forms/generic", [
+            {"status_code": 500}, {"json": {"status": "SUCCESS"}}
+        ])
+
+        with pytest.raises(APIError):
+            forms.run_ocr("URL", INPUT_URL)
+        assert post_mock.call_count == 1
+
+        assert forms.run_ocr("URL", INPUT_URL, file_id="doc") == {"status": "SUCCESS"}
+        assert post_mock.call_count == 2
+
+
+    def test_retry_rewinds_stream(self, requests_mock, sleeps) -> None:
+        """ Test streamed FILE_PATH bodies are resent in full """
+        forms, _ = make_forms()
+        sizes = []
+
+        def respond(request, context):
+            sizes.append(len(b"".join(request.body)))
+            context.status_code = 503 if len(sizes) == 1 else 200
+            return {"status": "SUCCESS"}
+
+        requests_mock.post(f"{BASE_URL}/api/forms/generic", json=respond)
+        forms.run_ocr("FILE_PATH", FILE_PATH)
+
+        assert len(sizes) == 2 and sizes[0] == sizes[1] > 0
+
+
+    def test_circuit_breaker(self, requests_mock, sleeps, monkeypatch) -> None:
+        """ Test a failing endpoint is short-circuited until it recovers """
+        forms, policy = make_forms(max_retries=0, failure_threshold=2, recovery_timeout=30)
+        post_mock = requests_mock.post(f"{BASE_URL}/api/forms/generic", status_code=500)
+
+        for _ in range(2):
+            with pytest.raises(APIError):
+                forms.run_ocr("URL", INPUT_URL)
+        with pytest.raises(CircuitOpenError):
+            forms.run_ocr("URL", INPUT_URL)
+        assert post_mock.call_count == 2
+        assert policy.stats()["circuits"] == {"/api/forms/generic": "open"}
+
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now + 31)
+        requests_mock.post(f"{BASE_URL}/api/forms/generic", json={"status": "SUCCESS"})
+
+        assert forms.run_ocr("URL", INPUT_URL) == {"status": "SUCCESS"}
+        assert policy.stats()["circuits"] == {"/api/forms/generic": "closed"}
+
+
+    def test_half_open_trial_raises(self, requests_mock, sleeps, monkeypatch) -> None:
+        """ Test a trial request raising an unexpected error does not leave the breaker stuck """
+        forms, policy = make_forms(max_retries=0, failure_threshold=1, recovery_timeout=30)
+        requests_mock.post(f"{BASE_URL}/api/forms/generic", status_code=500)
+        with pytest.raises(APIError):
+            forms.run_ocr("URL", INPUT_URL)
+
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now + 31)
+
+        def hook_error(request, context):
+            raise RuntimeError("hook failed")
+
+        requests_mock.post(f"{BASE_URL}/api/forms/generic", json=hook_error)
+        with pytest.raises(RuntimeError):
+            forms.run_ocr("URL", INPUT_URL)
+
+        requests_mock.post(f"{BASE_URL}/api/forms/generic", json={"status": "SUCCESS"})
+        assert forms.run_ocr("URL", INPUT_URL) == {"status": "SUCCESS"}
+        assert policy.stats()["circuits"] == {"/api/forms/generic": "closed"}
+
+
+    def test_retry_closes_response(self, requests_mock, sleeps, monkeypatch) -> None:
+        """ Test a retried response is closed, releasing its connection """
+        import requests
+
+        closed = []
+        monkeypatch.setattr(requests.Response, "close", lambda self: closed.append(self.status_code))
+        forms, _ = make_forms()
+        requests_mock.post(f"{BASE_URL}/api/forms/generic", [{"status_code": 503}, {"json": {"status": "SUCCESS"}}])
+
+        assert forms.run_ocr("URL", INPUT_URL) == {"status": "SUCCESS"}
+        assert closed == [503]
+
+
+    def test_never_sent_connection_errors(self, requests_mock, sleeps) -> None:
+        """ Test POSTs without a file_id are only resent when the connection was never made """
+        def refused(error):
+            def callback(request, context):
+                raise requests.ConnectionError(MaxRetryError(None, request.url, error))
+            return callback
+
+        class Unreachable(NewConnectionError):
+            """ Stands in for future urllib3 subclasses, whatever they are named """
+
+        unresolved = Unreachable(None, "Failed to establish a new connection")
+        post_mock = requests_mock.post(f"{BASE_URL}/api/forms/generic", [
+            {"json": refused(unresolved)},
+            {"json": {"status": "SUCCESS"}},
+            {"json": refused(ProtocolError("Connection aborted.", ConnectionResetError()))},
+        ])
+        forms, policy = make_forms()
+
+        assert forms.run_ocr("URL", INPUT_URL) == {"status": "SUCCESS"}
+        assert post_mock.call_count == 2
+
+        # The request may have reached the API before the connection dropped
+        with pytest.raises(requests.ConnectionError):
+            forms.run_ocr("URL", INPUT_URL)
+        assert post_mock.call_count == 3
@@ -1,15 +1,14 @@
 """ Unit testing the RikAI class """
 
-import sys
 import os
+import base64
+import json
 import pytest
+from concurrent.futures import ThreadPoolExecutor
 import requests_mock
 
-parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
-sys.path.append(parent_dir)
-
-from src import LazarusAuth, RikAI
-from errors import ValidationError
+from lazarus_ai import LazarusAuth, RikAI
+from lazarus_ai.errors import ValidationError
 
 BASE_URL = os.environ.get("BASE_URL")
 INPUT_URL = "https://firebasestorage.googleapis.com/v0/b/lazarus-apis-testing.appspot.com/o/examples%2FSample%20Form.pdf?alt=media&token=5b537052-ea54-4be4-9d36-9620ee994c1c"
@@ -18,6 +17,8 @@ ORG_ID = os.environ.get("ORG_ID")
 AUTH_KEY = os.environ.get("AUTH_KEY")
 AUTH = LazarusAuth(ORG_ID, AUTH_KEY)
 
+FILE_PATH = "tests/resources/sample_form.pdf"
+
 
 class TestRikAI():
     """ Unit tests for RikAI class """
@@ -118,7 +119,7 @@ class TestRikAI():
 
 
     def test_summarize_input_type_bad(self, requests_mock) -> None:
-        """ Summarizer endpoint does not accept multipart inputs """
+        """ Summarizer rejects FILE_PATH inputs with unsupported extensions """
         rikai = RikAI(AUTH)
         post_mock = requests_mock.post(f"{BASE_URL}/api/rikai/summarize", headers=rikai.headers)
 
@@ -128,3 +129,60 @@ class TestRikAI():
             rikai.summarize("FILE_PATH", "path_to_file", fields)
 
         assert not post_mock.called
+
+
+    def test_summarize_file_path_ok(self, requests_mock) -> None:
+        """ Test FILE_PATH inputs are sent as a streamed base64 JSON body """
+        rikai = RikAI(AUTH)
+        mock_response = {"status": "SUCCESS"}
+        bodies = []
+
+        def respond(request, context):
+            bodies.append(json.loads(b"".join(request.body)))
+            return mock_response
+
+        requests_mock.post(f"{BASE_URL}/api/rikai/summarize", json=respond)
+
+        fields = {"document_type": "Medical form", "summary_description": "List all patient personal information such as DOB and address"}
+        resp = rikai.summarize("FILE_PATH", FILE_PATH, fields)
+
+        with open(FILE_PATH, "rb") as f:
+            expected = base64.b64encode(f.read()).decode()
+
+        assert resp == mock_response
+        assert bodies[0] == {"base64": expected, "fields": {"documentType": fields["document_type"], "summaryDescription": fields["summary_description"]}}
+
+
+    def test_ask_question_coalesced(self, requests_mock) -> None:
+        """ Test concurrent questions about one document are sent as one request """
+        rikai = RikAI(AUTH, coalesce_window=0.2)
+        bodies = []
+
+        def respond(request, context):
+            body = request.json()
+            bodies.append(body)
+            return {"status": "SUCCESS", "data": [{"question": q, "answer": len(q)} for q in body["question"]]}
+
+        requests_mock.post(f"{BASE_URL}/api/rikai", json=respond)
+
+        questions = [["Who?"], ["What is it?"], ["When?", "Where?"]]
+        with ThreadPoolExecutor(len(questions)) as pool:
+            results = list(pool.map(lambda q: rikai.ask_question("URL", INPUT_URL, q, language="en"), questions))
+
+        assert len(bodies) == 1
+        assert sorted(bodies[0]["question"]) == sorted(sum(questions, []))
+        assert bodies[0]["language"] == "en"
+        assert [[item["question"] for item in result["data"]] for result in results] == questions
+
+
+    def test_ask_question_stream(self, requests_mock) -> None:
+        """ Test streamed questions request OCR results and yield them by page """
+        rikai = RikAI(AUTH)
+        mock_response = {"status": "SUCCESS", "data": [{"answer": "Yes"}], "ocrResults": [{"page": 1}]}
+        post_mock = requests_mock.post(f"{BASE_URL}/api/rikai", json=mock_response)
+
+        stream = rikai.ask_question_stream("URL", INPUT_URL, ["Question"])
+
+        assert list(stream) == [{"page": 1}]
+        assert stream.result == {"status": "SUCCESS", "data": [{"answer": "Yes"}]}
+        assert post_mock.last_request.json()["returnOCR"] is True
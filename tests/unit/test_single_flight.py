@@ -0,0 +1,104 @@
+""" Unit testing the single-flight helper used by the transport """
+
+import threading
+import time
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+
+from lazarus_ai import _utils
+from lazarus_ai.errors import APIError
+
+
+class SlowCall:
+    """ Counts calls, sleeping so concurrent callers overlap """
+
+    def __init__(self, error=None):
+        self.calls = 0
+        self.error = error
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        with self.lock:
+            self.calls += 1
+        time.sleep(0.2)
+        if self.error is not None:
+            raise self.error
+        return {"status": "SUCCESS", "data": []}
+
+
+def run_concurrently(flights, key, func, count=4):
+    with ThreadPoolExecutor(count) as pool:
+        futures = [pool.submit(flights.do, key, func) for _ in range(count)]
+        return [future.result() if future.exception() is None else future.exception() for future in futures]
+
+
+def test_single_flight_shares_result():
+    """ Tests concurrent identical calls run once and each get a copy """
+    flights = _utils._SingleFlight()
+    call = SlowCall()
+    results = run_concurrently(flights, "key", call)
+
+    assert call.calls == 1
+    assert all(result == {"status": "SUCCESS", "data": []} for result in results)
+    assert len({id(result) for result in results}) == len(results)
+    assert flights.stats() == {"calls": 4, "shared": 3}
+
+
+def test_single_flight_shares_error():
+    """ Tests every waiting caller raises the exception of the shared call """
+    flights = _utils._SingleFlight()
+    call = SlowCall(APIError("FAILURE", "Server error", 500))
+    results = run_concurrently(flights, "key", call)
+
+    assert call.calls == 1
+    assert all(isinstance(result, APIError) for result in results)
+
+
+def test_single_flight_sequential_calls():
+    """ Tests a finished call is not reused by later calls """
+    flights = _utils._SingleFlight()
+    call = SlowCall()
+    flights.do("key", call)
+    flights.do("key", call)
+
+    assert call.calls == 2
+
+
+def test_single_flight_transport_disabled():
+    """ Tests the transport runs every call when single-flight is off """
+    transport = _utils.Transport()
+    call = SlowCall()
+    with ThreadPoolExecutor(2) as pool:
+        list(pool.map(lambda _: transport.deduplicate("key", call), range(2)))
+
+    assert transport.flights is None
+    assert call.calls == 2
+
+
+def test_single_flight_leader_mutates_result():
+    """ Tests waiters are unaffected by the leader modifying its result """
+    flights = _utils._SingleFlight()
+    started = threading.Event()
+    results = []
+
+    def leader():
+        def func():
+            started.set()
+            time.sleep(0.1)
+            return {"status": "SUCCESS", "data": list(range(1000))}
+        result = flights.do("key", func)
+        for i in range(1000):
+            result[f"extra{i}"] = i
+        result["data"].clear()
+
+    def waiter():
+        started.wait()
+        results.append(flights.do("key", SlowCall()))
+
+    threads = [threading.Thread(target=leader)] + [threading.Thread(target=waiter) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [{"status": "SUCCESS", "data": list(range(1000))}] * 3
@@ -0,0 +1,103 @@
+""" Unit testing the pooled Transport """
+
+import gzip
+import json
+import threading
+import zlib
+import pytest
+
+from lazarus_ai import _utils
+
+
+class TestTransport():
+    """ Unit tests for Transport class """
+
+    def test_session_reused(self) -> None:
+        """ Test the same pooled session is returned on every access """
+        transport = _utils.Transport()
+        assert transport.session is transport.session
+
+
+    def test_pool_sizes(self) -> None:
+        """ Test configured pool sizes are applied to the mounted adapters """
+        transport = _utils.Transport(pool_connections=3, pool_maxsize=7)
+        adapter = transport.session.get_adapter("https://api.lazarusforms.com/")
+
+        assert adapter._pool_connections == 3
+        assert adapter._pool_maxsize == 7
+
+
+    def test_pool_sizes_bad(self) -> None:
+        """ Test pool sizes below one are rejected """
+        with pytest.raises(ValueError):
+            _utils.Transport(pool_maxsize=0)
+
+
+    def test_session_shared_across_threads(self) -> None:
+        """ Test concurrent first access creates exactly one session """
+        transport = _utils.Transport()
+        sessions = []
+        threads = [threading.Thread(target=lambda: sessions.append(transport.session)) for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len({id(session) for session in sessions}) == 1
+
+
+    def test_session_reset_after_fork(self) -> None:
+        """ Test a session inherited from another process is replaced """
+        transport = _utils.Transport()
+        session = transport.session
+        transport._pid = -1
+
+        assert transport.session is not session
+
+
+    def test_post_uses_session(self, requests_mock) -> None:
+        """ Test posts are sent through the pooled session """
+        transport = _utils.Transport()
+        requests_mock.post("https://api.lazarusforms.com/api/forms/generic", json={"status": "SUCCESS"})
+
+        resp = transport.post("https://api.lazarusforms.com/api/forms/generic", json={})
+
+        assert resp.json() == {"status": "SUCCESS"}
+
+
+    @pytest.mark.parametrize("encoding, decompress", [("gzip", gzip.decompress), ("deflate", zlib.decompress)])
+    def test_post_compressed(self, requests_mock, encoding, decompress) -> None:
+        """ Test JSON bodies above the threshold are sent compressed """
+        transport = _utils.Transport(compression=encoding, compression_threshold=100)
+        post_mock = requests_mock.post("https://api.example.test/compressed", json={})
+        body = {"base64": "QUJD" * 1000}
+
+        transport.post("https://api.example.test/compressed", headers={"orgId": "org"}, json=body)
+
+        request = post_mock.last_request
+        assert request.headers["Content-Encoding"] == encoding
+        assert request.headers["orgId"] == "org"
+        assert json.loads(decompress(request.body)) == body
+        assert len(request.body) < len(json.dumps(body)) / 10
+
+
+    def test_post_below_threshold(self, requests_mock) -> None:
+        """ Test small JSON bodies are sent uncompressed """
+        transport = _utils.Transport(compression="gzip", compression_threshold=1024)
+        post_mock = requests_mock.post("https://api.example.test/small", json={})
+
+        transport.post("https://api.example.test/small", json={"inputUrl": "https://fileurl.com"})
+
+        assert "Content-Encoding" not in post_mock.last_request.headers
+        assert post_mock.last_request.json() == {"inputUrl": "https://fileurl.com"}
+
+
+    def test_compression_bad(self) -> None:
+        """ Test unsupported content codings are rejected """
+        with pytest.raises(ValueError):
+            _utils.Transport(compression="br")
+
+
+    def test_accept_encoding(self) -> None:
+        """ Test the session negotiates compressed responses """
+        assert _utils.Transport().session.headers["Accept-Encoding"] == "gzip, deflate"
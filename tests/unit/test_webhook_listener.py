@@ -0,0 +1,142 @@
+""" Unit testing the WebhookListener class """
+
+import os
+import http.client
+import json
+import threading
+import time
+import pytest
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from lazarus_ai import LazarusAuth, Forms, RikAI, WebhookListener
+from lazarus_ai.errors import APIError, ValidationError
+
+BASE_URL = os.environ.get("BASE_URL")
+INPUT_URL = "https://fileurl.com/sample.pdf"
+AUTH = LazarusAuth("org_id", "auth_key")
+
+
+def send_callback(listener, payload, path=None, token=None):
+    """ Posts a webhook callback to the listener, returning the status """
+    conn = http.client.HTTPConnection("127.0.0.1", listener.port, timeout=5)
+    target = f"{path or listener.path}?token={token or listener.token}"
+    conn.request("POST", target, body=json.dumps(payload), headers={"Content-Type": "application/json"})
+    status = conn.getresponse().status
+    conn.close()
+    return status
+
+
+def wait_sent(post_mock, count=1):
+    """ Waits for the listener's send pool to post count requests """
+    deadline = time.monotonic() + 5
+    while post_mock.call_count < count and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return post_mock.last_request
+
+
+@pytest.fixture
+def listener():
+    with WebhookListener() as listener:
+        yield listener
+
+
+class TestWebhookListener():
+    """ Unit tests for WebhookListener class """
+
+    def test_submit_ocr_resolves(self, requests_mock, listener) -> None:
+        """ Test the Future resolves when the matching callback arrives """
+        post_mock = requests_mock.post(f"{BASE_URL}/api/forms/generic", json={"status": "PROCESSING"})
+        future = Forms(AUTH).submit_ocr(listener, "URL", INPUT_URL, metadata={"foo": "bar"})
+
+        body = wait_sent(post_mock).json()
+        assert body["webhook"] == listener.url
+        assert not future.done()
+
+        assert send_callback(listener, {"status": "SUCCESS", "documentId": "other"}) == 200
+        assert send_callback(listener, {"status": "SUCCESS", "documentId": body["fileId"]}) == 200
+
+        assert future.result(timeout=5) == {"status": "SUCCESS", "documentId": body["fileId"]}
+        assert listener.stats() == {"received": 2, "resolved": 1, "unmatched": 1, "rejected": 0, "timed_out": 0,
+                                    "send_failed": 0, "pending": 0}
+
+
+    def test_submit_question_file_id(self, requests_mock, listener) -> None:
+        """ Test a supplied file_id is used for correlation """
+        post_mock = requests_mock.post(f"{BASE_URL}/api/rikai", json={"status": "PROCESSING"})
+        future = RikAI(AUTH).submit_question(listener, "URL", INPUT_URL, ["Question"], file_id="doc-1")
+
+        assert wait_sent(post_mock).json()["fileId"] == "doc-1"
+        send_callback(listener, {"status": "SUCCESS", "documentId": "doc-1", "data": []})
+        assert future.result(timeout=5)["data"] == []
+
+
+    def test_submit_timeout(self, requests_mock, listener) -> None:
+        """ Test the Future fails if no callback arrives in time """
+        requests_mock.post(f"{BASE_URL}/api/forms/generic", json={"status": "PROCESSING"})
+        future = Forms(AUTH).submit_ocr(listener, "URL", INPUT_URL, timeout=0.05)
+
+        with pytest.raises((TimeoutError, FutureTimeoutError)):
+            future.result(timeout=5)
+        assert listener.stats()["timed_out"] == 1
+
+
+    def test_submit_returns_before_send(self, requests_mock, listener) -> None:
+        """ Test the Future is returned while the request is still being sent """
+        release = threading.Event()
+
+        def slow(request, context):
+            assert release.wait(5)
+            return {"status": "PROCESSING"}
+
+        post_mock = requests_mock.post(f"{BASE_URL}/api/forms/generic", json=slow)
+        futures = [Forms(AUTH).submit_ocr(listener, "URL", INPUT_URL, file_id=f"doc-{i}") for i in range(3)]
+
+        assert not any(future.done() for future in futures)
+        assert listener.stats()["pending"] == 3
+        release.set()
+        wait_sent(post_mock, 3)
+        for i, future in enumerate(futures):
+            send_callback(listener, {"documentId": f"doc-{i}"})
+            assert future.result(timeout=5) == {"documentId": f"doc-{i}"}
+
+
+    def test_submit_error_fails_future(self, requests_mock, listener) -> None:
+        """ Test a rejected request fails its Future, not the caller, and leaves nothing pending """
+        requests_mock.post(f"{BASE_URL}/api/forms/generic", status_code=500, json={"message": "Server error"})
+
+        future = Forms(AUTH).submit_ocr(listener, "URL", INPUT_URL)
+        assert isinstance(future.exception(timeout=5), APIError)
+        with pytest.raises(ValidationError):
+            Forms(AUTH).submit_ocr(listener, "URL", INPUT_URL, webhook="https://pingme.com")
+        assert listener.stats()["pending"] == 0
+        assert listener.stats()["send_failed"] == 1
+
+
+    def test_bad_requests(self, listener) -> None:
+        """ Test wrong paths and malformed bodies are rejected """
+        assert send_callback(listener, {}, path="/other") == 404
+
+        conn = http.client.HTTPConnection("127.0.0.1", listener.port, timeout=5)
+        conn.request("POST", f"{listener.path}?token={listener.token}", body="not json")
+        assert conn.getresponse().status == 400
+        conn.close()
+
+
+    def test_callback_token(self, requests_mock, listener) -> None:
+        """ Test callbacks without the listener's token cannot resolve Futures """
+        requests_mock.post(f"{BASE_URL}/api/forms/generic", json={"status": "PROCESSING"})
+        future = Forms(AUTH).submit_ocr(listener, "URL", INPUT_URL, file_id="doc-1")
+
+        assert listener.url == f"http://127.0.0.1:{listener.port}{listener.path}?token={listener.token}"
+        assert send_callback(listener, {"documentId": "doc-1"}, token="forged") == 403
+        assert not future.done()
+        assert send_callback(listener, {"documentId": "doc-1"}) == 200
+        assert future.result(timeout=5) == {"documentId": "doc-1"}
+        assert listener.stats()["rejected"] == 1
+
+
+    def test_body_too_large(self) -> None:
+        """ Test bodies over max_body_bytes are rejected unread """
+        with WebhookListener(max_body_bytes=100) as listener:
+            assert send_callback(listener, {"documentId": "x" * 200}) == 413
+            assert send_callback(listener, {"documentId": "x"}) == 200